@@ -1,3 +1,15 @@
 from django.contrib import admin
 
-# Register your models here.
+from analysis.models import ApiKey
+
+
+@admin.register(ApiKey)
+class ApiKeyAdmin(admin.ModelAdmin):
+    list_display = ("name", "prefix", "tier", "is_active", "created_at")
+    list_filter = ("tier", "is_active")
+    search_fields = ("name", "prefix")
+    readonly_fields = ("prefix", "created_at")
+
+    def has_add_permission(self, request):
+        # A chave em texto só é exibida uma vez: use "manage.py create_api_key"
+        return False
@@ -0,0 +1,140 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import BasePermission
+
+from analysis.models import ApiKey
+
+API_KEY_HEADER = "X-API-Key"
+AUTHORIZATION_KEYWORD = "Api-Key"
+INVALID_KEY_MESSAGE = "Chave de API inválida ou revogada."
+
+
+@dataclass(frozen=True)
+class ApiKeyIdentity:
+    id: int
+    name: str
+    tier: str
+
+
+class ApiKeyUser:
+    """Usuário da requisição autenticada por chave de API (sem conta no Django)."""
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, identity):
+        self.identity = identity
+        self.username = f"api-key:{identity.name}"
+
+    def __str__(self):
+        return self.username
+
+
+class _KeyCache:
+    # Cache em memória do processo: a maioria das requisições não toca o banco
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key_hash):
+        with self._lock:
+            entry = self._entries.get(key_hash)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def set(self, key_hash, identity, timeout):
+        expires_at = time.monotonic() + timeout
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key_hash] = (expires_at, identity)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_key_cache = _KeyCache()
+# Chaves inexistentes ou revogadas ficam num cache à parte, menor e de vida curta:
+# uma enxurrada de chaves inventadas não expulsa as válidas do cache principal
+_invalid_key_cache = _KeyCache(maxsize=256)
+_INVALID = ApiKeyIdentity(id=0, name="", tier="")
+
+
+def _cached_identity(raw_key):
+    key_hash = ApiKey.hash_key(raw_key)
+    return key_hash, _key_cache.get(key_hash) or _invalid_key_cache.get(key_hash)
+
+
+def _valid(identity):
+    return None if identity is _INVALID or not identity.id else identity
+
+
+def resolve_api_key(raw_key):
+    key_hash, identity = _cached_identity(raw_key)
+    if identity is None:
+        api_key = (
+            ApiKey.objects.filter(key_hash=key_hash, is_active=True)
+            .only("id", "name", "tier")
+            .first()
+        )
+        if api_key:
+            identity = ApiKeyIdentity(api_key.id, api_key.name, api_key.tier)
+            _key_cache.set(key_hash, identity, settings.API_KEY_CACHE_SECONDS)
+        else:
+            identity = _INVALID
+            _invalid_key_cache.set(key_hash, identity, settings.API_KEY_NEGATIVE_CACHE_SECONDS)
+    return _valid(identity)
+
+
+async def aresolve_api_key(raw_key):
+    # Só vai ao banco (numa thread) quando a chave não está no cache do processo
+    _, identity = _cached_identity(raw_key)
+    if identity is None:
+        return await sync_to_async(resolve_api_key)(raw_key)
+    return _valid(identity)
+
+
+def api_key_from_headers(headers):
+    raw_key = headers.get(API_KEY_HEADER)
+    if raw_key:
+        return raw_key
+    keyword, _, value = headers.get("Authorization", "").partition(" ")
+    if keyword != AUTHORIZATION_KEYWORD:
+        return None
+    return value.strip()
+
+
+class ApiKeyAuthentication(BaseAuthentication):
+    def authenticate(self, request):
+        raw_key = api_key_from_headers(request.headers)
+        if raw_key is None:
+            return None
+
+        identity = resolve_api_key(raw_key)
+        if identity is None:
+            raise AuthenticationFailed(INVALID_KEY_MESSAGE)
+        return ApiKeyUser(identity), identity
+
+    def authenticate_header(self, request):
+        return AUTHORIZATION_KEYWORD
+
+
+class HasApiKey(BasePermission):
+    """Só libera requisições autenticadas por chave de API."""
+
+    message = "Este endpoint exige uma chave de API."
+
+    def has_permission(self, request, view):
+        return isinstance(request.auth, ApiKeyIdentity)
@@ -0,0 +1,220 @@
+"""Análise em lote fora do HTTP e do Celery (comando analyze_bulk).
+
+As URLs chegam em fluxo (CSV, JSON Lines ou uma por linha), são normalizadas
+e deduplicadas, analisadas pelo mesmo pipeline dos workers com concorrência
+limitada e gravadas uma a uma em JSON Lines. O arquivo de checkpoint lista as
+URLs concluídas: rodar de novo com os mesmos arquivos retoma de onde parou.
+"""
+
+import concurrent.futures
+import csv
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+import validators
+from django.core.cache import cache
+
+from analysis.caching import report_cache_key
+from analysis.util.fastjson import decode_report, dumps, raw_report
+from analysis.util.url import canonicalize_url
+
+
+def iter_input_urls(lines):
+    """URLs de linhas em JSON Lines ({"url": ...}), CSV ou texto simples."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                url = json.loads(line).get("url")
+            except (ValueError, AttributeError):
+                continue
+            if url:
+                yield url
+            continue
+        for value in next(csv.reader([line]), []):
+            value = value.strip()
+            if value.startswith(("http://", "https://")):
+                yield value
+                break
+
+
+def _digest(canonical):
+    # 8 bytes por URL vista: milhões de URLs cabem em poucas dezenas de MB
+    return hashlib.blake2b(canonical.encode(), digest_size=8).digest()
+
+
+def read_checkpoint(path):
+    done = set()
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            done.update(_digest(line.strip()) for line in f if line.strip())
+    return done
+
+
+def _cancelled_stages(report):
+    report = decode_report(report)
+    return report.get("cancelled_stages") if isinstance(report, dict) else None
+
+
+@dataclass
+class BulkProgress:
+    started_at: float = field(default_factory=time.monotonic)
+    submitted: int = 0
+    ok: int = 0
+    cached: int = 0
+    errors: int = 0
+    skipped: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+
+    @property
+    def finished(self):
+        return self.ok + self.cached + self.errors
+
+    def line(self):
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return (
+            f"{self.finished} analisadas ({self.ok} novas, {self.cached} do cache, "
+            f"{self.errors} erros) em {elapsed:.0f}s -> {self.finished / elapsed:.2f} URLs/s; "
+            f"{self.submitted - self.finished} em andamento, {self.skipped} já no checkpoint, "
+            f"{self.duplicates} duplicadas, {self.invalid} inválidas"
+        )
+
+
+class BulkAnalyzer:
+    def __init__(
+        self,
+        output,
+        checkpoint_path=None,
+        concurrency=4,
+        rate_limits=None,
+        reuse_cache=True,
+        lane="bulk",
+        on_progress=None,
+        progress_interval=10.0,
+    ):
+        self.output = output
+        self.checkpoint_path = checkpoint_path
+        self.concurrency = concurrency
+        self.rate_limits = rate_limits
+        self.reuse_cache = reuse_cache
+        self.lane = lane
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self.progress = BulkProgress()
+        self._reported_at = time.monotonic()
+
+    def unique_urls(self, urls, done):
+        seen = set()
+        for url in urls:
+            canonical = canonicalize_url(url)
+            if not canonical or not validators.url(canonical):
+                self.progress.invalid += 1
+                continue
+            digest = _digest(canonical)
+            if digest in done:
+                self.progress.skipped += 1
+            elif digest in seen:
+                self.progress.duplicates += 1
+            else:
+                seen.add(digest)
+                yield canonical
+
+    def analyze(self, url):
+        # Importado aqui: o pipeline carrega os SDKs dos provedores
+        from analysis.tasks import _run_full_analysis
+
+        started = time.perf_counter()
+        cache_key = report_cache_key(url)
+        try:
+            report = cache.get(cache_key) if self.reuse_cache else None
+            status = "cached"
+            # Relatório parcial no cache (etapas canceladas) não conta: analisa de novo
+            if not report or _cancelled_stages(report):
+                report = _run_full_analysis(
+                    url, cache_key, lane=self.lane, rate_limits=self.rate_limits
+                )
+                status = "ok"
+        except Exception as e:
+            return {
+                "url": url,
+                "status": "error",
+                "error": str(e),
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+            }
+        cancelled = _cancelled_stages(report)
+        if cancelled:
+            # Prazo esgotado em alguma etapa: vira erro e fica fora do checkpoint
+            return {
+                "url": url,
+                "status": "error",
+                "error": f"Etapas canceladas por prazo: {', '.join(cancelled)}",
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+                "report": raw_report(report),
+            }
+        return {
+            "url": url,
+            "status": status,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+            "report": raw_report(report),
+        }
+
+    def run(self, urls):
+        done = read_checkpoint(self.checkpoint_path)
+        checkpoint = None
+        if self.checkpoint_path:
+            checkpoint = open(self.checkpoint_path, "a", encoding="utf-8")
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+        pending = set()
+        try:
+            for url in self.unique_urls(urls, done):
+                # Janela limitada: a entrada é lida aos poucos, nunca inteira
+                while len(pending) >= self.concurrency * 2:
+                    pending = self._drain(pending, checkpoint)
+                pending.add(executor.submit(self.analyze, url))
+                self.progress.submitted += 1
+            while pending:
+                pending = self._drain(pending, checkpoint)
+        finally:
+            executor.shutdown(wait=not pending, cancel_futures=True)
+            if checkpoint:
+                checkpoint.close()
+        return self.progress
+
+    def _drain(self, pending, checkpoint):
+        finished, pending = concurrent.futures.wait(
+            pending,
+            timeout=self.progress_interval,
+            return_when=concurrent.futures.FIRST_COMPLETED,
+        )
+        for future in finished:
+            self._write(future.result(), checkpoint)
+        self._report()
+        return pending
+
+    def _write(self, record, checkpoint):
+        status = record["status"]
+        if status == "error":
+            self.progress.errors += 1
+        elif status == "cached":
+            self.progress.cached += 1
+        else:
+            self.progress.ok += 1
+
+        self.output.write(dumps(record).decode() + "\n")
+        self.output.flush()
+        # Erros ficam fora do checkpoint: a próxima execução tenta de novo
+        if checkpoint and status != "error":
+            checkpoint.write(record["url"] + "\n")
+            checkpoint.flush()
+
+    def _report(self):
+        now = time.monotonic()
+        if self.on_progress and now - self._reported_at >= self.progress_interval:
+            self._reported_at = now
+            self.on_progress(self.progress)
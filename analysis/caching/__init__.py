@@ -0,0 +1,32 @@
+from .async_cache import aget_cached, aget_task_meta, get_async_redis
+from .checkpoints import PIPELINE_STAGES, StageCheckpoints
+from .etags import (
+    etag_key,
+    etag_matches,
+    get_report_etag,
+    report_etag,
+    store_report_etag,
+)
+from .extraction_cache import (
+    UNCHANGED,
+    content_hash,
+    get_extraction,
+    reusable_results,
+    store_extraction,
+)
+from .keys import extraction_cache_key, report_cache_key, url_digest
+from .namespaces import (
+    arefresh_generations,
+    bump_generation,
+    namespace_token,
+    namespaced_key,
+)
+from .popularity import (
+    arecord_request,
+    decay_popularity,
+    popularity_score,
+    record_request,
+    reports_to_warm,
+    trending_urls,
+)
+from .ttl_policy import report_ttl
@@ -0,0 +1,54 @@
+import asyncio
+import weakref
+
+import redis.asyncio as aioredis
+from asgiref.sync import sync_to_async
+from celery import states
+from celery.backends.redis import RedisBackend
+from celery.result import AsyncResult
+from django.conf import settings
+from django.core.cache import cache
+
+# Conexões assíncronas ficam presas ao event loop que as criou
+_clients = weakref.WeakKeyDictionary()
+
+
+def get_async_redis(url):
+    per_loop = _clients.setdefault(asyncio.get_running_loop(), {})
+    if url not in per_loop:
+        per_loop[url] = aioredis.from_url(url)
+    return per_loop[url]
+
+
+def cache_redis_url():
+    """URL do Redis do cache padrão, ou None se o backend não for o django-redis."""
+    config = settings.CACHES["default"]
+    if not config["BACKEND"].startswith("django_redis."):
+        return None
+    location = config["LOCATION"]
+    return location[0] if isinstance(location, (list, tuple)) else location.split(",")[0]
+
+
+async def aget_cached(key):
+    url = cache_redis_url()
+    if url is None:
+        return await cache.aget(key)
+
+    # Mesmo formato de chave e serialização do django-redis, sem passar por threads
+    raw = await get_async_redis(url).get(cache.make_key(key))
+    return None if raw is None else cache.client.decode(raw)
+
+
+async def aget_task_meta(task_id):
+    from core.celery import app
+
+    backend = app.backend
+    if not isinstance(backend, RedisBackend):
+        return await sync_to_async(lambda: AsyncResult(task_id, app=app)._get_task_meta())()
+
+    raw = await get_async_redis(settings.CELERY_RESULT_BACKEND).get(
+        backend.get_key_for_task(task_id)
+    )
+    if not raw:
+        return {"status": states.PENDING, "result": None}
+    return backend.decode_result(raw)
@@ -0,0 +1,69 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_KEY = "checkpoint:{analysis_id}:{stage}"
+PIPELINE_STAGES = ("firecrawl", "vt_submit", "vt_report", "fact_check", "llm")
+
+
+class StageCheckpoints:
+    """Saídas das etapas já concluídas de uma análise, guardadas pelo id da task.
+
+    O Celery mantém o id nas novas tentativas: um retry depois de uma falha do
+    Gemini retoma com Firecrawl e VirusTotal prontos em vez de pagar por eles de
+    novo. Sem id (chamadas diretas ao pipeline), nada é persistido.
+    """
+
+    def __init__(self, analysis_id=None):
+        self.analysis_id = analysis_id
+        self.completed = self._load() if analysis_id else {}
+        # Etapas que vieram de uma tentativa anterior
+        self.resumed = tuple(stage for stage in PIPELINE_STAGES if stage in self.completed)
+
+    def _key(self, stage):
+        return CHECKPOINT_KEY.format(analysis_id=self.analysis_id, stage=stage)
+
+    def _load(self):
+        keys = {self._key(stage): stage for stage in PIPELINE_STAGES}
+        try:
+            found = cache.get_many(list(keys))
+        except Exception as e:
+            logger.warning(f"Falha ao ler os checkpoints da análise {self.analysis_id}: {e}")
+            return {}
+        return {keys[key]: value for key, value in found.items()}
+
+    def __contains__(self, stage):
+        return stage in self.completed
+
+    def get(self, stage):
+        return self.completed.get(stage)
+
+    def save(self, stage, result):
+        if result is None:
+            return
+        self.completed[stage] = result
+        if not self.analysis_id:
+            return
+        try:
+            cache.set(self._key(stage), result, timeout=settings.CHECKPOINT_TTL)
+        except Exception as e:
+            logger.warning(f"Falha ao salvar o checkpoint {stage} da análise {self.analysis_id}: {e}")
+
+    def checkpointed(self, stage, func):
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            self.save(stage, result)
+            return result
+
+        return wrapper
+
+    def clear(self):
+        if not self.analysis_id:
+            return
+        try:
+            cache.delete_many([self._key(stage) for stage in PIPELINE_STAGES])
+        except Exception as e:
+            logger.warning(f"Falha ao apagar os checkpoints da análise {self.analysis_id}: {e}")
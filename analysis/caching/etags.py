@@ -0,0 +1,57 @@
+"""ETags fortes dos relatórios concluídos.
+
+Um relatório pronto nunca muda: o worker calcula o hash dele uma vez, ao
+terminar, e guarda ao lado do id da task. A view de status compara o
+If-None-Match só com essa chave pequena e responde 304 sem carregar nem
+serializar o relatório.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+
+logger = logging.getLogger(__name__)
+
+ETAG_KEY = "etag:{task_id}"
+
+
+def etag_key(task_id):
+    return ETAG_KEY.format(task_id=task_id)
+
+
+def report_etag(report):
+    body = json.dumps(
+        report, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str
+    )
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def store_report_etag(task_id, report):
+    etag = report_etag(report)
+    try:
+        cache.set(etag_key(task_id), etag, timeout=settings.STATUS_CACHE_MAX_AGE)
+    except Exception as e:
+        logger.warning(f"Falha ao salvar o ETag da task {task_id}: {e}")
+    return etag
+
+
+def get_report_etag(task_id):
+    try:
+        return cache.get(etag_key(task_id))
+    except Exception as e:
+        logger.warning(f"Falha ao ler o ETag da task {task_id}: {e}")
+        return None
+
+
+def etag_matches(if_none_match, etag):
+    if not if_none_match or not etag:
+        return False
+    tags = parse_etags(if_none_match)
+    if tags == ["*"]:
+        return True
+    # If-None-Match usa comparação fraca: W/"x" e "x" são o mesmo relatório
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in tags)
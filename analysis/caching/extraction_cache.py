@@ -0,0 +1,55 @@
+import time
+from hashlib import sha256
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .keys import extraction_cache_key
+from .namespaces import namespace_token
+
+# Revalidação que permite reaproveitar fact-check e LLM da análise anterior
+UNCHANGED = frozenset({"not_modified", "unchanged"})
+# Namespaces dos resultados guardados junto com a extração
+RESULT_NAMESPACES = ("fact_check", "llm")
+
+
+def _result_tokens():
+    return {namespace: namespace_token(namespace) for namespace in RESULT_NAMESPACES}
+
+
+def content_hash(content):
+    return sha256((content or "").encode()).hexdigest()
+
+
+def get_extraction(url):
+    """Extração anterior da URL, com os validadores e os resultados derivados."""
+    return cache.get(extraction_cache_key(url))
+
+
+def store_extraction(url, data, validators, fact_check, llm, analyzed_at=None):
+    # Vive mais que o relatório: quando ele expira, a extração ainda serve de
+    # base para a requisição condicional
+    entry = {
+        "data": {key: value for key, value in data.items() if key != "revalidation"},
+        "validators": validators,
+        "fact_check": fact_check,
+        "llm": llm,
+        "analyzed_at": analyzed_at or time.time(),
+        # Um novo prompt ou versão do fact-check invalida só os resultados,
+        # não a extração e os validadores
+        "result_tokens": _result_tokens(),
+    }
+    cache.set(extraction_cache_key(url), entry, timeout=settings.EXTRACTION_CACHE_TTL)
+    return entry
+
+
+def reusable_results(entry, now=None):
+    """(fact_check, llm) da análise anterior, se ainda forem recentes o bastante."""
+    if not entry or not entry.get("llm"):
+        return None
+    if entry.get("result_tokens") != _result_tokens():
+        return None
+    age = (now or time.time()) - entry.get("analyzed_at", 0)
+    if age > settings.EXTRACTION_REUSE_MAX_AGE:
+        return None
+    return entry.get("fact_check") or {}, entry["llm"]
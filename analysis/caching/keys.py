@@ -0,0 +1,18 @@
+from hashlib import sha256
+
+from analysis.util.url import canonicalize_url
+
+from .namespaces import namespaced_key
+
+
+def url_digest(url):
+    # Pela URL canônica: views, lote e aquecimento chegam à mesma chave
+    return sha256(canonicalize_url(url).encode()).hexdigest()
+
+
+def report_cache_key(url):
+    return namespaced_key("report", url_digest(url))
+
+
+def extraction_cache_key(url):
+    return namespaced_key("extraction", url_digest(url))
@@ -0,0 +1,128 @@
+import logging
+import threading
+import time
+from hashlib import sha256
+
+from django.conf import settings
+from django_redis import get_redis_connection
+
+from .async_cache import cache_redis_url, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+# Versão de código de cada namespace: suba junto com a mudança que invalida o
+# conteúdo (ex.: "llm" ao trocar o prompt do Gemini, "report" ao mudar a
+# lógica do veredicto). Para invalidar sem deploy, use o comando
+# bump_cache_generation, que incrementa o contador de geração no Redis.
+NAMESPACE_VERSIONS = {
+    "report": 1,
+    "extraction": 1,
+    "fact_check": 1,
+    "llm": 1,
+}
+
+# Namespaces cujo conteúdo embute o de outros: invalidar a LLM derruba os relatórios
+NAMESPACE_DEPENDENCIES = {
+    "report": ("extraction", "fact_check", "llm"),
+    "extraction": (),
+    "fact_check": (),
+    "llm": (),
+}
+
+GENERATION_KEY = "cache:generation:{namespace}"
+
+
+class _Generations:
+    """Contadores de geração lidos do Redis e guardados na memória do processo.
+
+    Um MGET a cada CACHE_GENERATION_REFRESH segundos, no máximo; um incremento
+    chega aos outros processos dentro desse intervalo. Sem Redis, vale a última
+    leitura (ou zero).
+    """
+
+    def __init__(self):
+        self._values = {namespace: 0 for namespace in NAMESPACE_VERSIONS}
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+
+    def _keys(self):
+        return [GENERATION_KEY.format(namespace=namespace) for namespace in NAMESPACE_VERSIONS]
+
+    def _store(self, raw_values):
+        values = {
+            namespace: int(value or 0)
+            for namespace, value in zip(NAMESPACE_VERSIONS, raw_values)
+        }
+        with self._lock:
+            self._values = values
+            self._expires_at = time.monotonic() + settings.CACHE_GENERATION_REFRESH
+
+    def _fresh(self):
+        return time.monotonic() < self._expires_at
+
+    def _failed(self, e):
+        logger.warning(f"Falha ao ler as gerações do cache: {e}")
+        with self._lock:
+            self._expires_at = time.monotonic() + settings.CACHE_GENERATION_REFRESH
+
+    def current(self):
+        if not self._fresh():
+            try:
+                self._store(get_redis_connection("default").mget(self._keys()))
+            except Exception as e:
+                self._failed(e)
+        return self._values
+
+    async def arefresh(self):
+        if self._fresh():
+            return
+        url = cache_redis_url()
+        if url is None:
+            self._failed("cache sem Redis")
+            return
+        try:
+            self._store(await get_async_redis(url).mget(self._keys()))
+        except Exception as e:
+            self._failed(e)
+
+    def invalidate(self):
+        with self._lock:
+            self._expires_at = 0.0
+
+
+_generations = _Generations()
+
+
+def namespace_token(namespace):
+    """Identifica versão e geração do namespace e das suas dependências."""
+    generations = _generations.current()
+    parts = [
+        f"{name}.{NAMESPACE_VERSIONS[name]}.{generations.get(name, 0)}"
+        for name in (namespace, *NAMESPACE_DEPENDENCIES[namespace])
+    ]
+    return sha256("|".join(parts).encode()).hexdigest()[:10]
+
+
+def namespaced_key(namespace, digest):
+    return f"{namespace}:{namespace_token(namespace)}:{digest}"
+
+
+async def arefresh_generations():
+    # Views assíncronas: atualiza as gerações sem bloquear o event loop; as
+    # chaves montadas em seguida usam os valores já em memória
+    await _generations.arefresh()
+
+
+def bump_generation(namespace):
+    """Invalida o namespace inteiro (e os dependentes) com um único INCR.
+
+    As entradas antigas não são apagadas: ficam inalcançáveis e expiram pelo
+    próprio TTL.
+    """
+    if namespace not in NAMESPACE_VERSIONS:
+        raise ValueError(f"Namespace de cache desconhecido: {namespace}")
+    generation = get_redis_connection("default").incr(
+        GENERATION_KEY.format(namespace=namespace)
+    )
+    _generations.invalidate()
+    return generation
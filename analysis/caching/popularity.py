@@ -0,0 +1,84 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from .async_cache import cache_redis_url, get_async_redis
+from .keys import report_cache_key
+
+logger = logging.getLogger(__name__)
+
+POPULARITY_KEY = "popularity:urls"
+WARMING_LOCK_KEY = "popularity:warming:{cache_key}"
+
+# Abaixo disso a URL sai do ranking na próxima rodada de decaimento
+MIN_TRACKED_SCORE = 0.1
+
+
+def record_request(url):
+    # Uma requisição vale 1 ponto; o decaimento periódico esquece as antigas
+    try:
+        get_redis_connection("default").zincrby(POPULARITY_KEY, 1, url)
+    except Exception as e:
+        logger.warning(f"Falha ao registrar popularidade de {url}: {e}")
+
+
+async def arecord_request(url):
+    url_redis = cache_redis_url()
+    if url_redis is None:
+        return
+    try:
+        await get_async_redis(url_redis).zincrby(POPULARITY_KEY, 1, url)
+    except Exception as e:
+        logger.warning(f"Falha ao registrar popularidade de {url}: {e}")
+
+
+def decay_popularity():
+    factor = 0.5 ** (settings.POPULARITY_WARM_INTERVAL / settings.POPULARITY_HALF_LIFE)
+    redis = get_redis_connection("default")
+    pipe = redis.pipeline()
+    pipe.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: factor})
+    pipe.zremrangebyscore(POPULARITY_KEY, "-inf", f"({MIN_TRACKED_SCORE}")
+    pipe.zremrangebyrank(POPULARITY_KEY, 0, -(settings.POPULARITY_MAX_TRACKED + 1))
+    pipe.execute()
+
+
+def trending_urls(limit=None, min_score=None):
+    redis = get_redis_connection("default")
+    urls = redis.zrevrangebyscore(
+        POPULARITY_KEY,
+        "+inf",
+        settings.POPULARITY_MIN_SCORE if min_score is None else min_score,
+        start=0,
+        num=limit or settings.POPULARITY_TOP_N,
+        withscores=True,
+    )
+    return [(_decode(url), score) for url, score in urls]
+
+
+def popularity_score(url):
+    try:
+        return get_redis_connection("default").zscore(POPULARITY_KEY, url) or 0.0
+    except Exception as e:
+        logger.warning(f"Falha ao ler popularidade de {url}: {e}")
+        return 0.0
+
+
+def reports_to_warm():
+    """URLs em alta cujo relatório expira (ou já expirou) na próxima janela."""
+    window = settings.POPULARITY_REFRESH_WINDOW
+    for url, _score in trending_urls():
+        cache_key = report_cache_key(url)
+        ttl = cache.ttl(cache_key)
+        # None = sem expiração; 0 = ausente ou expirado
+        if ttl is None or ttl > window:
+            continue
+        # Uma reanálise por janela, mesmo com várias rodadas do beat nela
+        if not cache.add(WARMING_LOCK_KEY.format(cache_key=cache_key), 1, timeout=window):
+            continue
+        yield url, cache_key
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,144 @@
+"""Testes para os namespaces versionados do cache e os contadores de geração."""
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from analysis.caching import (
+    bump_generation,
+    extraction_cache_key,
+    namespace_token,
+    report_cache_key,
+)
+from analysis.caching.extraction_cache import reusable_results, store_extraction
+from analysis.caching.namespaces import NAMESPACE_VERSIONS, _generations
+
+URL = "https://g1.example/noticia/1"
+
+
+class FakeRedis:
+    def __init__(self):
+        self.values = {}
+        self.mget_calls = 0
+
+    def mget(self, keys):
+        self.mget_calls += 1
+        return [self.values.get(key) for key in keys]
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+
+@pytest.fixture
+def redis(mocker, settings):
+    settings.CACHE_GENERATION_REFRESH = 60
+    fake = FakeRedis()
+    mocker.patch("analysis.caching.namespaces.get_redis_connection", return_value=fake)
+    _generations.invalidate()
+    yield fake
+    _generations.invalidate()
+
+
+def test_chaves_trazem_namespace_e_token(redis):
+    key = report_cache_key(URL)
+
+    namespace, token, digest = key.split(":")
+    assert namespace == "report"
+    assert token == namespace_token("report")
+    assert len(digest) == 64
+    assert extraction_cache_key(URL).startswith("extraction:")
+
+
+def test_chaves_usam_a_url_canonica(redis):
+    """Testa que a URL crua das views e a canônica do lote chegam à mesma chave."""
+    variants = ["HTTPS://G1.example:443/noticia/1#topo", " https://g1.example./noticia/1"]
+
+    for url in variants:
+        assert report_cache_key(url) == report_cache_key(URL)
+        assert extraction_cache_key(url) == extraction_cache_key(URL)
+
+
+def test_bump_da_llm_invalida_relatorios_mas_nao_extracoes(redis):
+    report_before = report_cache_key(URL)
+    extraction_before = extraction_cache_key(URL)
+
+    assert bump_generation("llm") == 1
+
+    assert report_cache_key(URL) != report_before
+    assert extraction_cache_key(URL) == extraction_before
+
+
+def test_bump_do_relatorio_nao_afeta_as_dependencias(redis):
+    llm_before = namespace_token("llm")
+
+    bump_generation("report")
+
+    assert namespace_token("llm") == llm_before
+
+
+def test_geracoes_ficam_em_memoria_ate_o_refresh(redis):
+    for _ in range(10):
+        report_cache_key(URL)
+        extraction_cache_key(URL)
+
+    assert redis.mget_calls == 1
+
+
+def test_bump_em_outro_processo_chega_apos_o_refresh(redis, settings):
+    before = report_cache_key(URL)
+    redis.incr("cache:generation:llm")
+
+    assert report_cache_key(URL) == before
+
+    _generations.invalidate()  # equivale ao fim do intervalo de refresh
+    assert report_cache_key(URL) != before
+
+
+def test_sem_redis_mantem_a_ultima_geracao(redis, mocker):
+    bump_generation("llm")
+    before = report_cache_key(URL)
+    _generations.invalidate()
+    redis.mget = mocker.Mock(side_effect=ConnectionError("redis fora"))
+
+    assert report_cache_key(URL) == before
+    assert report_cache_key(URL) == before
+    assert redis.mget.call_count == 1
+
+
+def test_namespace_desconhecido(redis):
+    with pytest.raises(ValueError):
+        bump_generation("inexistente")
+
+
+def test_resultados_de_prompt_antigo_nao_sao_reaproveitados(redis, mocker):
+    mocker.patch("analysis.caching.extraction_cache.cache")
+    entry = store_extraction(
+        URL,
+        {"content": "texto"},
+        {"etag": '"v1"'},
+        fact_check={},
+        llm={"recommendation": "CONFIE NO CONTEÚDO"},
+    )
+    assert reusable_results(entry) is not None
+
+    bump_generation("llm")
+
+    assert reusable_results(entry) is None
+
+
+def test_comando_incrementa_os_namespaces(redis, capsys):
+    call_command("bump_cache_generation", "llm", "fact_check")
+
+    assert redis.values["cache:generation:llm"] == 1
+    assert redis.values["cache:generation:fact_check"] == 1
+    output = capsys.readouterr().out
+    assert "invalida também: report" in output
+    assert all(namespace in output for namespace in NAMESPACE_VERSIONS)
+
+
+def test_comando_rejeita_namespace_desconhecido(redis):
+    with pytest.raises(CommandError):
+        call_command("bump_cache_generation", "inexistente")
+
+    assert redis.values == {}
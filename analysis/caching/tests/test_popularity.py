@@ -0,0 +1,86 @@
+"""Testes para o placar de popularidade e o aquecimento do cache."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.test import override_settings
+
+from analysis.caching import popularity
+from analysis.caching.keys import report_cache_key
+
+
+@pytest.fixture
+def redis(mocker):
+    client = MagicMock()
+    mocker.patch.object(popularity, "get_redis_connection", return_value=client)
+    return client
+
+
+def test_record_request_incrementa_placar(redis):
+    """Testa que cada requisição soma um ponto à URL no sorted set."""
+    popularity.record_request("https://g1.globo.com/noticia")
+
+    redis.zincrby.assert_called_once_with(
+        popularity.POPULARITY_KEY, 1, "https://g1.globo.com/noticia"
+    )
+
+
+def test_record_request_ignora_falha_do_redis(redis):
+    """Testa que uma falha no Redis não derruba a requisição."""
+    redis.zincrby.side_effect = ConnectionError("redis fora")
+
+    popularity.record_request("https://g1.globo.com/noticia")
+
+
+@override_settings(
+    POPULARITY_WARM_INTERVAL=60, POPULARITY_HALF_LIFE=60, POPULARITY_MAX_TRACKED=100
+)
+def test_decay_popularity_aplica_meia_vida_e_poda(redis):
+    """Testa que o placar decai pela meia-vida e descarta o excedente."""
+    popularity.decay_popularity()
+
+    pipe = redis.pipeline.return_value
+    pipe.zunionstore.assert_called_once_with(
+        popularity.POPULARITY_KEY, {popularity.POPULARITY_KEY: 0.5}
+    )
+    pipe.zremrangebyscore.assert_called_once_with(
+        popularity.POPULARITY_KEY, "-inf", f"({popularity.MIN_TRACKED_SCORE}"
+    )
+    pipe.zremrangebyrank.assert_called_once_with(popularity.POPULARITY_KEY, 0, -101)
+    pipe.execute.assert_called_once()
+
+
+@override_settings(POPULARITY_REFRESH_WINDOW=60)
+def test_reports_to_warm_seleciona_apenas_relatorios_perto_de_expirar(redis, mocker):
+    """Testa que só URLs quentes prestes a expirar (ou expiradas) são reanalisadas."""
+    redis.zrevrangebyscore.return_value = [
+        (b"https://a.com", 10.0),
+        (b"https://b.com", 8.0),
+        (b"https://c.com", 5.0),
+    ]
+    ttls = {
+        report_cache_key("https://a.com"): 30,
+        report_cache_key("https://b.com"): 240,
+        report_cache_key("https://c.com"): 0,
+    }
+    cache = mocker.patch.object(popularity, "cache")
+    cache.ttl.side_effect = ttls.get
+    cache.add.return_value = True
+
+    warm = list(popularity.reports_to_warm())
+
+    assert warm == [
+        ("https://a.com", report_cache_key("https://a.com")),
+        ("https://c.com", report_cache_key("https://c.com")),
+    ]
+
+
+@override_settings(POPULARITY_REFRESH_WINDOW=60)
+def test_reports_to_warm_nao_repete_reanalise_na_mesma_janela(redis, mocker):
+    """Testa que a trava impede reenfileirar a mesma URL na mesma janela."""
+    redis.zrevrangebyscore.return_value = [(b"https://a.com", 10.0)]
+    cache = mocker.patch.object(popularity, "cache")
+    cache.ttl.return_value = 10
+    cache.add.return_value = False
+
+    assert list(popularity.reports_to_warm()) == []
@@ -0,0 +1,72 @@
+"""Testes para a política de TTL dos relatórios em cache."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from analysis.caching.ttl_policy import content_age_days, report_ttl
+
+NOW = datetime(2025, 10, 20, 12, 0, tzinfo=timezone.utc)
+
+
+def _report(source="INTELIGÊNCIA ARTIFICIAL (LLM)", vt_status="completed", **extra):
+    return {
+        "final_verdict_source": source,
+        "virustotal_report": {"status": vt_status},
+        "cancelled_stages": [],
+        "firecrawl_data": {},
+        **extra,
+    }
+
+
+@pytest.fixture(autouse=True)
+def ttls(settings):
+    settings.REPORT_TTL_FACT_CHECK = 604800
+    settings.REPORT_TTL_BLOCKED = 21600
+    settings.REPORT_TTL_LLM = 1800
+    settings.REPORT_TTL_PROVISIONAL = 60
+    settings.REPORT_TTL_POPULAR_MAX = 600
+    settings.REPORT_OLD_CONTENT_DAYS = 7
+    settings.POPULARITY_MIN_SCORE = 3
+
+
+@pytest.mark.parametrize(
+    "report, expected",
+    [
+        (_report(source="HUMANO (Fact-Check)"), 604800),
+        (_report(source="REPUTAÇÃO DO DOMÍNIO", vt_status="domain_blocked"), 21600),
+        (_report(), 1800),
+        (_report(vt_status="queued"), 60),
+        (_report(source="HUMANO (Fact-Check)", vt_status="queued"), 60),
+        (_report(cancelled_stages=["llm"]), 60),
+    ],
+    ids=["fact_check", "bloqueio", "llm", "vt_na_fila", "fact_check_vt_na_fila", "parcial"],
+)
+def test_report_ttl_por_fonte_e_status(report, expected):
+    """Testa o TTL pela fonte do veredicto e pelo status do VirusTotal."""
+    assert report_ttl(report, now=NOW) == expected
+
+
+def test_report_ttl_pela_idade_do_conteudo():
+    """Testa que notícias antigas ficam mais tempo e as do dia, menos."""
+    old = _report(firecrawl_data={"published_at": "2025-09-01T10:00:00Z"})
+    fresh = _report(firecrawl_data={"published_at": "2025-10-20T09:00:00-03:00"})
+    unknown = _report(firecrawl_data={"published_at": "ontem"})
+
+    assert report_ttl(old, now=NOW) == 7200
+    assert report_ttl(fresh, now=NOW) == 900
+    assert report_ttl(unknown, now=NOW) == 1800
+
+
+def test_report_ttl_limita_urls_em_alta():
+    """Testa que URLs populares com veredicto da LLM são renovadas mais cedo."""
+    old = _report(firecrawl_data={"published_at": "2025-09-01T10:00:00Z"})
+
+    assert report_ttl(old, popularity=10, now=NOW) == 600
+    assert report_ttl(_report(source="HUMANO (Fact-Check)"), popularity=10) == 604800
+
+
+def test_content_age_days_sem_fuso_assume_utc():
+    """Testa o cálculo da idade com datas sem fuso horário."""
+    assert content_age_days("2025-10-19T12:00:00", now=NOW) == 1
+    assert content_age_days("", now=NOW) is None
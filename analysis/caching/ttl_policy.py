@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+# Status do VirusTotal que não vão mudar numa nova consulta
+FINAL_VT_STATUSES = frozenset({"completed", "skipped", "domain_blocked", "threat_feed_match"})
+
+FACT_CHECK_SOURCE = "HUMANO (Fact-Check)"
+BLOCKED_SOURCES = frozenset({"LISTA DE AMEAÇAS (Feed offline)", "REPUTAÇÃO DO DOMÍNIO"})
+
+
+def content_age_days(published_at, now=None):
+    if not published_at:
+        return None
+    try:
+        published = datetime.fromisoformat(published_at)
+    except ValueError:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return max(0.0, (now - published).total_seconds() / 86400)
+
+
+def report_ttl(report, popularity=0.0, now=None):
+    """TTL do relatório em cache, a partir do conteúdo do próprio relatório.
+
+    Relatórios provisórios (etapas canceladas, VirusTotal ainda na fila) são
+    renovados rápido; vereditos estáveis (fact-check humano, bloqueios) ficam
+    muito mais tempo. Para vereditos da LLM, notícias antigas mudam pouco e
+    ganham TTL maior, e URLs em alta têm o TTL limitado para seguirem frescas
+    (o aquecimento por popularidade as reanalisa antes de expirar).
+    """
+    if report.get("cancelled_stages"):
+        return settings.REPORT_TTL_PROVISIONAL
+
+    vt_status = (report.get("virustotal_report") or {}).get("status")
+    if vt_status not in FINAL_VT_STATUSES:
+        return settings.REPORT_TTL_PROVISIONAL
+
+    source = report.get("final_verdict_source")
+    if source == FACT_CHECK_SOURCE:
+        return settings.REPORT_TTL_FACT_CHECK
+    if source in BLOCKED_SOURCES:
+        return settings.REPORT_TTL_BLOCKED
+
+    ttl = settings.REPORT_TTL_LLM
+    age = content_age_days((report.get("firecrawl_data") or {}).get("published_at"), now)
+    if age is not None:
+        if age >= settings.REPORT_OLD_CONTENT_DAYS:
+            ttl *= 4
+        elif age < 1:
+            ttl //= 2
+
+    if popularity >= settings.POPULARITY_MIN_SCORE:
+        ttl = min(ttl, settings.REPORT_TTL_POPULAR_MAX)
+    return int(ttl)
@@ -0,0 +1,26 @@
+import time
+
+from celery import current_app
+from django.conf import settings
+
+# Publicada pelo nome: o processo web não importa analysis.tasks (e, com ele,
+# os SDKs dos provedores); só os workers carregam o pipeline
+ANALYSIS_TASK = "analysis.tasks.run_full_analysis_task"
+
+
+def enqueue_analysis(
+    url, cache_key, lane="interactive", profile=False, callback_url=None, api_key_id=None
+):
+    # "interactive" para quem espera na página de status, "bulk" para lotes
+    kwargs = {"enqueued_at": time.time(), "profile": profile}
+    if callback_url:
+        # Ao terminar, o worker entrega o relatório nessa URL, assinado com o
+        # segredo da chave de API que pediu o callback
+        kwargs["callback_url"] = callback_url
+        kwargs["api_key_id"] = api_key_id
+    return current_app.send_task(
+        ANALYSIS_TASK,
+        args=(url, cache_key),
+        kwargs=kwargs,
+        queue=settings.ANALYSIS_QUEUES[lane],
+    )
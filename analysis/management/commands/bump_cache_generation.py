@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analysis.caching import bump_generation, namespace_token
+from analysis.caching.namespaces import NAMESPACE_DEPENDENCIES, NAMESPACE_VERSIONS
+
+
+class Command(BaseCommand):
+    help = (
+        "Invalida namespaces inteiros do cache (ex.: llm após trocar o prompt) "
+        "incrementando a geração no Redis; as entradas antigas expiram sozinhas. "
+        "Sem argumentos, lista a versão e o token atual de cada namespace."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "namespaces",
+            nargs="*",
+            help=f"Namespaces a invalidar: {', '.join(NAMESPACE_VERSIONS)}",
+        )
+
+    def handle(self, *args, **options):
+        unknown = [name for name in options["namespaces"] if name not in NAMESPACE_VERSIONS]
+        if unknown:
+            raise CommandError(f"Namespaces desconhecidos: {', '.join(unknown)}")
+
+        for namespace in options["namespaces"]:
+            generation = bump_generation(namespace)
+            dependents = [
+                name for name, deps in NAMESPACE_DEPENDENCIES.items() if namespace in deps
+            ]
+            message = f"{namespace}: geração {generation}"
+            if dependents:
+                message += f" (invalida também: {', '.join(dependents)})"
+            self.stdout.write(self.style.SUCCESS(message))
+
+        for namespace, version in NAMESPACE_VERSIONS.items():
+            self.stdout.write(f"{namespace}: versão {version}, token {namespace_token(namespace)}")
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from analysis.models import ApiKey
+
+
+class Command(BaseCommand):
+    help = "Cria uma chave de API para um parceiro e exibe a chave uma única vez."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", help="Nome do parceiro/integração")
+        parser.add_argument(
+            "--tier",
+            default=ApiKey.TIER_FREE,
+            choices=[tier for tier, _ in ApiKey.TIER_CHOICES],
+        )
+
+    def handle(self, *args, **options):
+        api_key, raw_key = ApiKey.generate(options["name"], tier=options["tier"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Chave criada para {api_key} — guarde-a, ela não será exibida novamente:")
+        )
+        self.stdout.write(raw_key)
+        self.stdout.write("Segredo para conferir a assinatura dos webhooks desta chave:")
+        self.stdout.write(api_key.webhook_secret)
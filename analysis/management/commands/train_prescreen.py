@@ -0,0 +1,78 @@
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from analysis.services.prescreen import (
+    evaluate,
+    iter_cached_samples,
+    read_dataset,
+    train_model,
+    write_dataset,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Treina o classificador de triagem local com os vereditos da LLM guardados "
+        "no Redis (relatórios e extrações) e/ou arquivos JSON Lines."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dataset", nargs="*", default=[], help="Arquivos JSON Lines")
+        parser.add_argument(
+            "--no-cache", action="store_true", help="Não lê os vereditos guardados no Redis"
+        )
+        parser.add_argument("--export", help="Salva as amostras coletadas neste arquivo")
+        parser.add_argument("--holdout", type=float, default=0.2, help="Fração para avaliação")
+        parser.add_argument("--epochs", type=int, default=15)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default=settings.PRESCREEN_MODEL_PATH,
+            help="Caminho do modelo (substituído de forma atômica)",
+        )
+
+    def handle(self, *args, **options):
+        samples = []
+        for path in options["dataset"]:
+            try:
+                samples.extend(read_dataset(path))
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Não foi possível ler {path}: {e}")
+        if not options["no_cache"]:
+            try:
+                samples.extend(iter_cached_samples())
+            except AttributeError:
+                raise CommandError("O cache configurado não é o Redis; use --dataset.")
+
+        if len(samples) < 10:
+            raise CommandError(f"Amostras insuficientes para treinar: {len(samples)}")
+        if options["export"]:
+            write_dataset(samples, options["export"])
+
+        random.Random(options["seed"]).shuffle(samples)
+        split = int(len(samples) * (1 - options["holdout"]))
+        train, holdout = samples[:split], samples[split:]
+
+        start_time = time.time()
+        model = train_model(train, epochs=options["epochs"], seed=options["seed"])
+        elapsed = time.time() - start_time
+
+        if holdout:
+            metrics = evaluate(model, holdout, settings.PRESCREEN_TRUST_THRESHOLD)
+            model.metadata["holdout"] = metrics
+            self.stdout.write(
+                f"Avaliação ({metrics['samples']} amostras): acurácia {metrics['accuracy']:.1%}, "
+                f"LLM dispensada em {metrics['skip_rate']:.1%}, "
+                f"{metrics['false_skips']} dispensas indevidas "
+                f"(limite {settings.PRESCREEN_TRUST_THRESHOLD})"
+            )
+
+        model.save(options["output"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Modelo treinado com {len(train)} amostras em {elapsed:.2f}s: {options['output']}"
+            )
+        )
@@ -0,0 +1,222 @@
+import os
+import resource
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from analysis.services.exceptions import ProviderRateLimited, ProviderTransientError
+
+# Etapas do pipeline e o provedor externo de cada uma
+STAGE_PROVIDERS = {
+    "firecrawl": "firecrawl",
+    "vt_submit": "virustotal",
+    "vt_report": "virustotal",
+    "fact_check": "fact_check",
+    "llm": "gemini",
+}
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_DURATION = Histogram(
+    "factshield_stage_duration_seconds",
+    "Duração de cada etapa do pipeline de análise.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+ANALYSIS_DURATION = Histogram(
+    "factshield_analysis_duration_seconds",
+    "Duração total do pipeline de análise.",
+    buckets=LATENCY_BUCKETS,
+)
+QUEUE_WAIT = Histogram(
+    "factshield_queue_wait_seconds",
+    "Tempo entre o enfileiramento da análise e o início no worker.",
+    ["lane"],
+    buckets=LATENCY_BUCKETS,
+)
+PROVIDER_ERRORS = Counter(
+    "factshield_provider_errors_total",
+    "Falhas nas chamadas aos provedores externos.",
+    ["provider", "kind"],
+)
+MEMORY_BUCKETS = tuple(2**n * 1024 * 1024 for n in range(11))  # 1 MB a 1 GB
+
+TASK_PEAK_MEMORY = Histogram(
+    "factshield_task_peak_memory_bytes",
+    "Pico de memória alocada pelo Python durante a análise (tracemalloc).",
+    buckets=MEMORY_BUCKETS,
+)
+TASK_RSS_GROWTH = Histogram(
+    "factshield_task_rss_growth_bytes",
+    "Crescimento do pico de memória residente do processo durante a análise.",
+    buckets=MEMORY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "factshield_cache_requests_total",
+    "Consultas ao cache de relatórios.",
+    ["result"],
+)
+ANALYSIS_RETRIES = Counter(
+    "factshield_analysis_retries_total",
+    "Novas tentativas da análise agendadas após falhas temporárias.",
+    ["kind"],
+)
+RESUMED_STAGES = Counter(
+    "factshield_resumed_stages_total",
+    "Etapas aproveitadas de checkpoints de uma tentativa anterior.",
+    ["stage"],
+)
+LLM_CALLS = Histogram(
+    "factshield_llm_call_duration_seconds",
+    "Duração de cada tentativa na LLM, por modelo e resultado.",
+    ["model", "result"],
+    buckets=LATENCY_BUCKETS,
+)
+PRESCREEN_DECISIONS = Counter(
+    "factshield_prescreen_decisions_total",
+    "Decisões da triagem local: LLM dispensada (skip) ou chamada (llm).",
+    ["decision"],
+)
+WEBHOOK_DELIVERIES = Counter(
+    "factshield_webhook_deliveries_total",
+    "Tentativas de entrega de webhooks por resultado (delivered, retry, rejected, failed).",
+    ["result"],
+)
+WEBHOOK_DURATION = Histogram(
+    "factshield_webhook_duration_seconds",
+    "Duração de cada tentativa de entrega de webhook.",
+    buckets=LATENCY_BUCKETS,
+)
+EXTRACTIONS = Counter(
+    "factshield_extractions_total",
+    "Extrações de conteúdo por mecanismo (local ou Firecrawl) e resultado.",
+    ["engine", "result"],
+)
+
+
+def error_kind(exc):
+    if isinstance(exc, ProviderRateLimited):
+        return "rate_limited"
+    if isinstance(exc, ProviderTransientError):
+        return "transient"
+    return "error"
+
+
+def record_provider_error(stage, exc):
+    provider = STAGE_PROVIDERS.get(stage, stage)
+    PROVIDER_ERRORS.labels(provider=provider, kind=error_kind(exc)).inc()
+
+
+def record_cache(hit):
+    CACHE_REQUESTS.labels(result="hit" if hit else "miss").inc()
+
+
+def record_extraction(engine, result):
+    # result: "ok" ou o motivo do fallback (js_rendered, too_short, http_403...)
+    EXTRACTIONS.labels(engine=engine, result=result).inc()
+
+
+def record_retry(exc):
+    ANALYSIS_RETRIES.labels(kind=error_kind(exc)).inc()
+
+
+def record_resumed_stages(stages):
+    for stage in stages:
+        RESUMED_STAGES.labels(stage=stage).inc()
+
+
+def record_llm_call(model, elapsed, error=None):
+    result = "ok" if error is None else error_kind(error)
+    LLM_CALLS.labels(model=model, result=result).observe(elapsed)
+
+
+def record_prescreen(decision):
+    PRESCREEN_DECISIONS.labels(decision="skip" if decision.skip_llm else "llm").inc()
+
+
+def record_webhook(result, elapsed=None):
+    WEBHOOK_DELIVERIES.labels(result=result).inc()
+    if elapsed is not None:
+        WEBHOOK_DURATION.observe(elapsed)
+
+
+def record_queue_wait(enqueued_at, lane="interactive"):
+    if enqueued_at is None:
+        return None
+    wait = max(0.0, time.time() - enqueued_at)
+    QUEUE_WAIT.labels(lane=lane).observe(wait)
+    return round(wait, 3)
+
+
+@contextmanager
+def stage_timer(stage, timings=None):
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        record_provider_error(stage, e)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.labels(stage=stage).observe(elapsed)
+        if timings is not None:
+            timings[stage] = round(elapsed, 3)
+
+
+def timed(stage, func, timings=None):
+    def wrapper(*args, **kwargs):
+        with stage_timer(stage, timings):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _max_rss_bytes():
+    # ru_maxrss vem em KB no Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@contextmanager
+def memory_tracker(trace_allocations=False):
+    """Mede o pico de memória da análise: RSS sempre, tracemalloc sob demanda."""
+    usage = {}
+    rss_before = _max_rss_bytes()
+    started_tracing = trace_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    elif trace_allocations:
+        tracemalloc.reset_peak()
+
+    try:
+        yield usage
+    finally:
+        usage["rss_growth_bytes"] = _max_rss_bytes() - rss_before
+        TASK_RSS_GROWTH.observe(usage["rss_growth_bytes"])
+        if trace_allocations:
+            usage["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            TASK_PEAK_MEMORY.observe(usage["peak_bytes"])
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def metrics_registry():
+    # Com PROMETHEUS_MULTIPROC_DIR, agrega os processos do gunicorn/prefork
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics():
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
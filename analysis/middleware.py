@@ -0,0 +1,122 @@
+import secrets
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # sem o pacote Brotli, só gzip é oferecido
+    brotli = None
+
+
+class QuotaHeadersMiddleware(MiddlewareMixin):
+    """Expõe o saldo da cota da requisição (ver analysis.throttling.QuotaThrottle).
+
+    MiddlewareMixin atende os dois caminhos: no ASGI a cadeia inteira roda no
+    event loop, sem uma thread por requisição.
+    """
+
+    def process_response(self, request, response):
+        quota = getattr(request, "quota", None)
+        if quota:
+            response["X-RateLimit-Limit"] = str(quota["limit"])
+            response["X-RateLimit-Remaining"] = str(quota["remaining"])
+            response["X-RateLimit-Reset"] = str(quota["reset"])
+        return response
+
+
+def _accepted_encodings(header):
+    # "br;q=1.0, gzip;q=0.5, *;q=0" -> {"br": 1.0, "gzip": 0.5, "*": 0.0}
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header):
+    """Melhor codificação que o cliente aceita: br (se disponível), gzip ou None."""
+    accepted = _accepted_encodings(header or "")
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_quality = None, 0.0
+    for coding in offered:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _brotli_padding(max_random_bytes):
+    # Meta-bloco de metadados do brotli (RFC 7932, seção 9.2), ignorado pelo
+    # decodificador: ISLAST=0, MNIBBLES=0, MSKIPBYTES=1 e MSKIPLEN bytes aleatórios
+    size = secrets.randbelow(max_random_bytes) + 1
+    header = 0b11 << 1 | 1 << 4 | (size - 1) << 6
+    return header.to_bytes(2, "little") + secrets.token_bytes(size)
+
+
+def brotli_compress(data, quality, max_random_bytes):
+    """Comprime com brotli e insere um bloco de tamanho aleatório contra o BREACH.
+
+    Mesma mitigação do compress_string do Django para o gzip: o tamanho da
+    resposta deixa de revelar, byte a byte, o quanto ela comprimiu. O flush
+    alinha o fluxo no byte antes do bloco extra.
+    """
+    compressor = brotli.Compressor(quality=quality)
+    return (
+        compressor.process(data)
+        + compressor.flush()
+        + _brotli_padding(max_random_bytes)
+        + compressor.finish()
+    )
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware do Django com brotli na frente, só para respostas JSON grandes.
+
+    Respostas menores que COMPRESSION_MIN_BYTES saem como estão: nelas o custo de
+    CPU não compensa a economia de banda. Vary, o ETag fraco e o preenchimento
+    aleatório contra o BREACH (max_random_bytes) seguem o GZipMiddleware.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not response.get("Content-Type", "").startswith("application/json")
+            or len(response.content) < settings.COMPRESSION_MIN_BYTES
+        ):
+            return response
+
+        coding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+        if coding == "gzip":
+            return super().process_response(request, response)
+
+        # A representação depende do Accept-Encoding: caches e CDNs precisam saber
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if coding is None:
+            return response
+        compressed = brotli_compress(
+            response.content, settings.COMPRESSION_BROTLI_QUALITY, self.max_random_bytes
+        )
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Encoding"] = "br"
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = f"W/{etag}"
+        return response
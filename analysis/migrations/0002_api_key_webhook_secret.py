@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+import analysis.models
+
+
+def generate_secrets(apps, schema_editor):
+    # O default do AddField é calculado uma vez só: cada chave existente ganha o seu
+    ApiKey = apps.get_model("analysis", "ApiKey")
+    for api_key in ApiKey.objects.only("pk"):
+        api_key.webhook_secret = analysis.models.generate_webhook_secret()
+        api_key.save(update_fields=["webhook_secret"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0001_api_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='webhook_secret',
+            field=models.CharField(default=analysis.models.generate_webhook_secret, editable=False, max_length=64),
+        ),
+        migrations.RunPython(generate_secrets, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,54 @@
+import hashlib
+import secrets
+
 from django.db import models
 
-# Create your models here.
+KEY_PREFIX = "fs"
+
+
+def generate_webhook_secret():
+    return f"whsec_{secrets.token_urlsafe(32)}"
+
+
+class ApiKey(models.Model):
+    TIER_FREE = "free"
+    TIER_PARTNER = "partner"
+    TIER_ENTERPRISE = "enterprise"
+    TIER_CHOICES = [
+        (TIER_FREE, "Free"),
+        (TIER_PARTNER, "Partner"),
+        (TIER_ENTERPRISE, "Enterprise"),
+    ]
+
+    name = models.CharField(max_length=100)
+    prefix = models.CharField(max_length=12, unique=True, editable=False)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    tier = models.CharField(max_length=20, choices=TIER_CHOICES, default=TIER_FREE)
+    is_active = models.BooleanField(default=True)
+    # Assina os webhooks desta chave: um integrador não consegue forjar os de outro
+    webhook_secret = models.CharField(
+        max_length=64, default=generate_webhook_secret, editable=False
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "chave de API"
+        verbose_name_plural = "chaves de API"
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}…, {self.tier})"
+
+    @staticmethod
+    def hash_key(raw_key):
+        # Chaves têm 256 bits de entropia: SHA-256 basta e mantém a autenticação barata
+        return hashlib.sha256(raw_key.encode()).hexdigest()
+
+    @classmethod
+    def generate(cls, name, tier=TIER_FREE):
+        """Cria a chave e devolve (instância, chave em texto); o texto não é salvo."""
+        prefix = secrets.token_hex(4)
+        raw_key = f"{KEY_PREFIX}_{prefix}_{secrets.token_urlsafe(32)}"
+        api_key = cls.objects.create(
+            name=name, prefix=prefix, key_hash=cls.hash_key(raw_key), tier=tier
+        )
+        return api_key, raw_key
@@ -0,0 +1,25 @@
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer
+
+from analysis.util.fastjson import dumps
+
+
+class FastJSONRenderer(BaseRenderer):
+    """JSONRenderer com orjson; relatórios pré-serializados (RawJSON) passam direto."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data)
+
+
+class FastJSONResponse(HttpResponse):
+    """JsonResponse das views assíncronas, serializada pelo mesmo caminho do renderer."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(dumps(data), **kwargs)
@@ -1,3 +1,34 @@
-from .ai_llm import analyze_with_llm
-from .credibility import extract_content_firecrawl, search_fact_check
-from .virus_total import _scan_url, get_report
+import importlib
+
+from .exceptions import DeadlineExceeded, ProviderRateLimited, ProviderTransientError
+
+# Os provedores (google-genai, firecrawl, requests...) só são importados no
+# primeiro acesso: o processo web usa apenas as exceções e não paga o custo de
+# carregar os SDKs. Nome exportado -> submódulo que o define.
+_EXPORTS = {
+    "analyze_with_llm": ".ai_llm",
+    "extract_content": ".credibility",
+    "extract_content_firecrawl": ".credibility",
+    "search_fact_check": ".credibility",
+    "_scan_url": ".virus_total",
+    "get_report": ".virus_total",
+    "MALICIOUS": ".reputation",
+    "TRUSTED": ".reputation",
+    "domain_verdict_report": ".reputation",
+    "get_domain_reputation": ".reputation",
+    "prescreen_content": ".prescreen",
+    "prescreen_llm_result": ".prescreen",
+    "lookup_threat_feed": ".threat_feed",
+    "threat_feed_report": ".threat_feed",
+}
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted([*globals(), *_EXPORTS])
@@ -9,20 +9,37 @@ sys.path.append(
     )
 )
 import logging
+from functools import lru_cache
 
 from decouple import UndefinedValueError, config
-from google import genai
-from google.genai.errors import APIError
+from django.conf import settings
+from google import genai  # noqa: F401  (patch de genai.Client nos testes)
 from rest_framework.exceptions import APIException
 
+from .backends import FakeModelBackend, GeminiBackend
+from .router import get_model_router
+
 logger = logging.getLogger(__name__)
 
 
-def analyze_with_llm(raw_content):
+@lru_cache(maxsize=1)
+def _fake_backend():
+    return FakeModelBackend()
+
+
+def get_llm_backend():
+    # "fake" responde localmente, sem chave nem rede (desenvolvimento e testes)
+    if settings.LLM_BACKEND == "fake":
+        return _fake_backend()
     try:
         api_key = config("KEY_GEMINI_API")
     except UndefinedValueError:
         raise APIException("Chave GEMINI_API não encontrada no arquivo .env!")
+    return GeminiBackend(api_key)
+
+
+def analyze_with_llm(raw_content, deadline=None, lane="interactive"):
+    backend = get_llm_backend()
 
     safe_raw_content = raw_content.strip() if raw_content else None
 
@@ -49,49 +66,49 @@ def analyze_with_llm(raw_content):
         "\nNão inclua nenhum texto fora do objeto JSON."
     )
 
+    # Modelo escolhido pelo tamanho do texto, pela fila e pela saúde observada
+    # de cada modelo; falhas temporárias passam para o próximo
+    json_string, model = get_model_router().generate(
+        backend,
+        system_prompt,
+        user_prompt,
+        content_length=len(safe_content),
+        lane=lane,
+        deadline=deadline,
+    )
+
     try:
-        client = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=user_prompt,
-            config={
-                "system_instruction": system_prompt,
-                "response_mime_type": "application/json",
-            },
+        llm_data = json.loads(json_string)
+    except json.JSONDecodeError as e:
+        logger.warning(
+            f"Alerta: Falha no parsing do JSON. Retorno do LLM:\n{json_string}",
+            exc_info=True,
         )
-        json_string = response.text.strip()
-
-        try:
-            llm_data = json.loads(json_string)
-        except json.JSONDecodeError as e:
-            logger.warning(
-                f"Alerta: Falha no parsing do JSON. Retorno do LLM:\n{json_string}",
-                exc_info=True,
-            )
-            raise APIException(f"Erro ao analisar o JSON do LLM: {e}")
-
-        recommendation = (llm_data.get("recommendation") or "").upper()
-        if "EVITE" in recommendation:
-            llm_status = "ALTO RISCO"
-        elif "CAUTELA" in recommendation:
-            llm_status = "RISCO MODERADO"
-        else:
-            llm_status = "BAIXO RISCO"
+        raise APIException(f"Erro ao analisar o JSON do LLM: {e}")
 
-        return {
-            "llm_status": llm_status,
-            "llm_summary": llm_data.get("summary") or "N/A",
-            "llm_risk_assessment": llm_data.get("risk_assessment") or "N/A",
-            "llm_recommendation": llm_data.get("recommendation") or "N/A",
-        }
+    recommendation = (llm_data.get("recommendation") or "").upper()
+    if "EVITE" in recommendation:
+        llm_status = "ALTO RISCO"
+    elif "CAUTELA" in recommendation:
+        llm_status = "RISCO MODERADO"
+    else:
+        llm_status = "BAIXO RISCO"
 
-    except APIError as e:
-        raise APIException(f"Erro na API da LLM: {e}")
-    except Exception as e:
-        raise APIException(f"Erro inesperado na LLM: {e}")
+    return {
+        "llm_status": llm_status,
+        "llm_summary": llm_data.get("summary") or "N/A",
+        "llm_risk_assessment": llm_data.get("risk_assessment") or "N/A",
+        "llm_recommendation": llm_data.get("recommendation") or "N/A",
+        "llm_model": model,
+    }
 
 
 if __name__ == "__main__":
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     from analysis.services.credibility._firecrawl import extract_content_firecrawl
 
     url = "https://g1.globo.com/pr/parana/concursos-e-emprego/noticia/2025/10/01/concurso-adapar-concurso-parana.ghtml"
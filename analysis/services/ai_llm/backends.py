@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+
+import httpx
+from django.conf import settings
+from google import genai
+from google.genai.errors import APIError
+from rest_framework.exceptions import APIException
+
+from analysis.services.exceptions import (
+    ProviderRateLimited,
+    ProviderTransientError,
+    provider_error_for_status,
+)
+
+
+class GeminiBackend:
+    """Chamada real ao Gemini; um cliente por chamada, com o timeout da tentativa."""
+
+    name = "gemini"
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def generate(self, model, system_prompt, user_prompt, timeout):
+        http_options = {"timeout": int(timeout * 1000)}
+        if settings.GEMINI_API_URL:
+            http_options["base_url"] = settings.GEMINI_API_URL
+
+        try:
+            client = genai.Client(api_key=self.api_key, http_options=http_options)
+            response = client.models.generate_content(
+                model=model,
+                contents=user_prompt,
+                config={
+                    "system_instruction": system_prompt,
+                    "response_mime_type": "application/json",
+                },
+            )
+            return response.text.strip()
+        except APIError as e:
+            raise provider_error_for_status(
+                getattr(e, "code", None), f"Erro na API da LLM: {e}"
+            )
+        except httpx.TimeoutException as e:
+            raise ProviderTransientError(f"Tempo esgotado na API da LLM: {e}")
+        except Exception as e:
+            raise APIException(f"Erro inesperado na LLM: {e}")
+
+
+class FakeModelBackend:
+    """Modelos locais com latência e falhas programáveis, para testar o roteamento.
+
+    latency: {modelo: segundos}; failures: {modelo: "rate_limited" | "error" |
+    "timeout"} ou uma lista de resultados consumida a cada chamada. Uma latência
+    acima do timeout da tentativa vira timeout, como no SDK real.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=None, failures=None, answer=None, sleep=time.sleep):
+        self.latency = latency or {}
+        self.failures = {
+            model: list(outcome) if isinstance(outcome, (list, tuple)) else outcome
+            for model, outcome in (failures or {}).items()
+        }
+        self.answer = answer or {
+            "summary": "Resumo gerado pelo modelo local.",
+            "risk_assessment": "Sem sinais relevantes de desinformação.",
+            "recommendation": "CONFIE NO CONTEÚDO",
+        }
+        self.sleep = sleep
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _outcome(self, model):
+        with self._lock:
+            outcome = self.failures.get(model)
+            if isinstance(outcome, list):
+                return outcome.pop(0) if outcome else None
+            return outcome
+
+    def generate(self, model, system_prompt, user_prompt, timeout):
+        with self._lock:
+            self.calls.append(model)
+        delay = self.latency.get(model, 0.0)
+        if delay > timeout:
+            self.sleep(timeout)
+            raise ProviderTransientError(f"Tempo esgotado na API da LLM ({model})")
+        self.sleep(delay)
+
+        outcome = self._outcome(model)
+        if outcome == "rate_limited":
+            raise ProviderRateLimited(f"Erro na API da LLM: cota de {model} esgotada")
+        if outcome == "timeout":
+            raise ProviderTransientError(f"Tempo esgotado na API da LLM ({model})")
+        if outcome == "error":
+            raise ProviderTransientError(f"Erro na API da LLM: {model} indisponível")
+        return json.dumps(self.answer)
@@ -0,0 +1,163 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+
+from analysis.metrics import record_llm_call
+from analysis.services.exceptions import (
+    DeadlineExceeded,
+    ProviderRateLimited,
+    ProviderTransientError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Peso da observação mais recente nas médias móveis de latência e erro
+EWMA_ALPHA = 0.2
+
+
+@dataclass
+class ModelHealth:
+    latency: float = 0.0
+    error_rate: float = 0.0
+    cooldown_until: float = 0.0
+    calls: int = 0
+    # Próxima chamada de teste de um modelo rebaixado (0: modelo saudável)
+    probe_at: float = 0.0
+
+
+class ModelRouter:
+    """Escolhe o modelo da LLM e troca de modelo quando um deles falha ou demora.
+
+    A ordem de tentativa começa pelo modelo leve para textos curtos e lotes e
+    pelo principal no resto; modelos lentos, com muitos erros ou em cooldown
+    depois de um 429 vão para o fim da fila. Um modelo rebaixado volta à frente
+    para uma chamada de teste a cada LLM_HEALTH_PROBE_INTERVAL segundos e, se
+    ela for bem, sai do rebaixamento. As estatísticas são do processo.
+    """
+
+    def __init__(self, primary, light, clock=time.monotonic):
+        self.primary = primary
+        self.light = light
+        self.clock = clock
+        self._health = {}
+        self._lock = threading.Lock()
+
+    def health(self, model):
+        with self._lock:
+            return self._health.setdefault(model, ModelHealth())
+
+    def tier_order(self, content_length, lane="interactive"):
+        light_first = (
+            lane in settings.LLM_LIGHT_LANES or content_length <= settings.LLM_LIGHT_MAX_CHARS
+        )
+        order = [self.light, self.primary] if light_first else [self.primary, self.light]
+        return list(dict.fromkeys(order))
+
+    @staticmethod
+    def _unhealthy(health):
+        if health.calls < settings.LLM_MIN_CALLS_FOR_HEALTH:
+            return False
+        return (
+            health.latency > settings.LLM_SLOW_SECONDS
+            or health.error_rate > settings.LLM_MAX_ERROR_RATE
+        )
+
+    def degraded(self, model, now=None):
+        health = self.health(model)
+        now = self.clock() if now is None else now
+        if health.cooldown_until > now:
+            return True
+        # Sem chamadas as médias não mudam: passado o intervalo, o modelo rebaixado
+        # volta à frente para uma chamada de teste (reservada em _claim_probe)
+        return self._unhealthy(health) and now < health.probe_at
+
+    def _claim_probe(self, model):
+        now = self.clock()
+        if self.degraded(model, now):
+            return False
+        health = self.health(model)
+        if not self._unhealthy(health):
+            return True
+        # Uma chamada de teste por intervalo, mesmo com concorrência; o intervalo
+        # só começa a contar quando o modelo vai de fato ser chamado
+        with self._lock:
+            if now < health.probe_at:
+                return False
+            health.probe_at = now + settings.LLM_HEALTH_PROBE_INTERVAL
+        return True
+
+    def _next_attempt(self, order, position):
+        # Um modelo rebaixado cuja chamada de teste outra requisição já levou cede
+        # a vez aos seguintes; se nenhum estiver disponível, vai o da posição
+        for index in range(position, len(order)):
+            if self._claim_probe(order[index]):
+                order.insert(position, order.pop(index))
+                break
+        return order[position]
+
+    def candidates(self, content_length, lane="interactive"):
+        now = self.clock()
+        # sorted é estável: entre modelos saudáveis vale a ordem do tier
+        return sorted(
+            self.tier_order(content_length, lane), key=lambda model: self.degraded(model, now)
+        )
+
+    def record(self, model, elapsed, error=None):
+        with self._lock:
+            health = self._health.setdefault(model, ModelHealth())
+            was_unhealthy = self._unhealthy(health)
+            failed = 1.0 if error is not None else 0.0
+            if health.calls:
+                health.latency += EWMA_ALPHA * (elapsed - health.latency)
+                health.error_rate += EWMA_ALPHA * (failed - health.error_rate)
+            else:
+                health.latency, health.error_rate = elapsed, failed
+            health.calls += 1
+            if was_unhealthy and error is None and elapsed <= settings.LLM_SLOW_SECONDS:
+                # Chamada boa de um modelo rebaixado: volta à ativa com as médias zeradas
+                health.latency, health.error_rate, health.probe_at = elapsed, 0.0, 0.0
+            elif not was_unhealthy and self._unhealthy(health):
+                health.probe_at = self.clock() + settings.LLM_HEALTH_PROBE_INTERVAL
+            if isinstance(error, ProviderRateLimited):
+                health.cooldown_until = self.clock() + settings.LLM_RATE_LIMIT_COOLDOWN
+        record_llm_call(model, elapsed, error)
+
+    def _attempt_timeout(self, deadline, last):
+        if deadline is not None:
+            remaining = deadline.check()
+        else:
+            remaining = settings.PROVIDER_READ_TIMEOUT
+        # Só a última opção pode consumir o prazo inteiro; as outras cedem a vez
+        if last:
+            return remaining
+        return min(remaining, settings.LLM_ATTEMPT_TIMEOUT)
+
+    def generate(self, backend, system_prompt, user_prompt, content_length, lane, deadline=None):
+        """(resposta, modelo) da primeira tentativa bem-sucedida."""
+        order = self.candidates(content_length, lane)
+        last_error = None
+        for position in range(len(order)):
+            timeout = self._attempt_timeout(deadline, last=position == len(order) - 1)
+            model = self._next_attempt(order, position)
+            start = self.clock()
+            try:
+                text = backend.generate(model, system_prompt, user_prompt, timeout)
+            except ProviderTransientError as e:
+                self.record(model, self.clock() - start, e)
+                if isinstance(e, DeadlineExceeded):
+                    raise
+                logger.warning(f"Modelo {model} falhou ({e}); tentando o próximo")
+                last_error = e
+                continue
+            self.record(model, self.clock() - start)
+            return text, model
+        raise last_error
+
+
+@lru_cache(maxsize=1)
+def get_model_router():
+    return ModelRouter(settings.LLM_MODEL_PRIMARY, settings.LLM_MODEL_LIGHT)
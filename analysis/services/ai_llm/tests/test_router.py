@@ -0,0 +1,223 @@
+"""Testes para o roteamento entre modelos da LLM, com o backend local falso."""
+
+import pytest
+
+from analysis.services.ai_llm import analyze as analyze_module
+from analysis.services.ai_llm.backends import FakeModelBackend
+from analysis.services.ai_llm.router import ModelRouter, get_model_router
+from analysis.services.exceptions import (
+    DeadlineExceeded,
+    ProviderRateLimited,
+)
+from analysis.util.deadline import Deadline
+
+PRIMARY = "gemini-2.5-flash"
+LIGHT = "gemini-2.5-flash-lite"
+SHORT = 500
+LONG = 6000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture(autouse=True)
+def routing(settings):
+    settings.LLM_LIGHT_MAX_CHARS = 1500
+    settings.LLM_LIGHT_LANES = ["bulk"]
+    settings.LLM_ATTEMPT_TIMEOUT = 20
+    settings.LLM_SLOW_SECONDS = 15
+    settings.LLM_MAX_ERROR_RATE = 0.5
+    settings.LLM_MIN_CALLS_FOR_HEALTH = 3
+    settings.LLM_RATE_LIMIT_COOLDOWN = 30
+    settings.LLM_HEALTH_PROBE_INTERVAL = 60
+    settings.PROVIDER_READ_TIMEOUT = 60
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def router(clock):
+    return ModelRouter(PRIMARY, LIGHT, clock=clock)
+
+
+def backend(clock, **kwargs):
+    return FakeModelBackend(sleep=clock.advance, **kwargs)
+
+
+def generate(router, fake, length=SHORT, lane="interactive", deadline=None):
+    return router.generate(fake, "sistema", "prompt", length, lane, deadline)
+
+
+@pytest.mark.parametrize(
+    "length, lane, expected",
+    [
+        (SHORT, "interactive", [LIGHT, PRIMARY]),
+        (LONG, "interactive", [PRIMARY, LIGHT]),
+        (LONG, "bulk", [LIGHT, PRIMARY]),
+    ],
+)
+def test_tier_pelo_tamanho_e_pela_fila(router, length, lane, expected):
+    """Testa o modelo leve para textos curtos e lotes."""
+    assert router.candidates(length, lane) == expected
+
+
+def test_429_passa_para_o_outro_modelo_e_entra_em_cooldown(router, clock):
+    """Testa o failover no rate limit e o cooldown do modelo limitado."""
+    fake = backend(clock, failures={LIGHT: ["rate_limited"]})
+
+    _, model = generate(router, fake)
+
+    assert model == PRIMARY
+    assert fake.calls == [LIGHT, PRIMARY]
+    assert router.candidates(SHORT) == [PRIMARY, LIGHT]
+
+    clock.advance(31)
+    assert router.candidates(SHORT) == [LIGHT, PRIMARY]
+
+
+def test_modelo_lento_cede_a_vez_e_e_rebaixado(router, clock):
+    """Testa o timeout por tentativa e o rebaixamento pela latência observada."""
+    fake = backend(clock, latency={PRIMARY: 40, LIGHT: 2})
+
+    for _ in range(3):
+        _, model = generate(router, fake, LONG)
+        assert model == LIGHT
+
+    assert fake.calls == [PRIMARY, LIGHT] * 3
+    assert router.health(PRIMARY).latency == pytest.approx(20)
+    assert router.candidates(LONG) == [LIGHT, PRIMARY]
+
+
+def test_taxa_de_erros_rebaixa_o_modelo(router, clock):
+    """Testa o rebaixamento pela taxa de erros, só depois de chamadas suficientes."""
+    fake = backend(clock, failures={PRIMARY: ["error"] * 3})
+
+    generate(router, fake, LONG)
+    assert router.candidates(LONG) == [PRIMARY, LIGHT]
+
+    generate(router, fake, LONG)
+    generate(router, fake, LONG)
+    assert router.candidates(LONG) == [LIGHT, PRIMARY]
+
+
+def test_modelo_rebaixado_volta_depois_de_se_recuperar(router, clock):
+    """Testa a chamada de teste do modelo rebaixado e a volta dele à frente da fila."""
+    fake = backend(clock, failures={PRIMARY: ["error"] * 3})
+    for _ in range(3):
+        generate(router, fake, LONG)
+    assert router.candidates(LONG) == [LIGHT, PRIMARY]
+
+    clock.advance(30)
+    assert router.candidates(LONG) == [LIGHT, PRIMARY]
+
+    # Passado o intervalo, uma única requisição testa o modelo principal
+    clock.advance(31)
+    fake.calls.clear()
+    _, model = generate(router, fake, LONG)
+    assert model == PRIMARY
+    assert fake.calls == [PRIMARY]
+
+    assert router.candidates(LONG) == [PRIMARY, LIGHT]
+    assert router.health(PRIMARY).error_rate == 0.0
+
+
+def test_chamada_de_teste_com_falha_mantem_o_rebaixamento(router, clock):
+    """Testa que o modelo que continua falhando espera outro intervalo."""
+    fake = backend(clock, failures={PRIMARY: "error"})
+    for _ in range(3):
+        generate(router, fake, LONG)
+
+    clock.advance(61)
+    fake.calls.clear()
+    generate(router, fake, LONG)
+
+    assert fake.calls == [PRIMARY, LIGHT]
+    assert router.candidates(LONG) == [LIGHT, PRIMARY]
+
+
+def test_chamada_de_teste_so_conta_quando_o_modelo_e_chamado(router, clock):
+    """Testa que ordenar os candidatos ou estourar o prazo não gasta a chamada de teste."""
+    fake = backend(clock, failures={PRIMARY: ["error"] * 3})
+    for _ in range(3):
+        generate(router, fake, LONG)
+    clock.advance(61)
+    probe_at = router.health(PRIMARY).probe_at
+
+    assert router.candidates(LONG) == [PRIMARY, LIGHT]
+    assert router.candidates(LONG) == [PRIMARY, LIGHT]
+    with pytest.raises(DeadlineExceeded):
+        generate(router, fake, LONG, deadline=Deadline(0))
+    assert router.health(PRIMARY).probe_at == probe_at
+
+    fake.calls.clear()
+    _, model = generate(router, fake, LONG)
+    assert model == PRIMARY
+    assert fake.calls == [PRIMARY]
+
+
+def test_chamada_de_teste_ja_reservada_cede_a_vez(router, clock):
+    """Testa que só uma requisição por intervalo chama o modelo rebaixado."""
+    fake = backend(clock, failures={PRIMARY: ["error"] * 3})
+    for _ in range(3):
+        generate(router, fake, LONG)
+    clock.advance(61)
+
+    # Outra requisição reservou a chamada de teste depois desta ordenar os candidatos
+    order = router.candidates(LONG)
+    assert router._claim_probe(PRIMARY)
+    assert router._next_attempt(order, 0) == LIGHT
+    assert order == [LIGHT, PRIMARY]
+
+
+def test_todos_os_modelos_falham(router, clock):
+    """Testa que, sem reserva disponível, o erro temporário chega ao pipeline."""
+    fake = backend(clock, failures={PRIMARY: "rate_limited", LIGHT: "rate_limited"})
+
+    with pytest.raises(ProviderRateLimited):
+        generate(router, fake)
+    assert fake.calls == [LIGHT, PRIMARY]
+
+
+def test_ultima_tentativa_usa_o_prazo_restante(router, clock):
+    """Testa que só a reserva final pode consumir o prazo inteiro."""
+    fake = backend(clock, latency={LIGHT: 25, PRIMARY: 25})
+
+    # 25s estoura os 20s da primeira tentativa, mas cabe nos 30s do prazo
+    _, model = generate(router, fake, deadline=Deadline(30))
+
+    assert model == PRIMARY
+    assert fake.calls == [LIGHT, PRIMARY]
+
+
+def test_prazo_esgotado_nao_tenta_outro_modelo(router, clock):
+    fake = backend(clock)
+
+    with pytest.raises(DeadlineExceeded):
+        generate(router, fake, deadline=Deadline(0))
+    assert fake.calls == []
+
+
+def test_analyze_com_backend_falso(settings):
+    """Testa o pipeline da LLM sem chave nem rede, com o modelo no resultado."""
+    settings.LLM_BACKEND = "fake"
+    get_model_router.cache_clear()
+    analyze_module._fake_backend.cache_clear()
+    try:
+        result = analyze_module.analyze_with_llm("Conteúdo de teste. " * 20, lane="bulk")
+    finally:
+        get_model_router.cache_clear()
+
+    assert result["llm_model"] == settings.LLM_MODEL_LIGHT
+    assert result["llm_recommendation"] == "CONFIE NO CONTEÚDO"
+    assert result["llm_status"] == "BAIXO RISCO"
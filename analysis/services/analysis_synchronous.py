@@ -74,6 +74,11 @@ def run_full_analysis_synchronous(url):
 
 
 if __name__ == "__main__":
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     url = "https://g1.globo.com/pr/parana/concursos-e-emprego/noticia/2025/10/01/concurso-adapar-concurso-parana.ghtml"
 
     reusltado = run_full_analysis_synchronous(url=url)
@@ -1,2 +1,3 @@
 from ._firecrawl import extract_content_firecrawl
 from .google_fact_check import search_fact_check
+from .extraction import extract_content
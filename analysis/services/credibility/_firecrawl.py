@@ -1,17 +1,28 @@
+import logging
 import os
 import sys
 
+import requests
 from decouple import UndefinedValueError, config
+from django.conf import settings
 from firecrawl import FirecrawlApp
+from firecrawl.v2.utils.error_handler import FirecrawlError
 from rest_framework.exceptions import APIException
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 from pprint import pprint
 
+from analysis.services.exceptions import (
+    ProviderTransientError,
+    provider_error_for_status,
+)
 from analysis.util.clean import clean_content
+from analysis.util.deadline import timeout_ms
 
+logger = logging.getLogger(__name__)
 
-def extract_content_firecrawl(url):
+
+def extract_content_firecrawl(url, deadline=None):
     try:
         api_key = config("KEY_FIRECRAWL")
         if not api_key:
@@ -19,32 +30,63 @@ def extract_content_firecrawl(url):
     except UndefinedValueError:
         raise APIException("Chave API KEY não encontrada no .env!")
 
-    client = FirecrawlApp(api_key=api_key)
+    client = FirecrawlApp(api_key=api_key, api_url=settings.FIRECRAWL_API_URL)
 
     try:
-        doc = client.scrape(url, formats=["markdown"], only_main_content=True)
+        doc = client.scrape(
+            url,
+            formats=["markdown"],
+            only_main_content=True,
+            timeout=timeout_ms(deadline),
+        )
         if not doc:
             raise APIException('"Não foi possível obter dados da URL."')
 
-        raw_content = doc.markdown
+        metadata = doc.metadata
+        # Páginas gigantes: corta o markdown antes da limpeza e solta o documento
+        raw_content = doc.markdown or ""
+        del doc
+        max_chars = settings.FIRECRAWL_MAX_DOCUMENT_CHARS
+        if max_chars and len(raw_content) > max_chars:
+            logger.info(
+                f"Conteúdo de {url} truncado de {len(raw_content)} para {max_chars} caracteres"
+            )
+            raw_content = raw_content[:max_chars]
         cleaned_content = clean_content(raw_content)
 
+        published_at = getattr(metadata, "published_time", None) or getattr(
+            metadata, "dc_date", None
+        )
+
         data = {
-            "title": getattr(doc.metadata, "title", "") or "",
-            "description": getattr(doc.metadata, "description", "") or "",
+            "title": getattr(metadata, "title", "") or "",
+            "description": getattr(metadata, "description", "") or "",
             "content": cleaned_content,
-            "url": getattr(doc.metadata, "url", "") or "",
+            "url": getattr(metadata, "url", "") or "",
+            "published_at": published_at if isinstance(published_at, str) else "",
         }
 
         return data
 
     except APIException as e:
         raise e
+    except FirecrawlError as e:
+        raise provider_error_for_status(
+            getattr(e, "status_code", None), f"Erro ao acessar Firecrawl: {e}"
+        )
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        raise ProviderTransientError(f"Erro ao acessar Firecrawl: {e}")
     except Exception as e:
         raise APIException(f"Erro ao acessar Firecrawl: {e}")
 
 
 if __name__ == "__main__":
+    import django
+    import os
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     url = "https://g1.globo.com/pr/parana/concursos-e-emprego/noticia/2025/10/01/concurso-adapar-concurso-parana.ghtml"
     url2 = "https://brasileirotrabalhador.com.br/novo-salario-minimo-deixa-brasileiros-pulando-de-alegria/"
     data = extract_content_firecrawl(url)
@@ -0,0 +1,61 @@
+import logging
+
+from django.conf import settings
+
+from analysis.caching import content_hash
+from analysis.metrics import record_extraction
+from analysis.services.exceptions import ProviderTransientError
+
+from ._firecrawl import extract_content_firecrawl
+from .local_extractor import LowQualityExtraction, NotModified, extract_content_local
+
+logger = logging.getLogger(__name__)
+
+
+def extract_content(url, deadline=None, cached=None):
+    """Extrai o artigo localmente e só recorre ao Firecrawl quando a página pede.
+
+    Páginas renderizadas no servidor saem do extrator local, sem a ida e volta
+    à API; páginas só com JavaScript, curtas demais ou que recusam o download
+    vão para o Firecrawl.
+
+    Com a extração anterior (`cached`), o download é condicional: um 304 devolve
+    a extração guardada, e um conteúdo com o mesmo hash é marcado "unchanged".
+    O dict devolvido traz os validadores em "validators".
+    """
+    previous = (cached or {}).get("validators") or {}
+    if settings.LOCAL_EXTRACTOR_ENABLED:
+        try:
+            data = extract_content_local(url, deadline=deadline, validators=previous)
+        except NotModified:
+            record_extraction("local", "not_modified")
+            return {
+                **cached["data"],
+                "validators": previous,
+                "revalidation": "not_modified",
+            }
+        except LowQualityExtraction as e:
+            reason = e.reason
+        except ProviderTransientError as e:
+            logger.info(f"Download local de {url} falhou: {e}")
+            reason = "fetch_error"
+        else:
+            record_extraction("local", "ok")
+            return _revalidated({**data, "extractor": "local"}, previous, cached)
+        record_extraction("local", reason)
+        logger.info(f"Extração local de {url} descartada ({reason}); usando o Firecrawl")
+        if deadline is not None:
+            deadline.check()
+
+    data = extract_content_firecrawl(url, deadline=deadline)
+    record_extraction("firecrawl", "ok")
+    return _revalidated({**data, "extractor": "firecrawl"}, previous, cached)
+
+
+def _revalidated(data, previous, cached):
+    validators = {**data.get("validators", {}), "content_hash": content_hash(data["content"])}
+    data["validators"] = validators
+    if cached:
+        unchanged = validators["content_hash"] == previous.get("content_hash")
+        data["revalidation"] = "unchanged" if unchanged else "changed"
+    return data
@@ -2,10 +2,17 @@ from pprint import pprint
 
 import requests
 from decouple import UndefinedValueError, config
+from django.conf import settings
 from rest_framework.exceptions import APIException
 
+from analysis.services.exceptions import (
+    ProviderTransientError,
+    provider_error_for_status,
+)
+from analysis.util.deadline import request_timeout
 
-def search_fact_check(query):
+
+def search_fact_check(query, deadline=None):
     try:
         api_key = config("KEY_FACT_CHECK")
         if not api_key:
@@ -13,18 +20,22 @@ def search_fact_check(query):
     except UndefinedValueError:
         raise APIException("Chave API GOOGLE_FACTCHECK não encontrada no .env!")
 
-    url_google = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+    url_google = settings.FACT_CHECK_API_URL
 
     params = {"key": api_key, "query": query, "languageCode": "pt-BR", "pageSize": 5}
 
     try:
-        response = requests.get(url=url_google, params=params)
+        response = requests.get(
+            url=url_google, params=params, timeout=request_timeout(deadline)
+        )
         data = response.json()
         if response.status_code != 200:
             error_message = data.get("error", {}).get(
                 "message", "Erro desconhecido ou falha ao ler o JSON"
             )
-            raise APIException(f"Erro na API: {error_message}")
+            raise provider_error_for_status(
+                response.status_code, f"Erro na API: {error_message}"
+            )
 
         claims = data.get("claims", [])
         if not claims:
@@ -48,6 +59,8 @@ def search_fact_check(query):
         raise e
     except requests.exceptions.HTTPError as e:
         raise APIException(f"Erro na API: {e}")
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        raise ProviderTransientError(f"Erro na requisição da API: {e}")
     except requests.exceptions.RequestException as e:
         raise APIException(f"Erro na requisição da API: {e}")
     except Exception as e:
@@ -55,6 +68,13 @@ def search_fact_check(query):
 
 
 if __name__ == "__main__":
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     query = "Vacinas causam autismo"
 
     try:
@@ -0,0 +1,527 @@
+import logging
+import re
+import socket
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from analysis.services.exceptions import ProviderTransientError
+from analysis.util.clean import clean_content
+from analysis.util.url import is_public_host
+
+logger = logging.getLogger(__name__)
+
+# Conteúdo dessas tags nunca entra no texto do artigo
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "iframe", "form",
+    "button", "select", "nav", "footer", "aside", "header",
+}
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "source", "track", "wbr",
+}
+# Elementos que delimitam blocos de texto
+_BLOCK_TAGS = {
+    "p", "pre", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6", "li",
+    "div", "section", "article", "main", "td", "dd", "figcaption", "table", "ul", "ol",
+}
+# Blocos que pontuam o elemento pai (as "divs sem parágrafo" contam como <p>)
+_SCORED_TAGS = {"p", "pre", "blockquote", "div", "section", "article", "main", "td"}
+_HEADING_TAGS = {"h2", "h3"}
+
+# Pontuação inicial por tag, como no Readability; <article>/<main> ganham bônus
+_TAG_SCORES = {
+    "article": 10, "main": 10, "div": 5, "pre": 3, "td": 3, "blockquote": 3,
+    "ol": -3, "ul": -3, "li": -3, "dl": -3, "dd": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+_POSITIVE_NAMES = re.compile(
+    r"article|body|content|entry|main|post|story|text|materia|noticia|texto|corpo",
+    re.IGNORECASE,
+)
+_NEGATIVE_NAMES = re.compile(
+    r"comment|comentario|footer|sidebar|widget|nav|menu|share|social|related|"
+    r"relacionad|promo|banner|advert|publicidade|newsletter|cookie|modal|popup",
+    re.IGNORECASE,
+)
+
+_MIN_BLOCK_CHARS = 25
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+_TITLE_KEYS = ("og:title", "twitter:title")
+_DESCRIPTION_KEYS = ("og:description", "description", "twitter:description")
+_PUBLISHED_KEYS = (
+    "article:published_time", "og:article:published_time", "datepublished",
+    "date", "pubdate", "publishdate", "dc.date",
+)
+
+
+class LowQualityExtraction(Exception):
+    """A extração local não serve; o motivo decide o fallback para o Firecrawl."""
+
+    def __init__(self, reason, message=""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+class NotModified(Exception):
+    """A página respondeu 304 à requisição condicional: a extração anterior vale."""
+
+
+@dataclass
+class ExtractedArticle:
+    title: str
+    description: str
+    content: str
+    url: str
+    published_at: str
+    paragraphs: int
+    link_density: float
+    visible_chars: int
+    script_chars: int
+
+    def as_data(self):
+        # Mesmo formato do extract_content_firecrawl
+        return {
+            "title": self.title,
+            "description": self.description,
+            "content": self.content,
+            "url": self.url,
+            "published_at": self.published_at,
+        }
+
+
+class _Node:
+    __slots__ = ("tag", "parent", "bonus", "score", "text_chars", "link_chars", "children")
+
+    def __init__(self, tag, parent, attrs):
+        self.tag = tag
+        self.parent = parent
+        self.bonus = _TAG_SCORES.get(tag, 0) + _class_weight(attrs)
+        self.score = None
+        self.text_chars = 0
+        self.link_chars = 0
+        self.children = []
+
+    def final_score(self):
+        density = self.link_chars / self.text_chars if self.text_chars else 0
+        return (self.bonus + self.score) * (1 - density)
+
+
+def _class_weight(attrs):
+    names = " ".join(value or "" for key, value in attrs if key in ("class", "id"))
+    if not names:
+        return 0
+    weight = 0
+    if _NEGATIVE_NAMES.search(names):
+        weight -= 25
+    if _POSITIVE_NAMES.search(names):
+        weight += 25
+    return weight
+
+
+class ArticleParser(HTMLParser):
+    """Extrator no estilo Readability sobre o HTMLParser da biblioteca padrão.
+
+    Monta uma árvore enxuta só com os elementos de bloco, pontua os pais dos
+    parágrafos (vírgulas, tamanho, class/id e densidade de links) e fica com o
+    melhor candidato e os irmãos que também pontuaram bem.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = _Node("root", None, [])
+        self.stack = [self.root]
+        self.blocks = []
+        self.meta = {}
+        self.canonical = ""
+        self.document_title = ""
+        self.first_h1 = ""
+        self.first_time = ""
+        self.visible_chars = 0
+        self.script_chars = 0
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._text = []
+        self._link_text = 0
+        self._in_title = False
+        self._in_h1 = False
+        self._in_script = False
+
+    # Árvore e blocos de texto
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            self._meta(dict(attrs))
+        elif tag == "link":
+            attributes = dict(attrs)
+            if "canonical" in (attributes.get("rel") or "").lower():
+                self.canonical = attributes.get("href") or ""
+        elif tag == "time" and not self.first_time:
+            self.first_time = dict(attrs).get("datetime") or ""
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "h1" and not self.first_h1:
+            self._in_h1 = True
+
+        if tag in ("script", "style"):
+            self._in_script = True
+        if tag in _VOID_TAGS:
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if self._skip_depth:
+            return
+        if tag == "a":
+            self._link_depth += 1
+        if tag in _BLOCK_TAGS:
+            self._flush()
+            # <p> não aninha: um <p> novo fecha o anterior
+            if tag == "p" and self.stack[-1].tag == "p":
+                self.stack.pop()
+            node = _Node(tag, self.stack[-1], attrs)
+            self.stack[-1].children.append(node)
+            self.stack.append(node)
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style"):
+            self._in_script = False
+        if tag == "title":
+            self._in_title = False
+        if tag == "h1":
+            self._in_h1 = False
+        if tag in _VOID_TAGS:
+            return
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+            return
+        if self._skip_depth:
+            return
+        if tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
+        if tag in _BLOCK_TAGS and any(node.tag == tag for node in self.stack[1:]):
+            self._flush()
+            # HTML mal formado: fecha tudo até a tag correspondente
+            while self.stack[-1].tag != tag:
+                self.stack.pop()
+            self.stack.pop()
+
+    def handle_data(self, data):
+        if self._in_script:
+            self.script_chars += len(data)
+            return
+        if self._in_title:
+            self.document_title += data
+        if self._in_h1:
+            self.first_h1 += data
+        if self._skip_depth or not data.strip():
+            return
+        self.visible_chars += len(data.strip())
+        self._text.append(data)
+        if self._link_depth:
+            self._link_text += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush()
+
+    def _flush(self):
+        if not self._text:
+            return
+        text = " ".join(" ".join(self._text).split())
+        link_chars = self._link_text
+        self._text = []
+        self._link_text = 0
+        owner = self.stack[-1]
+        self.blocks.append((owner, text, link_chars))
+
+        node = owner
+        while node is not None:
+            node.text_chars += len(text)
+            node.link_chars += link_chars
+            node = node.parent
+
+        if owner.tag not in _SCORED_TAGS or len(text) < _MIN_BLOCK_CHARS:
+            return
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        for ancestor, share in ((owner.parent, 1), (owner.parent and owner.parent.parent, 0.5)):
+            if ancestor is None or ancestor is self.root:
+                break
+            ancestor.score = (ancestor.score or 0) + score * share
+
+    def _meta(self, attributes):
+        key = (
+            attributes.get("property") or attributes.get("name") or attributes.get("itemprop") or ""
+        ).lower()
+        content = attributes.get("content")
+        if key and content and key not in self.meta:
+            self.meta[key] = content.strip()
+
+    # Seleção do conteúdo
+
+    def candidates(self):
+        found = []
+        pending = [self.root]
+        while pending:
+            node = pending.pop()
+            if node.score is not None:
+                found.append(node)
+            pending.extend(node.children)
+        return found
+
+    def article_nodes(self):
+        candidates = self.candidates()
+        if not candidates:
+            return set()
+        top = max(candidates, key=_Node.final_score)
+        selected = {top}
+        # Irmãos do melhor candidato que também parecem conteúdo
+        threshold = max(10, top.final_score() * 0.2)
+        if top.parent is not None and top.parent is not self.root:
+            for sibling in top.parent.children:
+                if sibling is not top and sibling.score is not None and sibling.final_score() >= threshold:
+                    selected.add(sibling)
+        return selected
+
+    def article(self, url=""):
+        selected = self.article_nodes()
+        paragraphs = []
+        link_chars = text_chars = 0
+        for owner, text, links in self.blocks:
+            # O título já vai no campo próprio
+            if owner.tag == "h1" or not _inside(owner, selected):
+                continue
+            heading = owner.tag in _HEADING_TAGS
+            if not heading and len(text) < _MIN_BLOCK_CHARS:
+                continue
+            if links > len(text) * 0.5:
+                continue
+            paragraphs.append(text)
+            text_chars += len(text)
+            link_chars += links
+
+        published_at = next(
+            (self.meta[key] for key in _PUBLISHED_KEYS if self.meta.get(key)), self.first_time
+        )
+        title = next((self.meta[key] for key in _TITLE_KEYS if self.meta.get(key)), "")
+        return ExtractedArticle(
+            title=title or " ".join(self.first_h1.split()) or " ".join(self.document_title.split()),
+            description=next(
+                (self.meta[key] for key in _DESCRIPTION_KEYS if self.meta.get(key)), ""
+            ),
+            content=clean_content("\n\n".join(paragraphs)),
+            url=self.meta.get("og:url") or self.canonical or url,
+            published_at=published_at,
+            paragraphs=sum(1 for text in paragraphs if len(text) >= _MIN_BLOCK_CHARS),
+            link_density=round(link_chars / text_chars, 3) if text_chars else 0.0,
+            visible_chars=self.visible_chars,
+            script_chars=self.script_chars,
+        )
+
+
+def _inside(node, selected):
+    while node is not None:
+        if node in selected:
+            return True
+        node = node.parent
+    return False
+
+
+def extract_article(html, url=""):
+    parser = ArticleParser()
+    parser.feed(html)
+    parser.close()
+    return parser.article(url)
+
+
+def quality_problem(article):
+    """Motivo para descartar a extração local, ou None se ela for boa o bastante."""
+    min_chars = settings.LOCAL_EXTRACTOR_MIN_CHARS
+    # Casca de SPA: quase nenhum texto visível e muito JavaScript
+    if article.visible_chars < min_chars and article.script_chars > 5 * max(article.visible_chars, 1):
+        return "js_rendered"
+    if len(article.content) < min_chars:
+        return "too_short"
+    if article.paragraphs < settings.LOCAL_EXTRACTOR_MIN_PARAGRAPHS:
+        return "few_paragraphs"
+    if article.link_density > 0.3:
+        return "link_heavy"
+    return None
+
+
+@lru_cache(maxsize=None)
+def _session():
+    # Conexões reaproveitadas entre análises (keep-alive por host)
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.LOCAL_EXTRACTOR_POOL_SIZE,
+        pool_maxsize=settings.LOCAL_EXTRACTOR_POOL_SIZE,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "User-Agent": settings.LOCAL_EXTRACTOR_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.5",
+        }
+    )
+    return session
+
+
+def _timeout(deadline):
+    connect = settings.PROVIDER_CONNECT_TIMEOUT
+    read = settings.LOCAL_EXTRACTOR_TIMEOUT
+    if deadline is None:
+        return (connect, read)
+    remaining = deadline.check()
+    return (min(connect, remaining), min(read, remaining))
+
+
+def _decode(raw, response):
+    encoding = None
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        encoding = response.encoding
+    if not encoding:
+        match = _META_CHARSET.search(raw[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return raw.decode(encoding, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def _conditional_headers(validators):
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+_REDIRECT_CODES = {301, 302, 303, 307, 308}
+
+
+def _get_public(url, deadline, headers):
+    """GET que segue redirects manualmente, conferindo o host de cada salto.
+
+    A URL vem do usuário: sem a checagem, o worker baixaria páginas da rede
+    interna (metadados da nuvem, painéis em localhost) e devolveria o texto no
+    relatório. Hosts não públicos caem para o Firecrawl.
+    """
+    for _ in range(settings.LOCAL_EXTRACTOR_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not is_public_host(parts.hostname):
+            raise LowQualityExtraction("private_address", url)
+        try:
+            response = _session().get(
+                url,
+                timeout=_timeout(deadline),
+                stream=True,
+                headers=headers,
+                allow_redirects=False,
+            )
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise ProviderTransientError(f"Erro ao baixar {url}: {e}")
+
+        location = response.headers.get("Location")
+        if response.status_code not in _REDIRECT_CODES or not location:
+            return url, response
+        response.close()
+        url = urljoin(url, location)
+    raise LowQualityExtraction("too_many_redirects", url)
+
+
+def _shutdown(sock):
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+@contextmanager
+def _read_deadline(response, deadline):
+    """Derruba a conexão quando o prazo acaba, mesmo no meio de uma leitura.
+
+    O timeout de leitura do requests vale por recv e recomeça a cada byte: um
+    servidor que manda o corpo aos poucos seguraria o download indefinidamente.
+    O shutdown do socket acorda o recv bloqueado, que termina em erro ou EOF.
+    """
+    connection = getattr(getattr(response, "raw", None), "connection", None)
+    sock = getattr(connection, "sock", None)
+    if deadline is None or sock is None:
+        yield
+        return
+    timer = threading.Timer(deadline.remaining(), _shutdown, (sock,))
+    timer.daemon = True
+    timer.start()
+    try:
+        yield
+    finally:
+        timer.cancel()
+
+
+def _read_body(response, deadline, max_bytes):
+    chunks = []
+    size = 0
+    try:
+        with _read_deadline(response, deadline):
+            for chunk in response.iter_content(16 * 1024):
+                if deadline is not None:
+                    deadline.check()
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= max_bytes:
+                    break
+    except requests.RequestException as e:
+        # Corpo truncado, conexão caída no meio ou derrubada pelo prazo
+        if deadline is not None:
+            deadline.check()
+        raise ProviderTransientError(f"Erro ao ler {response.url}: {e}")
+    # Conexão derrubada pelo prazo pode terminar como EOF, sem erro
+    if deadline is not None:
+        deadline.check()
+    return b"".join(chunks)[:max_bytes]
+
+
+def fetch_html(url, deadline=None, validators=None):
+    """Baixa o HTML; com validadores da extração anterior, a requisição é condicional.
+
+    Devolve (html, url_final, validadores da resposta) ou levanta NotModified.
+    """
+    final_url, response = _get_public(url, deadline, _conditional_headers(validators or {}))
+
+    with response:
+        if response.status_code == 304:
+            raise NotModified(url)
+        if response.status_code >= 400:
+            raise LowQualityExtraction(f"http_{response.status_code}")
+        content_type = response.headers.get("Content-Type", "").lower()
+        if "html" not in content_type:
+            raise LowQualityExtraction("not_html", content_type)
+
+        # Páginas gigantes: lê só até o limite
+        raw = _read_body(response, deadline, settings.LOCAL_EXTRACTOR_MAX_BYTES)
+        response_validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", ""),
+        }
+        return _decode(raw, response), final_url, response_validators
+
+
+def extract_content_local(url, deadline=None, validators=None):
+    html, final_url, response_validators = fetch_html(url, deadline, validators)
+    article = extract_article(html, final_url)
+    problem = quality_problem(article)
+    if problem:
+        raise LowQualityExtraction(problem)
+    return {**article.as_data(), "validators": response_validators}
@@ -42,7 +42,10 @@ def test_extract_content_firecrawl_success(mock_config, mock_firecrawl_app):
     assert result["url"] == "http://example.com"
     assert result["content"] == "Raw markdown with extra chars"
     mock_firecrawl_instance.scrape.assert_called_once_with(
-        "http://example.com", formats=["markdown"], only_main_content=True
+        "http://example.com",
+        formats=["markdown"],
+        only_main_content=True,
+        timeout=60000,
     )
 
 
@@ -114,4 +117,21 @@ def test_extract_content_firecrawl_scrape_raises_exception(
     # Act & Assert
     with pytest.raises(APIException) as excinfo:
         extract_content_firecrawl("http://example.com")
-    assert "Erro ao acessar Firecrawl: External service failed" in str(excinfo.value)
\ No newline at end of file
+    assert "Erro ao acessar Firecrawl: External service failed" in str(excinfo.value)
+
+@patch("analysis.services.credibility._firecrawl.FirecrawlApp")
+@patch("analysis.services.credibility._firecrawl.config")
+def test_extract_content_firecrawl_trunca_documento_grande(
+    mock_config, mock_firecrawl_app, settings
+):
+    """Testa que o markdown acima do limite é cortado antes da limpeza."""
+    settings.FIRECRAWL_MAX_DOCUMENT_CHARS = 50
+    mock_config.return_value = "fake_api_key"
+    mock_scrape_result = Mock()
+    mock_scrape_result.markdown = "a" * 40 + " " + "b" * 1000
+    mock_scrape_result.metadata = Mock(title="T", description="D", url="http://example.com")
+    mock_firecrawl_app.return_value.scrape.return_value = mock_scrape_result
+
+    result = extract_content_firecrawl("http://example.com")
+
+    assert result["content"] == "a" * 40 + " " + "b" * 9
@@ -0,0 +1,316 @@
+"""Testes para o extrator local de artigos e o fallback para o Firecrawl."""
+
+import socket
+import threading
+import time
+
+import pytest
+
+from analysis.services.credibility import extraction, local_extractor
+from analysis.services.credibility.local_extractor import (
+    LowQualityExtraction,
+    extract_article,
+    quality_problem,
+)
+from analysis.services.exceptions import DeadlineExceeded, ProviderTransientError
+from analysis.util import url as url_util
+from analysis.util.clean import clean_content
+from analysis.util.deadline import Deadline
+from benchmarks.extraction_bench import content_agreement, load_corpus
+
+CORPUS = load_corpus()
+
+
+@pytest.mark.parametrize("entry", CORPUS, ids=[entry["file"] for entry in CORPUS])
+def test_corpus_de_html_salvos(entry):
+    """Testa o extrator contra páginas salvas: conteúdo, metadados e heurísticas."""
+    article = extract_article(entry["html"], entry["url"])
+
+    assert quality_problem(article) == entry["problem"]
+    if entry["problem"]:
+        return
+    assert article.title == entry["title"]
+    assert article.published_at == entry["published_at"]
+    assert article.url == entry["url"]
+    for expected in entry["contains"]:
+        assert expected in article.content
+    for boilerplate in entry["excludes"]:
+        assert boilerplate not in article.content
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [entry for entry in CORPUS if entry["firecrawl_markdown"]],
+    ids=lambda entry: entry["file"],
+)
+def test_concorda_com_o_firecrawl(entry):
+    """Testa que o texto local bate com o markdown salvo do Firecrawl."""
+    article = extract_article(entry["html"], entry["url"])
+
+    agreement = content_agreement(article.content, clean_content(entry["firecrawl_markdown"]))
+
+    assert agreement["precision"] >= 0.95
+    assert agreement["f1"] >= 0.9
+
+
+class FakeResponse:
+    def __init__(
+        self, body, status_code=200, content_type="text/html", url="https://x.com/a", location=None
+    ):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        if location:
+            self.headers["Location"] = location
+        self.encoding = "ISO-8859-1"
+        self.url = url
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def close(self):
+        pass
+
+    def iter_content(self, size):
+        for start in range(0, len(self.body), size):
+            yield self.body[start : start + size]
+
+
+@pytest.fixture
+def session(mocker):
+    session = mocker.Mock()
+    mocker.patch.object(local_extractor, "_session", return_value=session)
+    mocker.patch.object(
+        local_extractor, "is_public_host", side_effect=lambda host: host.endswith(".com")
+    )
+    return session
+
+
+def test_download_respeita_o_charset_da_meta_tag(session):
+    """Testa que, sem charset no header, vale o <meta charset> da página."""
+    html = '<html><head><meta charset="iso-8859-1"></head><body><p>Café</p></body></html>'
+    session.get.return_value = FakeResponse(html.encode("iso-8859-1"))
+
+    text, final_url, _ = local_extractor.fetch_html("https://x.com/a")
+
+    assert "Café" in text
+    assert final_url == "https://x.com/a"
+    _, kwargs = session.get.call_args
+    assert kwargs["timeout"] == (5, 8)
+
+
+def test_download_corta_paginas_gigantes(session, settings):
+    """Testa que o corpo é lido só até LOCAL_EXTRACTOR_MAX_BYTES."""
+    settings.LOCAL_EXTRACTOR_MAX_BYTES = 10
+    session.get.return_value = FakeResponse(b"<p>" + b"a" * 100_000 + b"</p>")
+
+    text, _, _ = local_extractor.fetch_html("https://x.com/a")
+
+    assert len(text) == 10
+
+
+@pytest.mark.parametrize(
+    "response, reason",
+    [
+        (FakeResponse(b"", status_code=403), "http_403"),
+        (FakeResponse(b"%PDF", content_type="application/pdf"), "not_html"),
+    ],
+)
+def test_download_recusado_vira_baixa_qualidade(session, response, reason):
+    """Testa que bloqueios e arquivos que não são HTML caem no fallback."""
+    session.get.return_value = response
+
+    with pytest.raises(LowQualityExtraction) as error:
+        local_extractor.fetch_html("https://x.com/a")
+
+    assert error.value.reason == reason
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://169.254.169.254/latest/meta-data/",
+        "http://127.0.0.1:8000/admin/",
+        "ftp://x.com/a",
+    ],
+)
+def test_download_recusa_hosts_internos(session, url):
+    """Testa que endereços fora da internet pública nem chegam a ser baixados."""
+    with pytest.raises(LowQualityExtraction) as error:
+        local_extractor.fetch_html(url)
+
+    assert error.value.reason == "private_address"
+    session.get.assert_not_called()
+
+
+def test_redirect_para_a_rede_interna_e_barrado(session):
+    """Testa que cada salto de redirect passa pela mesma checagem do host."""
+    session.get.return_value = FakeResponse(
+        b"", status_code=302, location="http://10.0.0.5/painel"
+    )
+
+    with pytest.raises(LowQualityExtraction) as error:
+        local_extractor.fetch_html("https://x.com/a")
+
+    assert error.value.reason == "private_address"
+    assert session.get.call_count == 1
+    assert session.get.call_args.kwargs["allow_redirects"] is False
+
+
+def test_redirect_publico_e_seguido(session):
+    """Testa que redirects entre hosts públicos são seguidos até a página final."""
+    session.get.side_effect = [
+        FakeResponse(b"", status_code=301, location="/nova"),
+        FakeResponse(b"<p>ok</p>", url="https://x.com/nova"),
+    ]
+
+    text, final_url, _ = local_extractor.fetch_html("https://x.com/a")
+
+    assert "ok" in text
+    assert final_url == "https://x.com/nova"
+
+
+def test_download_lento_respeita_o_prazo(session, mocker):
+    """Testa que o prazo é conferido a cada chunk, não só no timeout de leitura."""
+    session.get.return_value = FakeResponse(b"<p>" + b"a" * 200_000 + b"</p>")
+    deadline = mocker.Mock()
+    deadline.check.side_effect = [5.0, 5.0, DeadlineExceeded("prazo")]
+
+    with pytest.raises(DeadlineExceeded):
+        local_extractor.fetch_html("https://x.com/a", deadline=deadline)
+
+
+@pytest.fixture
+def servidor(mocker):
+    """Servidor HTTP local que responde com os bytes de `respond(conexao)`."""
+    mocker.patch.object(local_extractor, "is_public_host", return_value=True)
+    listener = socket.create_server(("127.0.0.1", 0))
+    handlers = []
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            conn.recv(65536)
+            try:
+                handlers[0](conn)
+            except OSError:
+                pass
+
+    def start(respond):
+        handlers.append(respond)
+        threading.Thread(target=serve, daemon=True).start()
+        return f"http://127.0.0.1:{listener.getsockname()[1]}/"
+
+    yield start
+    listener.close()
+
+
+def test_servidor_que_goteja_o_corpo_nao_passa_do_prazo(servidor):
+    """Testa que o prazo limita o tempo total da leitura, não só cada recv."""
+
+    def goteja(conn):
+        conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: 100\r\n\r\n")
+        for _ in range(100):
+            conn.sendall(b"a")
+            time.sleep(0.1)
+
+    url = servidor(goteja)
+    start = time.monotonic()
+
+    with pytest.raises(DeadlineExceeded):
+        local_extractor.fetch_html(url, deadline=Deadline(1))
+
+    assert time.monotonic() - start < 1.5
+
+
+def test_corpo_truncado_vira_falha_temporaria(servidor):
+    """Testa que um erro no meio do corpo cai para o Firecrawl, não derruba a análise."""
+
+    def trunca(conn):
+        conn.sendall(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n400\r\n<p>incompleto"
+        )
+
+    url = servidor(trunca)
+
+    with pytest.raises(ProviderTransientError):
+        local_extractor.fetch_html(url, deadline=Deadline(5))
+
+
+@pytest.mark.parametrize(
+    "addresses, public",
+    [
+        (["93.184.216.34"], True),
+        (["127.0.0.1"], False),
+        (["93.184.216.34", "10.0.0.5"], False),
+        (["::ffff:169.254.169.254"], False),
+        ([], False),
+    ],
+)
+def test_is_public_host_confere_todos_os_enderecos(mocker, addresses, public):
+    """Testa que nomes como 127.0.0.1.nip.io são julgados pelo IP resolvido."""
+    mocker.patch.object(
+        url_util.socket,
+        "getaddrinfo",
+        return_value=[(socket.AF_INET, 1, 6, "", (address, 0)) for address in addresses],
+    )
+
+    assert url_util.is_public_host("127.0.0.1.nip.io") is public
+
+
+def test_is_public_host_sem_dns(mocker):
+    """Testa que um nome que não resolve não é considerado público."""
+    mocker.patch.object(url_util.socket, "getaddrinfo", side_effect=socket.gaierror)
+
+    assert url_util.is_public_host("nao-existe.example") is False
+
+
+@pytest.fixture
+def engines(mocker):
+    local = mocker.patch.object(
+        extraction, "extract_content_local", return_value={"title": "Local", "content": "texto"}
+    )
+    firecrawl = mocker.patch.object(
+        extraction,
+        "extract_content_firecrawl",
+        return_value={"title": "Firecrawl", "content": "texto"},
+    )
+    return local, firecrawl
+
+
+def test_extracao_local_boa_dispensa_o_firecrawl(engines):
+    """Testa que a página extraída localmente não chama a API."""
+    local, firecrawl = engines
+
+    data = extraction.extract_content("https://x.com/a")
+
+    assert data["extractor"] == "local"
+    assert data["title"] == "Local"
+    firecrawl.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "failure", [LowQualityExtraction("js_rendered"), ProviderTransientError("timeout")]
+)
+def test_extracao_local_ruim_cai_para_o_firecrawl(engines, failure):
+    """Testa o fallback em páginas só com JavaScript ou download com falha."""
+    local, firecrawl = engines
+    local.side_effect = failure
+
+    data = extraction.extract_content("https://x.com/a")
+
+    assert data["extractor"] == "firecrawl"
+    firecrawl.assert_called_once_with("https://x.com/a", deadline=None)
+
+
+def test_extrator_local_desligado(engines, settings):
+    """Testa que LOCAL_EXTRACTOR_ENABLED=False vai direto ao Firecrawl."""
+    settings.LOCAL_EXTRACTOR_ENABLED = False
+    local, firecrawl = engines
+
+    assert extraction.extract_content("https://x.com/a")["extractor"] == "firecrawl"
+    local.assert_not_called()
@@ -0,0 +1,29 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ProviderTransientError(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Serviço externo temporariamente indisponível."
+    default_code = "provider_unavailable"
+
+
+class ProviderRateLimited(ProviderTransientError):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    default_detail = "Limite de requisições do serviço externo atingido."
+    default_code = "provider_rate_limited"
+
+
+class DeadlineExceeded(ProviderTransientError):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    default_detail = "Prazo da análise esgotado."
+    default_code = "deadline_exceeded"
+
+
+def provider_error_for_status(status_code, message):
+    # 429 e falhas temporárias (timeout, 5xx) podem ser repetidas mais tarde
+    if status_code == 429:
+        return ProviderRateLimited(message)
+    if isinstance(status_code, int) and (status_code == 408 or status_code >= 500):
+        return ProviderTransientError(message)
+    return APIException(message)
@@ -0,0 +1,13 @@
+from .classifier import (
+    PRESCREEN_SOURCE,
+    LabeledSample,
+    PrescreenDecision,
+    PrescreenModel,
+    evaluate,
+    get_prescreen_model,
+    label_from_recommendation,
+    prescreen_content,
+    prescreen_llm_result,
+    train_model,
+)
+from .dataset import iter_cached_samples, read_dataset, sample_from_entry, write_dataset
@@ -0,0 +1,313 @@
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT = 1
+N_FEATURES = 2**18
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# Termos típicos de desinformação e correntes de mensagens
+SENSATIONAL_TERMS = frozenset(
+    {
+        "urgente",
+        "chocante",
+        "bombástico",
+        "bomba",
+        "inacreditável",
+        "milagre",
+        "milagrosa",
+        "cura",
+        "segredo",
+        "escondem",
+        "esconde",
+        "censurado",
+        "censura",
+        "revelado",
+        "exposto",
+        "farsa",
+        "golpe",
+        "alerta",
+        "atenção",
+        "absurdo",
+        "vergonha",
+        "ninguém",
+        "verdade",
+    }
+)
+SHARE_TERMS = ("compartilhe", "divulgue", "repasse", "espalhe", "envie para")
+
+# Rótulo do treino: 1 quando a LLM não recomendou confiar no conteúdo
+TRUST_RECOMMENDATION = "CONFIE"
+PRESCREEN_SOURCE = "prescreen"
+
+
+def tokenize(text):
+    return [word for word in _WORD_RE.findall(text.lower()) if len(word) > 1]
+
+
+def _bucket(term):
+    return zlib.crc32(term.encode()) % N_FEATURES
+
+
+def term_counts(tokens):
+    """Unigramas e bigramas, com o hashing trick (sem vocabulário em memória)."""
+    counts = Counter(_bucket(token) for token in tokens)
+    counts.update(_bucket(f"{a} {b}") for a, b in zip(tokens, tokens[1:]))
+    return counts
+
+
+def style_features(text, tokens, trusted_domain=False):
+    """Sinais de sensacionalismo, já escalados para ~[0, 1]."""
+    words = max(len(tokens), 1)
+    raw_words = text.split()
+    upper = sum(1 for word in raw_words if len(word) >= 3 and word.isupper())
+    lowered = text.lower()
+    return {
+        "exclamations": min(1.0, text.count("!") * 20 / words),
+        "questions": min(1.0, text.count("?") * 20 / words),
+        "uppercase_words": min(1.0, upper * 10 / max(len(raw_words), 1)),
+        "sensational_terms": min(1.0, sum(token in SENSATIONAL_TERMS for token in tokens) / 5),
+        "call_to_share": 1.0 if any(term in lowered for term in SHARE_TERMS) else 0.0,
+        "short_text": 1.0 if words < 150 else 0.0,
+        "trusted_domain": 1.0 if trusted_domain else 0.0,
+    }
+
+
+def label_from_recommendation(recommendation):
+    if not recommendation or recommendation == "N/A":
+        return None
+    return 0 if TRUST_RECOMMENDATION in recommendation.upper() else 1
+
+
+@dataclass
+class LabeledSample:
+    content: str
+    risky: int
+    trusted_domain: bool = False
+
+
+class PrescreenModel:
+    """Regressão logística esparsa sobre TF-IDF (hashing) e sinais de estilo.
+
+    A predição percorre só os termos presentes no texto: o custo é
+    proporcional ao tamanho do artigo, não ao vocabulário.
+    """
+
+    def __init__(self, idf, weights, style_weights, bias=0.0, metadata=None):
+        self.idf = idf
+        self.weights = weights
+        self.style_weights = style_weights
+        self.bias = bias
+        self.metadata = metadata or {}
+
+    def vectorize(self, content, trusted_domain=False):
+        tokens = tokenize(content or "")
+        vector = {
+            index: (1 + math.log(count)) * self.idf[index]
+            for index, count in term_counts(tokens).items()
+            if index in self.idf
+        }
+        norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+        for index in vector:
+            vector[index] /= norm
+        return vector, style_features(content or "", tokens, trusted_domain)
+
+    def _logit(self, vector, style):
+        weights = self.weights
+        total = self.bias + sum(value * weights.get(index, 0.0) for index, value in vector.items())
+        return total + sum(value * self.style_weights.get(name, 0.0) for name, value in style.items())
+
+    def risk_score(self, content, trusted_domain=False):
+        """Probabilidade estimada de a LLM não recomendar confiar no conteúdo."""
+        return _sigmoid(self._logit(*self.vectorize(content, trusted_domain)))
+
+    def to_dict(self):
+        return {
+            "format": MODEL_FORMAT,
+            "n_features": N_FEATURES,
+            "bias": self.bias,
+            "idf": {str(index): round(value, 6) for index, value in self.idf.items()},
+            "weights": {
+                str(index): round(value, 6) for index, value in self.weights.items() if value
+            },
+            "style_weights": self.style_weights,
+            "metadata": self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("format") != MODEL_FORMAT or data.get("n_features") != N_FEATURES:
+            raise ValueError("formato de modelo desconhecido")
+        return cls(
+            idf={int(index): value for index, value in data["idf"].items()},
+            weights={int(index): value for index, value in data["weights"].items()},
+            style_weights=data["style_weights"],
+            bias=data["bias"],
+            metadata=data.get("metadata"),
+        )
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _sigmoid(x):
+    if x < -30:
+        return 0.0
+    if x > 30:
+        return 1.0
+    return 1 / (1 + math.exp(-x))
+
+
+def train_model(samples, epochs=15, learning_rate=0.5, l2=1e-5, seed=0):
+    """Treina por SGD; samples é uma lista de LabeledSample."""
+    samples = list(samples)
+    if not samples:
+        raise ValueError("nenhuma amostra para treinar")
+
+    documents = [term_counts(tokenize(sample.content or "")) for sample in samples]
+    frequency = Counter(index for counts in documents for index in counts)
+    total = len(samples)
+    idf = {
+        index: math.log((1 + total) / (1 + df)) + 1 for index, df in frequency.items()
+    }
+
+    model = PrescreenModel(idf, {}, {})
+    vectors = [model.vectorize(sample.content, sample.trusted_domain) for sample in samples]
+    labels = [sample.risky for sample in samples]
+
+    weights = model.weights
+    style_weights = dict.fromkeys(vectors[0][1], 0.0)
+    model.style_weights = style_weights
+    rng = random.Random(seed)
+    order = list(range(total))
+
+    for epoch in range(epochs):
+        rng.shuffle(order)
+        rate = learning_rate / (1 + epoch)
+        for i in order:
+            vector, style = vectors[i]
+            gradient = _sigmoid(model._logit(vector, style)) - labels[i]
+            for index, value in vector.items():
+                weight = weights.get(index, 0.0)
+                weights[index] = weight - rate * (gradient * value + l2 * weight)
+            for name, value in style.items():
+                style_weights[name] -= rate * (gradient * value + l2 * style_weights[name])
+            model.bias -= rate * gradient
+
+    model.metadata = {
+        "samples": total,
+        "risky_ratio": round(sum(labels) / total, 3),
+        "trained_at": time.time(),
+    }
+    return model
+
+
+def evaluate(model, samples, threshold):
+    """Acurácia e efeito do corte de triagem sobre as amostras (fora do treino)."""
+    samples = list(samples)
+    scores = [model.risk_score(sample.content, sample.trusted_domain) for sample in samples]
+    correct = sum((score >= 0.5) == bool(sample.risky) for score, sample in zip(scores, samples))
+    skipped = [sample for score, sample in zip(scores, samples) if score <= threshold]
+    return {
+        "samples": len(samples),
+        "accuracy": round(correct / len(samples), 3) if samples else None,
+        "skip_rate": round(len(skipped) / len(samples), 3) if samples else None,
+        # Pulados em que a LLM teria recomendado cautela ou evitar o conteúdo
+        "false_skips": sum(sample.risky for sample in skipped),
+    }
+
+
+class _ModelFile:
+    """Modelo carregado do disco e recarregado quando o arquivo muda."""
+
+    def __init__(self, path):
+        self.path = path
+        self._model = None
+        self._identity = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if identity != self._identity:
+            with self._lock:
+                try:
+                    self._model = PrescreenModel.load(self.path)
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Modelo de triagem inválido em {self.path}: {e}")
+                    self._model = None
+                self._identity = identity
+        return self._model
+
+
+@lru_cache(maxsize=1)
+def _model_file(path):
+    return _ModelFile(path)
+
+
+def get_prescreen_model():
+    return _model_file(settings.PRESCREEN_MODEL_PATH).get()
+
+
+@dataclass
+class PrescreenDecision:
+    score: float
+    skip_llm: bool
+
+    def as_report(self):
+        return {"risk_score": round(self.score, 4), "skipped_llm": self.skip_llm}
+
+
+def prescreen_content(content, trusted_domain=False):
+    """Decide se a LLM é necessária; None quando a triagem está desligada."""
+    if not settings.PRESCREEN_ENABLED:
+        return None
+    model = get_prescreen_model()
+    if model is None:
+        return None
+
+    score = model.risk_score(content, trusted_domain)
+    skip = score <= settings.PRESCREEN_TRUST_THRESHOLD and (
+        trusted_domain or not settings.PRESCREEN_TRUSTED_DOMAINS_ONLY
+    )
+    return PrescreenDecision(score, skip)
+
+
+def prescreen_llm_result(decision):
+    # Mesmo formato do analyze_with_llm, para o veredicto e o cache
+    return {
+        "llm_status": "BAIXO RISCO",
+        "llm_summary": "N/A",
+        "llm_risk_assessment": (
+            f"Triagem local: conteúdo de rotina (risco estimado {decision.score:.1%}); "
+            "análise da LLM dispensada."
+        ),
+        "llm_recommendation": "CONFIE NO CONTEÚDO",
+        "llm_source": PRESCREEN_SOURCE,
+    }
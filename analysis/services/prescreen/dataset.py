@@ -0,0 +1,79 @@
+import json
+
+from django.core.cache import cache
+
+from analysis.services.reputation import TRUSTED, get_domain_reputation
+from analysis.util.fastjson import decode_report
+
+from .classifier import PRESCREEN_SOURCE, LabeledSample, label_from_recommendation
+
+# Relatórios e extrações em cache trazem o conteúdo e o veredicto da LLM
+CACHE_PATTERNS = ("report:*", "extraction:*")
+
+
+def _content_and_llm(entry):
+    if "firecrawl_data" in entry:
+        return entry.get("firecrawl_data") or {}, entry.get("llm_analysis") or {}
+    return entry.get("data") or {}, entry.get("llm") or {}
+
+
+def sample_from_entry(entry, trusted=None):
+    """Amostra rotulada a partir de um relatório ou extração; None se não servir."""
+    if not isinstance(entry, dict):
+        return None
+    data, llm = _content_and_llm(entry)
+    # Vereditos da própria triagem realimentariam o modelo
+    if llm.get("llm_source") == PRESCREEN_SOURCE:
+        return None
+    risky = label_from_recommendation(llm.get("llm_recommendation"))
+    content = data.get("content")
+    if risky is None or not content:
+        return None
+    url = data.get("url") or ""
+    if trusted is None:
+        trusted = bool(url) and get_domain_reputation().lookup(url) == TRUSTED
+    return url, LabeledSample(content, risky, trusted)
+
+
+def iter_cached_samples():
+    """Vereditos guardados no Redis (uma amostra por URL)."""
+    seen = set()
+    for pattern in CACHE_PATTERNS:
+        for key in cache.iter_keys(pattern):
+            found = sample_from_entry(decode_report(cache.get(key)))
+            if found is None:
+                continue
+            url, sample = found
+            if url and url in seen:
+                continue
+            seen.add(url)
+            yield sample
+
+
+def read_dataset(path):
+    # JSON Lines: {"content": ..., "recommendation": ..., "trusted_domain": bool}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            risky = row.get("risky")
+            if risky is None:
+                risky = label_from_recommendation(row.get("recommendation"))
+            if risky is None or not row.get("content"):
+                continue
+            yield LabeledSample(row["content"], int(risky), bool(row.get("trusted_domain")))
+
+
+def write_dataset(samples, path):
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for sample in samples:
+            row = {
+                "content": sample.content,
+                "risky": sample.risky,
+                "trusted_domain": sample.trusted_domain,
+            }
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            count += 1
+    return count
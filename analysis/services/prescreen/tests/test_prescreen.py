@@ -0,0 +1,136 @@
+"""Testes para a triagem local que dispensa a LLM em casos óbvios."""
+
+import pytest
+
+from analysis import tasks
+from analysis.services.prescreen import (
+    LabeledSample,
+    PrescreenDecision,
+    PrescreenModel,
+    evaluate,
+    label_from_recommendation,
+    prescreen_content,
+    sample_from_entry,
+    train_model,
+)
+from benchmarks.prescreen_bench import ROUTINE, SENSATIONAL, synthetic_samples
+
+ROUTINE_TEXT = " ".join(ROUTINE * 3)
+SENSATIONAL_TEXT = " ".join(SENSATIONAL * 3)
+
+
+@pytest.fixture(scope="module")
+def model():
+    return train_model(synthetic_samples(300, seed=1, noise=0.0), epochs=8)
+
+
+@pytest.fixture
+def model_path(model, tmp_path, settings):
+    path = tmp_path / "prescreen_model.json"
+    model.save(path)
+    settings.PRESCREEN_ENABLED = True
+    settings.PRESCREEN_MODEL_PATH = str(path)
+    settings.PRESCREEN_TRUST_THRESHOLD = 0.05
+    settings.PRESCREEN_TRUSTED_DOMAINS_ONLY = True
+    return path
+
+
+def test_modelo_separa_rotina_de_sensacionalismo(model):
+    """Testa a acurácia fora do treino e a ordem dos scores."""
+    metrics = evaluate(model, synthetic_samples(200, seed=2, noise=0.0), threshold=0.05)
+
+    assert metrics["accuracy"] >= 0.9
+    assert model.risk_score(ROUTINE_TEXT, True) < 0.5 < model.risk_score(SENSATIONAL_TEXT)
+
+
+def test_modelo_salvo_mantem_os_scores(model, model_path):
+    """Testa o formato em disco do modelo."""
+    loaded = PrescreenModel.load(model_path)
+
+    assert loaded.risk_score(ROUTINE_TEXT) == pytest.approx(model.risk_score(ROUTINE_TEXT))
+
+
+def test_dispensa_llm_so_em_dominio_confiavel(model_path, settings):
+    """Testa o limite configurável e a exigência de domínio confiável."""
+    assert prescreen_content(ROUTINE_TEXT, trusted_domain=True).skip_llm
+    assert not prescreen_content(ROUTINE_TEXT, trusted_domain=False).skip_llm
+    assert not prescreen_content(SENSATIONAL_TEXT, trusted_domain=True).skip_llm
+
+    settings.PRESCREEN_TRUST_THRESHOLD = 0.0
+    assert not prescreen_content(ROUTINE_TEXT, trusted_domain=True).skip_llm
+
+
+def test_sem_modelo_ou_desligada_tudo_vai_para_a_llm(model_path, settings, tmp_path):
+    """Testa que a triagem é inerte sem modelo treinado."""
+    settings.PRESCREEN_ENABLED = False
+    assert prescreen_content(ROUTINE_TEXT, True) is None
+
+    settings.PRESCREEN_ENABLED = True
+    settings.PRESCREEN_MODEL_PATH = str(tmp_path / "inexistente.json")
+    assert prescreen_content(ROUTINE_TEXT, True) is None
+
+
+@pytest.mark.parametrize(
+    "recommendation, expected",
+    [
+        ("CONFIE NO CONTEÚDO", 0),
+        ("PROSSIGA COM CAUTELA", 1),
+        ("EVITE ESTE SITE E CONTEÚDO", 1),
+        ("N/A", None),
+        (None, None),
+    ],
+)
+def test_rotulo_a_partir_da_recomendacao(recommendation, expected):
+    assert label_from_recommendation(recommendation) == expected
+
+
+def test_amostras_de_relatorios_e_extracoes():
+    """Testa a coleta do cache, sem realimentar com vereditos da própria triagem."""
+    report = {
+        "firecrawl_data": {"content": "texto", "url": "https://a.example/1"},
+        "llm_analysis": {"llm_recommendation": "EVITE ESTE SITE E CONTEÚDO"},
+    }
+    extraction = {
+        "data": {"content": "texto", "url": "https://b.example/1"},
+        "llm": {"llm_recommendation": "CONFIE NO CONTEÚDO"},
+    }
+    prescreened = {
+        "data": {"content": "texto"},
+        "llm": {"llm_recommendation": "CONFIE NO CONTEÚDO", "llm_source": "prescreen"},
+    }
+
+    assert sample_from_entry(report, trusted=False) == (
+        "https://a.example/1",
+        LabeledSample("texto", 1, False),
+    )
+    assert sample_from_entry(extraction, trusted=True)[1].risky == 0
+    assert sample_from_entry(prescreened, trusted=True) is None
+
+
+def test_pipeline_dispensa_a_llm(mocker, settings):
+    """Testa que a decisão da triagem substitui a chamada ao Gemini."""
+    settings.ANALYSIS_DEADLINE_SECONDS = 5
+    settings.REPUTATION_TRUSTED_MODE = "skip"
+    mocker.patch.object(tasks, "cache")
+    mocker.patch.object(tasks, "popularity_score", return_value=0.0)
+    mocker.patch.object(tasks, "get_extraction", return_value=None)
+    mocker.patch.object(tasks, "store_extraction")
+    mocker.patch.object(tasks, "lookup_threat_feed", return_value=False)
+    reputation = mocker.patch.object(tasks, "get_domain_reputation").return_value
+    reputation.lookup.return_value = tasks.TRUSTED
+    mocker.patch.object(
+        tasks, "extract_content", return_value={"title": "Título", "content": ROUTINE_TEXT}
+    )
+    mocker.patch.object(tasks, "search_fact_check", return_value={})
+    llm = mocker.patch.object(tasks, "analyze_with_llm")
+    prescreen = mocker.patch.object(
+        tasks, "prescreen_content", return_value=PrescreenDecision(0.01, True)
+    )
+
+    report = tasks._run_full_analysis("https://g1.example/noticia", "chave")
+
+    llm.assert_not_called()
+    prescreen.assert_called_once_with(ROUTINE_TEXT, trusted_domain=True)
+    assert report["final_verdict_source"] == "TRIAGEM LOCAL (Classificador)"
+    assert report["final_veredict"] == "CONFIE NO CONTEÚDO"
+    assert report["prescreen"] == {"risk_score": 0.01, "skipped_llm": True}
@@ -0,0 +1,7 @@
+from .domain_reputation import (
+    MALICIOUS,
+    TRUSTED,
+    domain_verdict_report,
+    get_domain_reputation,
+    registrable_domain,
+)
@@ -0,0 +1,215 @@
+import bisect
+import ipaddress
+import logging
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from publicsuffixlist import PublicSuffixList
+
+logger = logging.getLogger(__name__)
+
+TRUSTED = "trusted"
+MALICIOUS = "malicious"
+
+STATS_KEY = "reputation:domain:{domain}"
+TRUSTED_SET_KEY = "reputation:trusted"
+MALICIOUS_SET_KEY = "reputation:malicious"
+
+# Plataformas em que cada subdomínio é de um autor diferente e que não estão na
+# seção privada da Public Suffix List
+_SHARED_HOSTING_SUFFIXES = frozenset({"wordpress.com", "substack.com"})
+
+
+@lru_cache(maxsize=1)
+def _public_suffix_list():
+    # Inclui os sufixos privados (blogspot.com, github.io, vercel.app...): cada
+    # cliente dessas plataformas é um domínio separado, com reputação própria
+    return PublicSuffixList(only_icann=False)
+
+
+def normalize_host(url_or_host):
+    host = url_or_host.strip().lower()
+    if "/" in host:
+        host = urlparse(host).hostname or ""
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+def registrable_domain(url_or_host):
+    host = normalize_host(url_or_host)
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+        return host
+    except ValueError:
+        pass
+
+    domain = _public_suffix_list().privatesuffix(host)
+    if domain is None:
+        # O próprio host é um sufixo público (ou um nome local, como localhost)
+        return host
+    if domain in _SHARED_HOSTING_SUFFIXES and host != domain:
+        return ".".join(host.split(".")[-(domain.count(".") + 2):])
+    return domain
+
+
+class SortedDomainSet:
+    """Conjunto imutável de domínios guardado como array ordenado (busca binária)."""
+
+    __slots__ = ("_domains",)
+
+    def __init__(self, domains=(), normalize=registrable_domain):
+        self._domains = tuple(sorted({normalize(d) for d in domains if d and d.strip()}))
+
+    def __contains__(self, domain):
+        index = bisect.bisect_left(self._domains, domain)
+        return index < len(self._domains) and self._domains[index] == domain
+
+    def __len__(self):
+        return len(self._domains)
+
+
+class DomainReputation:
+    def __init__(
+        self,
+        allowlist=(),
+        denylist=(),
+        min_reports=20,
+        malicious_ratio=0.5,
+        stats_ttl=None,
+        refresh_seconds=60,
+    ):
+        # Confiança só no host exato: "g1.globo.com" não vale para outros subdomínios
+        self.allowlist = SortedDomainSet(allowlist, normalize=normalize_host)
+        self.denylist = SortedDomainSet(denylist)
+        self.min_reports = min_reports
+        self.malicious_ratio = malicious_ratio
+        self.stats_ttl = stats_ttl
+        self.refresh_seconds = refresh_seconds
+
+        self._learned_trusted = SortedDomainSet()
+        self._learned_malicious = SortedDomainSet()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def lookup(self, url):
+        domain = registrable_domain(url)
+        if not domain:
+            return None
+
+        # Listas curadas têm prioridade sobre a reputação aprendida
+        if domain in self.denylist:
+            return MALICIOUS
+        if normalize_host(url) in self.allowlist:
+            return TRUSTED
+
+        self._refresh_learned()
+        if domain in self._learned_malicious:
+            return MALICIOUS
+        if domain in self._learned_trusted:
+            return TRUSTED
+        return None
+
+    def record_vt_report(self, url, vt_report):
+        if not vt_report or vt_report.get("status") != "completed":
+            return None
+
+        domain = registrable_domain(url)
+        if not domain:
+            return None
+
+        flagged = (vt_report.get("malicious_count") or 0) + (
+            vt_report.get("suspicious_count") or 0
+        )
+        key = STATS_KEY.format(domain=domain)
+
+        try:
+            redis = get_redis_connection("default")
+            pipe = redis.pipeline()
+            pipe.hincrby(key, "reports", 1)
+            pipe.hincrby(key, "flagged", 1 if flagged else 0)
+            if self.stats_ttl:
+                pipe.expire(key, self.stats_ttl)
+            reports, flagged_reports = pipe.execute()[:2]
+
+            verdict = self._classify(int(reports), int(flagged_reports))
+            if flagged and verdict != MALICIOUS:
+                # Um único alerta já tira a confiança: o domínio volta a passar pelo VT
+                redis.srem(TRUSTED_SET_KEY, domain)
+                self._loaded_at = None
+            if verdict == MALICIOUS:
+                redis.srem(TRUSTED_SET_KEY, domain)
+                redis.sadd(MALICIOUS_SET_KEY, domain)
+            elif verdict == TRUSTED:
+                redis.srem(MALICIOUS_SET_KEY, domain)
+                redis.sadd(TRUSTED_SET_KEY, domain)
+            return verdict
+        except Exception as e:
+            logger.warning(f"Falha ao registrar reputação do domínio {domain}: {e}")
+            return None
+
+    def _classify(self, reports, flagged_reports):
+        if reports < self.min_reports:
+            return None
+        if flagged_reports / reports >= self.malicious_ratio:
+            return MALICIOUS
+        if flagged_reports == 0:
+            return TRUSTED
+        return None
+
+    def _refresh_learned(self):
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.refresh_seconds:
+            return
+
+        with self._lock:
+            if (
+                self._loaded_at is not None
+                and now - self._loaded_at < self.refresh_seconds
+            ):
+                return
+            # Mesmo em caso de falha só tentamos de novo no próximo intervalo
+            self._loaded_at = now
+            try:
+                redis = get_redis_connection("default")
+                pipe = redis.pipeline()
+                pipe.smembers(TRUSTED_SET_KEY)
+                pipe.smembers(MALICIOUS_SET_KEY)
+                trusted, malicious = pipe.execute()
+            except Exception as e:
+                logger.warning(f"Falha ao carregar reputação aprendida: {e}")
+                return
+
+            self._learned_trusted = SortedDomainSet(_decode(d) for d in trusted)
+            self._learned_malicious = SortedDomainSet(_decode(d) for d in malicious)
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def domain_verdict_report(verdict):
+    return {
+        "malicious_count": 0,
+        "suspicious_count": 0,
+        "total_scans": 0,
+        "status": "domain_blocked" if verdict == MALICIOUS else "skipped",
+        "domain_reputation": verdict,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_domain_reputation():
+    return DomainReputation(
+        allowlist=settings.REPUTATION_ALLOWLIST,
+        denylist=settings.REPUTATION_DENYLIST,
+        min_reports=settings.REPUTATION_MIN_REPORTS,
+        malicious_ratio=settings.REPUTATION_MALICIOUS_RATIO,
+        stats_ttl=settings.REPUTATION_STATS_TTL,
+        refresh_seconds=settings.REPUTATION_REFRESH_SECONDS,
+    )
@@ -0,0 +1,183 @@
+"""Testes para a camada de reputação de domínios."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from analysis.services.reputation.domain_reputation import (
+    MALICIOUS,
+    MALICIOUS_SET_KEY,
+    TRUSTED,
+    TRUSTED_SET_KEY,
+    DomainReputation,
+    SortedDomainSet,
+    domain_verdict_report,
+    registrable_domain,
+)
+
+
+@pytest.fixture
+def mock_redis(mocker):
+    """Mocka a conexão Redis usada pela reputação aprendida."""
+    redis = MagicMock()
+    mocker.patch(
+        "analysis.services.reputation.domain_reputation.get_redis_connection",
+        return_value=redis,
+    )
+    return redis
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("https://g1.globo.com/pr/noticia.ghtml", "globo.com"),
+        ("https://www.gov.br/saude/pt-br", "gov.br"),
+        ("https://noticias.uol.com.br/politica", "uol.com.br"),
+        ("http://WWW.Example.COM./path", "example.com"),
+        ("g1.globo.com", "globo.com"),
+        ("localhost", "localhost"),
+        ("https://golpe.blogspot.com/post", "golpe.blogspot.com"),
+        ("https://fulano.github.io/", "fulano.github.io"),
+        ("https://app.vercel.app", "app.vercel.app"),
+        ("https://autor.wordpress.com/2024/post", "autor.wordpress.com"),
+        ("http://192.168.0.1:8000/", "192.168.0.1"),
+    ],
+)
+def test_registrable_domain(value, expected):
+    """Testa a extração pela Public Suffix List, inclusive os sufixos privados."""
+    assert registrable_domain(value) == expected
+
+
+def test_sorted_domain_set_normaliza_e_busca():
+    """Testa que o array ordenado normaliza subdomínios e ignora entradas vazias."""
+    domains = SortedDomainSet(["g1.globo.com", " folha.uol.com.br", "", "ESTADAO.com.br"])
+
+    assert len(domains) == 3
+    assert "globo.com" in domains
+    assert "uol.com.br" in domains
+    assert "estadao.com.br" in domains
+    assert "golpe.com" not in domains
+
+
+def test_lookup_listas_curadas_nao_acessam_redis(mock_redis):
+    """Testa que allowlist e denylist respondem sem round trip no Redis."""
+    reputation = DomainReputation(allowlist=["g1.globo.com"], denylist=["golpe.com.br"])
+
+    assert reputation.lookup("https://g1.globo.com/noticia") == TRUSTED
+    assert reputation.lookup("https://promo.golpe.com.br/pix") == MALICIOUS
+    mock_redis.pipeline.assert_not_called()
+
+
+def test_allowlist_vale_so_para_o_host_exato(mock_redis):
+    """Testa que confiar em um subdomínio não estende a confiança aos vizinhos."""
+    mock_redis.pipeline.return_value.execute.return_value = [set(), set()]
+    reputation = DomainReputation(allowlist=["www.g1.globo.com", "fulano.github.io"])
+
+    assert reputation.lookup("https://g1.globo.com/noticia") == TRUSTED
+    assert reputation.lookup("https://golpe.globo.com/pix") is None
+    assert reputation.lookup("https://globo.com") is None
+    assert reputation.lookup("https://golpe.github.io") is None
+
+
+def test_lookup_denylist_tem_prioridade(mock_redis):
+    """Testa que um domínio em ambas as listas é tratado como malicioso."""
+    reputation = DomainReputation(allowlist=["site.com"], denylist=["site.com"])
+
+    assert reputation.lookup("https://site.com") == MALICIOUS
+
+
+def test_lookup_reputacao_aprendida_com_cache_local(mock_redis):
+    """Testa que os conjuntos aprendidos são carregados uma vez por intervalo."""
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.return_value = [{b"bbc.co.uk"}, {b"phishing.net"}]
+    reputation = DomainReputation(refresh_seconds=60)
+
+    assert reputation.lookup("https://www.bbc.co.uk/news") == TRUSTED
+    assert reputation.lookup("https://login.phishing.net") == MALICIOUS
+    assert reputation.lookup("https://desconhecido.org") is None
+    assert pipe.execute.call_count == 1
+
+
+def test_lookup_falha_no_redis_nao_propaga(mock_redis):
+    """Testa que uma falha no Redis apenas desativa a reputação aprendida."""
+    mock_redis.pipeline.side_effect = ConnectionError("redis fora do ar")
+    reputation = DomainReputation()
+
+    assert reputation.lookup("https://qualquer.com") is None
+
+
+def test_record_vt_report_ignora_relatorios_incompletos(mock_redis):
+    """Testa que relatórios 'queued' não entram nos agregados."""
+    reputation = DomainReputation()
+
+    assert reputation.record_vt_report("https://a.com", {"status": "queued"}) is None
+    mock_redis.pipeline.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "reports, flagged, expected_verdict, added_to, removed_from",
+    [
+        (25, 0, TRUSTED, TRUSTED_SET_KEY, MALICIOUS_SET_KEY),
+        (25, 20, MALICIOUS, MALICIOUS_SET_KEY, TRUSTED_SET_KEY),
+    ],
+    ids=["dominio_limpo", "dominio_malicioso"],
+)
+def test_record_vt_report_promove_dominio(
+    mock_redis, reports, flagged, expected_verdict, added_to, removed_from
+):
+    """Testa a promoção do domínio após atingir o mínimo de relatórios."""
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.return_value = [reports, flagged, True]
+    reputation = DomainReputation(min_reports=20, malicious_ratio=0.5, stats_ttl=3600)
+
+    verdict = reputation.record_vt_report(
+        "https://g1.globo.com/x",
+        {"status": "completed", "malicious_count": 0, "suspicious_count": 0},
+    )
+
+    assert verdict == expected_verdict
+    pipe.hincrby.assert_any_call("reputation:domain:globo.com", "reports", 1)
+    pipe.expire.assert_called_once_with("reputation:domain:globo.com", 3600)
+    mock_redis.sadd.assert_called_once_with(added_to, "globo.com")
+    mock_redis.srem.assert_called_once_with(removed_from, "globo.com")
+
+
+def test_record_vt_report_alerta_revoga_confianca_na_hora(mock_redis):
+    """Testa que um único alerta tira o domínio dos confiáveis, antes da razão mínima."""
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.side_effect = [[{b"globo.com"}, set()], [41, 1, True], [set(), set()]]
+    reputation = DomainReputation(min_reports=20, malicious_ratio=0.5)
+    assert reputation.lookup("https://g1.globo.com") == TRUSTED
+
+    verdict = reputation.record_vt_report(
+        "https://g1.globo.com/x", {"status": "completed", "malicious_count": 1}
+    )
+
+    assert verdict is None
+    mock_redis.srem.assert_called_once_with(TRUSTED_SET_KEY, "globo.com")
+    mock_redis.sadd.assert_not_called()
+    assert reputation.lookup("https://g1.globo.com") is None
+
+
+def test_record_vt_report_abaixo_do_minimo(mock_redis):
+    """Testa que nenhum veredito é aprendido com poucos relatórios."""
+    pipe = mock_redis.pipeline.return_value
+    pipe.execute.return_value = [3, 0, True]
+    reputation = DomainReputation(min_reports=20)
+
+    verdict = reputation.record_vt_report("https://a.com", {"status": "completed"})
+
+    assert verdict is None
+    mock_redis.sadd.assert_not_called()
+
+
+def test_domain_verdict_report():
+    """Testa o relatório sintético devolvido no lugar do VirusTotal."""
+    assert domain_verdict_report(MALICIOUS)["status"] == "domain_blocked"
+    assert domain_verdict_report(TRUSTED) == {
+        "malicious_count": 0,
+        "suspicious_count": 0,
+        "total_scans": 0,
+        "status": "skipped",
+        "domain_reputation": TRUSTED,
+    }
@@ -0,0 +1,8 @@
+from .threat_index import (
+    ThreatFeedIndex,
+    build_index,
+    get_threat_feed_index,
+    iter_feed_urls,
+    lookup_threat_feed,
+    threat_feed_report,
+)
@@ -0,0 +1,93 @@
+"""Testes para o índice offline de URLs maliciosas."""
+
+import os
+
+import pytest
+
+from analysis.services.threat_feed.threat_index import (
+    ThreatFeedIndex,
+    build_index,
+    iter_feed_urls,
+    url_hash,
+)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Caminho temporário para o arquivo de índice."""
+    return str(tmp_path / "feeds" / "threat_feed.idx")
+
+
+def test_iter_feed_urls_formatos_suportados():
+    """Testa a leitura de linhas do URLhaus, do PhishTank e de listas simples."""
+    lines = [
+        "# URLhaus Database Dump (CSV)\n",
+        '# id,dateadded,url,url_status,last_online,threat,tags,urlhaus_link,reporter\n',
+        '"1","2025-10-01 10:00:00","http://malware.example/bin.exe","online","","malware_download","","https://urlhaus.abuse.ch/url/1/","x"\n',
+        "phish_id,url,phish_detail_url,submission_time,verified\n",
+        "99,https://banco-falso.example/login,http://phishtank.org/99,2025-10-01,yes\n",
+        "https://golpe.example/pix\n",
+        "\n",
+        "linha sem url\n",
+    ]
+
+    assert list(iter_feed_urls(lines)) == [
+        "http://malware.example/bin.exe",
+        "https://banco-falso.example/login",
+        "https://golpe.example/pix",
+    ]
+
+
+def test_url_hash_usa_url_canonica():
+    """Testa que variações triviais da mesma URL geram o mesmo hash."""
+    assert url_hash("HTTPS://Golpe.Example:443/pix#topo") == url_hash(
+        "https://golpe.example/pix"
+    )
+    assert url_hash("https://golpe.example/pix") != url_hash("https://golpe.example/")
+
+
+def test_build_index_e_busca(index_path):
+    """Testa a criação do índice e a busca binária sobre o arquivo mapeado."""
+    urls = [f"https://malicioso{i}.example/path" for i in range(1000)]
+    urls.append(urls[0])  # duplicadas são descartadas
+
+    total = build_index(urls, index_path)
+    index = ThreatFeedIndex(index_path)
+
+    assert total == 1000
+    assert len(index) == 1000
+    assert "https://malicioso0.example/path" in index
+    assert "https://MALICIOSO999.example/path" in index
+    assert "https://g1.globo.com/noticia" not in index
+    assert os.listdir(os.path.dirname(index_path)) == ["threat_feed.idx"]
+
+
+def test_indice_ausente_nao_bloqueia(index_path):
+    """Testa que, sem arquivo de índice, nenhuma URL é considerada maliciosa."""
+    index = ThreatFeedIndex(index_path)
+
+    assert len(index) == 0
+    assert "https://qualquer.example" not in index
+
+
+def test_troca_atomica_do_indice(index_path):
+    """Testa que um novo feed ingerido substitui o índice aberto."""
+    build_index(["https://antigo.example/"], index_path)
+    index = ThreatFeedIndex(index_path, check_interval=0)
+    assert "https://antigo.example/" in index
+
+    build_index(["https://novo.example/"], index_path)
+
+    assert "https://novo.example/" in index
+    assert "https://antigo.example/" not in index
+
+
+def test_indice_corrompido_e_ignorado(index_path):
+    """Testa que um arquivo com cabeçalho inválido não derruba a análise."""
+    os.makedirs(os.path.dirname(index_path))
+    with open(index_path, "wb") as f:
+        f.write(b"lixo" * 10)
+
+    index = ThreatFeedIndex(index_path)
+
+    assert "https://qualquer.example" not in index
@@ -0,0 +1,149 @@
+import bisect
+import csv
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+from django.conf import settings
+
+from analysis.util.url import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+# Cabeçalho: magic (8 bytes) + quantidade de entradas (uint64)
+_MAGIC = b"FSTF1" + (b"L" if sys.byteorder == "little" else b"B") + b"\0\0"
+_HEADER = struct.Struct("=8sQ")
+
+
+def url_hash(url):
+    canonical = canonicalize_url(url)
+    digest = hashlib.blake2b(canonical.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, sys.byteorder)
+
+
+def iter_feed_urls(lines):
+    # Aceita dumps do URLhaus (CSV com comentários "#"), do PhishTank (CSV com
+    # cabeçalho) e listas simples com uma URL por linha.
+    for row in csv.reader(line for line in lines if not line.startswith("#")):
+        for field in row:
+            field = field.strip()
+            if field.startswith(("http://", "https://")):
+                yield field
+                break
+
+
+def build_index(urls, path):
+    hashes = array("Q", sorted({url_hash(url) for url in urls}))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(hashes)))
+        hashes.tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Troca atômica: leitores abertos continuam com o mapeamento antigo
+    os.replace(tmp_path, path)
+    return len(hashes)
+
+
+class ThreatFeedIndex:
+    """Índice ordenado de hashes de URLs, mapeado em memória e somente leitura.
+
+    As páginas do arquivo ficam no page cache do kernel, então todos os
+    processos filhos do Celery compartilham a mesma memória física.
+    """
+
+    def __init__(self, path, check_interval=5):
+        self.path = path
+        self.check_interval = check_interval
+        self._state = None
+        self._identity = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, url):
+        hashes = self._current()
+        if hashes is None:
+            return False
+
+        value = url_hash(url)
+        index = bisect.bisect_left(hashes, value)
+        return index < len(hashes) and hashes[index] == value
+
+    def __len__(self):
+        hashes = self._current()
+        return len(hashes) if hashes is not None else 0
+
+    def _current(self):
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self._reload_if_changed(now)
+        return self._state
+
+    def _reload_if_changed(self, now):
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                self._state = None
+                self._identity = None
+                return
+
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity == self._identity:
+                return
+
+            try:
+                self._state = self._open()
+                self._identity = identity
+            except (OSError, ValueError) as e:
+                logger.warning(f"Índice de ameaças inválido em {self.path}: {e}")
+
+    def _open(self):
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size <= _HEADER.size:
+                return memoryview(b"").cast("Q")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC:
+            raise ValueError("cabeçalho desconhecido")
+
+        hashes = memoryview(mapped)[_HEADER.size :].cast("Q")
+        if len(hashes) != count:
+            raise ValueError("arquivo truncado")
+        return hashes
+
+
+def threat_feed_report():
+    return {
+        "malicious_count": 0,
+        "suspicious_count": 0,
+        "total_scans": 0,
+        "status": "threat_feed_match",
+        "threat_feed": True,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_threat_feed_index():
+    return ThreatFeedIndex(
+        settings.THREAT_FEED_INDEX_PATH,
+        check_interval=settings.THREAT_FEED_CHECK_SECONDS,
+    )
+
+
+def lookup_threat_feed(url):
+    return url in get_threat_feed_index()
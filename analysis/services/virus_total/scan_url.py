@@ -3,10 +3,17 @@ from urllib.parse import urlparse
 
 import requests
 from decouple import config
+from django.conf import settings
 from rest_framework.exceptions import APIException, ValidationError
 
+from analysis.services.exceptions import (
+    ProviderTransientError,
+    provider_error_for_status,
+)
+from analysis.util.deadline import request_timeout
 
-def _scan_url(url):
+
+def _scan_url(url, deadline=None):
     if not url:
         raise ValidationError("URL não pode ser vazia.")
 
@@ -18,7 +25,7 @@ def _scan_url(url):
     if not api_key:
         raise APIException("Chave API KEY não encontrada no .env!")
 
-    url_virus_total = "https://www.virustotal.com/api/v3/urls"
+    url_virus_total = f"{settings.VIRUS_TOTAL_API_URL}/urls"
     payload = {"url": f"{url}"}
     headers = {
         "accept": "application/json",
@@ -27,12 +34,19 @@ def _scan_url(url):
     }
 
     try:
-        response = requests.post(url=url_virus_total, data=payload, headers=headers)
+        response = requests.post(
+            url=url_virus_total,
+            data=payload,
+            headers=headers,
+            timeout=request_timeout(deadline),
+        )
         data = response.json()
 
         if response.status_code != 200:
             error_messages = data.get("error", {}).get("message", "erro desconhecido")
-            raise APIException(f"Erro na API: {error_messages}")
+            raise provider_error_for_status(
+                response.status_code, f"Erro na API: {error_messages}"
+            )
 
         url_id = data.get("data", {}).get("id")
         if not url_id:
@@ -42,10 +56,19 @@ def _scan_url(url):
 
     except requests.exceptions.HTTPError as e:
         raise APIException(f"Erro na api: {e}")
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        raise ProviderTransientError(f"Erro na requisição: {e}")
     except requests.exceptions.RequestException as e:
         raise APIException(f"Erro na requisição: {e}")
 
 
 if __name__ == "__main__":
+    import os
+
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     x = _scan_url("https://github.com/tioRaffa/FactShield")
     pprint(x)
@@ -118,6 +118,7 @@ def test_get_report_success_scenarios(mock_config, mock_requests_get, json_respo
             "accept": "application/json",
             "x-apikey": "fake_api_key",
         },
+        timeout=(5, 60),
     )
 
 
@@ -5,6 +5,7 @@ from pprint import pprint
 
 import requests
 from decouple import config
+from django.conf import settings
 from rest_framework.exceptions import APIException, ValidationError
 
 project_root = os.path.abspath(
@@ -12,25 +13,34 @@ project_root = os.path.abspath(
 )
 sys.path.insert(0, project_root)
 
+from analysis.services.exceptions import (  # noqa: E402
+    ProviderTransientError,
+    provider_error_for_status,
+)
 from analysis.services.virus_total.scan_url import _scan_url  # noqa: E402
+from analysis.util.deadline import request_timeout  # noqa: E402
 
 
-def get_report(analysis_id):
+def get_report(analysis_id, deadline=None):
     api_key = config("KEY_VIRUS_TOTAL")
     if not api_key:
         raise APIException("Chave API KEY não encontrada no .env!")
 
-    url = f"https://www.virustotal.com/api/v3/analyses/{analysis_id}"
+    url = f"{settings.VIRUS_TOTAL_API_URL}/analyses/{analysis_id}"
 
     headers = {"accept": "application/json", "x-apikey": api_key}
 
     try:
-        response = requests.get(url=url, headers=headers)
+        response = requests.get(
+            url=url, headers=headers, timeout=request_timeout(deadline)
+        )
         data = response.json()
 
         if response.status_code != 200:
             error_message = data.get("error", {}).get("message", "erro desconhecido")
-            raise APIException(f"Erro na API: {error_message}")
+            raise provider_error_for_status(
+                response.status_code, f"Erro na API: {error_message}"
+            )
 
         attributes = data.get("data", {}).get("attributes", {})
         if not attributes:
@@ -59,11 +69,19 @@ def get_report(analysis_id):
 
     except requests.exceptions.HTTPError as e:
         raise APIException(f"Erro na API: {e}")
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+        raise ProviderTransientError(f"Erro na requisição: {e}")
     except requests.exceptions.RequestException as e:
         raise APIException(f"Erro na requisição: {e}")
 
 
 if __name__ == "__main__":
+    import django
+    import os
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    django.setup()
+
     url_to_scan = "https://g1.globo.com/pr/parana/concursos-e-emprego/noticia/2025/10/01/concurso-adapar-concurso-parana.ghtml"
     print(f"Submetendo URL: {url_to_scan}")
 
@@ -1,70 +1,410 @@
 import concurrent.futures
+import logging
 import os
 import sys
 import time
 
 from celery import shared_task
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
 from django.core.cache import cache
 from rest_framework.exceptions import APIException
 
+from analysis.caching import (
+    UNCHANGED,
+    StageCheckpoints,
+    decay_popularity,
+    get_extraction,
+    popularity_score,
+    report_ttl,
+    reports_to_warm,
+    reusable_results,
+    store_extraction,
+    store_report_etag,
+)
+from analysis.dispatch import enqueue_analysis
+from analysis.metrics import (
+    ANALYSIS_DURATION,
+    memory_tracker,
+    record_prescreen,
+    record_queue_wait,
+    record_resumed_stages,
+    record_retry,
+    record_webhook,
+    timed,
+)
 from analysis.services import (
+    MALICIOUS,
+    TRUSTED,
     _scan_url,
     analyze_with_llm,
-    extract_content_firecrawl,
+    domain_verdict_report,
+    extract_content,
+    get_domain_reputation,
     get_report,
+    lookup_threat_feed,
+    prescreen_content,
+    prescreen_llm_result,
     search_fact_check,
+    threat_feed_report,
+)
+from analysis.services.exceptions import DeadlineExceeded, ProviderTransientError
+from analysis.services.prescreen import PRESCREEN_SOURCE
+from analysis.util.deadline import Deadline
+from analysis.util.fastjson import encode_report
+from analysis.util.profiling import profile_task, task_thread_prefix
+from analysis.webhooks import (
+    REJECTED,
+    RETRY,
+    completion_payload,
+    post_webhook,
+    webhook_secret,
 )
 
-CACHE_5MIN_TTL = 300
+logger = logging.getLogger(__name__)
 
 
-@shared_task()
-def run_full_analysis_task(url, cache_key):
+def _blocked_report(start_time, verdict_source, vt_result):
+    return {
+        "analysis_time_seconds": round(time.time() - start_time, 2),
+        "final_verdict_source": verdict_source,
+        "final_veredict": "EVITE ESTE SITE E CONTEÚDO",
+        "virustotal_report": vt_result,
+        "fact_check_report": {},
+        "llm_analysis": {},
+        "firecrawl_data": {},
+    }
+
+
+def _cache_report(url, cache_key, report):
+    ttl = report_ttl(report, popularity=popularity_score(url))
+    # Guardado já em bytes JSON: o cache hit responde sem decodificar nem codificar
+    cache.set(cache_key, encode_report(report), timeout=ttl)
+
+
+# Falhas que indicam prazo esgotado; qualquer outro erro da etapa é propagado
+_DEADLINE_ERRORS = (
+    concurrent.futures.TimeoutError,
+    concurrent.futures.CancelledError,
+    DeadlineExceeded,
+)
+
+
+def _stage_result(stage, future, deadline, cancelled_stages):
+    # Etapas que estouram o prazo entram no relatório como canceladas
+    if future is None:
+        return None
+    try:
+        while True:
+            try:
+                return future.result(timeout=deadline.remaining())
+            except concurrent.futures.TimeoutError:
+                # O prazo pode ter sido estendido pela espera da cota de um provedor
+                if deadline.expired():
+                    raise
+    except _DEADLINE_ERRORS:
+        if not deadline.expired():
+            raise
+        future.cancel()
+        cancelled_stages.append(stage)
+        return None
+
+
+def _submit(executor, stage, func, checkpoints, timings, *args, rate_limits=None, **kwargs):
+    # Etapa com checkpoint de uma tentativa anterior não chama o provedor de novo
+    if stage in checkpoints:
+        future = concurrent.futures.Future()
+        future.set_result(checkpoints.get(stage))
+        return future
+    call = timed(stage, checkpoints.checkpointed(stage, func), timings)
+    if rate_limits is not None:
+        # A espera pela cota do provedor fica fora do tempo da etapa e do prazo
+        call = rate_limits.wrap(stage, call, deadline=kwargs.get("deadline"))
+    return executor.submit(call, *args, **kwargs)
+
+
+def _transient_cause(exc):
+    # Falhas das etapas iniciais chegam embrulhadas em APIException
+    while exc is not None:
+        if isinstance(exc, ProviderTransientError) and not isinstance(exc, DeadlineExceeded):
+            return exc
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def _retry_countdown(retries, factor=None, maximum=None):
+    return get_exponential_backoff_interval(
+        factor=factor or settings.ANALYSIS_RETRY_BACKOFF,
+        retries=retries,
+        maximum=maximum or settings.ANALYSIS_RETRY_BACKOFF_MAX,
+        full_jitter=True,
+    )
+
+
+def _notify(callback_url, api_key_id, task_id, url, report=None, error=None):
+    if not callback_url:
+        return
+    try:
+        deliver_webhook_task.delay(
+            callback_url,
+            completion_payload(task_id, url, report=report, error=error),
+            api_key_id,
+        )
+    except Exception as e:
+        # Falha ao publicar a entrega não derruba a análise: o status segue consultável
+        logger.warning(f"Falha ao agendar o webhook da task {task_id}: {e}")
+
+
+@shared_task(bind=True)
+def run_full_analysis_task(
+    self,
+    url,
+    cache_key,
+    enqueued_at=None,
+    profile=False,
+    callback_url=None,
+    api_key_id=None,
+):
+    # Parte das tasks (ou as marcadas pelo header) roda sob o profiler amostral
+    lane = (self.request.delivery_info or {}).get("routing_key") or "interactive"
+    retries = self.request.retries or 0
+    checkpoints = StageCheckpoints(self.request.id)
+    try:
+        with profile_task(self.request.id, url, force=profile), memory_tracker(
+            settings.TASK_TRACEMALLOC
+        ):
+            report = _run_full_analysis(
+                url,
+                cache_key,
+                # A espera de um retry é backoff, não fila
+                enqueued_at if not retries else None,
+                lane,
+                checkpoints,
+            )
+    except Exception as e:
+        transient = _transient_cause(e)
+        if transient is None or retries >= settings.ANALYSIS_MAX_RETRIES:
+            _notify(callback_url, api_key_id, self.request.id, url, error=str(e))
+            raise
+        record_retry(transient)
+        raise self.retry(
+            exc=e,
+            countdown=_retry_countdown(retries),
+            max_retries=settings.ANALYSIS_MAX_RETRIES,
+        )
+
+    checkpoints.clear()
+    store_report_etag(self.request.id, report)
+    _notify(callback_url, api_key_id, self.request.id, url, report=report)
+    return report
+
+
+def _run_full_analysis(
+    url,
+    cache_key,
+    enqueued_at=None,
+    lane="interactive",
+    checkpoints=None,
+    rate_limits=None,
+):
     start_time = time.time()
+    queue_wait = record_queue_wait(enqueued_at, lane)
+    checkpoints = checkpoints or StageCheckpoints()
+    record_resumed_stages(checkpoints.resumed)
+    timings = {}
+    deadline = Deadline(settings.ANALYSIS_DEADLINE_SECONDS)
+
+    # Feeds offline de ameaças: veredito instantâneo sem gastar cota do VirusTotal
+    if lookup_threat_feed(url):
+        final_report = _blocked_report(
+            start_time, "LISTA DE AMEAÇAS (Feed offline)", threat_feed_report()
+        )
+        _cache_report(url, cache_key, final_report)
+        return final_report
+
+    # Reputação do domínio: listas curadas e agregados do VirusTotal
+    reputation = get_domain_reputation()
+    domain_verdict = reputation.lookup(url)
+
+    if domain_verdict == MALICIOUS:
+        final_report = _blocked_report(
+            start_time, "REPUTAÇÃO DO DOMÍNIO", domain_verdict_report(MALICIOUS)
+        )
+        _cache_report(url, cache_key, final_report)
+        return final_report
+
+    skip_virus_total = domain_verdict == TRUSTED
+    cancelled_stages = []
+    # Extração anterior: base da requisição condicional e dos resultados reaproveitáveis
+    cached_extraction = get_extraction(url)
+    reused = None
 
     # ThreadPoolExecutor
-    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+    # Threads nomeadas pela thread da task: o profiler amostra só as desta análise
+    executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=4, thread_name_prefix=task_thread_prefix()
+    )
+    try:
         # TAREFAS 1 e 2
-        future_firecrawl = executor.submit(extract_content_firecrawl, url)
-        future_vt_id = executor.submit(_scan_url, url)
+        future_firecrawl = _submit(
+            executor,
+            "firecrawl",
+            extract_content,
+            checkpoints,
+            timings,
+            url,
+            deadline=deadline,
+            cached=cached_extraction,
+            rate_limits=rate_limits,
+        )
+        future_vt_id = None
+        if not skip_virus_total:
+            future_vt_id = _submit(
+                executor,
+                "vt_submit",
+                _scan_url,
+                checkpoints,
+                timings,
+                url,
+                deadline=deadline,
+                rate_limits=rate_limits,
+            )
 
         # Espera a Extração e o ID do VirusTotal
         try:
-            firecrawl_data = future_firecrawl.result(timeout=30)
-            url_id = future_vt_id.result(timeout=30)
+            firecrawl_data = _stage_result(
+                "firecrawl", future_firecrawl, deadline, cancelled_stages
+            )
+            url_id = _stage_result("vt_submit", future_vt_id, deadline, cancelled_stages)
         except Exception as e:
             raise APIException(f"Falha na obtenção de dados iniciais: {e}")
 
+        if firecrawl_data is None:
+            firecrawl_data = {}
+            cancelled_stages += ["fact_check", "llm"]
+        validators = firecrawl_data.pop("validators", None)
+        # Página sem mudanças (304 ou mesmo hash): fact-check e LLM anteriores valem
+        if firecrawl_data.get("revalidation") in UNCHANGED:
+            reused = reusable_results(cached_extraction)
+        if "vt_submit" in cancelled_stages:
+            cancelled_stages.append("vt_report")
+
         # TAREFAS 3, 4 e 5
         title = firecrawl_data.get("title", "")
         content = firecrawl_data.get("content", "")
 
         # 3 - Virus Total
-        future_vt = executor.submit(get_report, url_id)
+        future_vt = None
+        if url_id:
+            future_vt = _submit(
+                executor,
+                "vt_report",
+                get_report,
+                checkpoints,
+                timings,
+                url_id,
+                deadline=deadline,
+                rate_limits=rate_limits,
+            )
 
-        # 4 - Google Fact Check
-        future_fact_check = executor.submit(search_fact_check, title)
+        future_fact_check = future_llm = None
+        prescreen = None
+        if firecrawl_data and reused is None:
+            # 4 - Google Fact Check
+            future_fact_check = _submit(
+                executor,
+                "fact_check",
+                search_fact_check,
+                checkpoints,
+                timings,
+                title,
+                deadline=deadline,
+                rate_limits=rate_limits,
+            )
 
-        # 5 - LLM Gemini
-        future_llm = executor.submit(analyze_with_llm, content)
+            # 5 - LLM Gemini, a não ser que a triagem local dispense a chamada
+            if "llm" not in checkpoints:
+                prescreen = prescreen_content(content, trusted_domain=skip_virus_total)
+                if prescreen is not None:
+                    record_prescreen(prescreen)
+            if prescreen is None or not prescreen.skip_llm:
+                future_llm = _submit(
+                    executor,
+                    "llm",
+                    analyze_with_llm,
+                    checkpoints,
+                    timings,
+                    content,
+                    deadline=deadline,
+                    lane=lane,
+                    rate_limits=rate_limits,
+                )
 
         # SINCRONIZAÇÃO FINAL
-        vt_result = future_vt.result(timeout=120)
-        fact_check_result = future_fact_check.result(timeout=60)
-        llm_result = future_llm.result(timeout=120)
+        if skip_virus_total:
+            vt_result = domain_verdict_report(TRUSTED)
+        else:
+            vt_result = (
+                _stage_result("vt_report", future_vt, deadline, cancelled_stages) or {}
+            )
+        if reused is not None:
+            fact_check_result, llm_result = reused
+        else:
+            fact_check_result = (
+                _stage_result("fact_check", future_fact_check, deadline, cancelled_stages)
+                or {}
+            )
+            if prescreen is not None and prescreen.skip_llm:
+                llm_result = prescreen_llm_result(prescreen)
+            else:
+                llm_result = (
+                    _stage_result("llm", future_llm, deadline, cancelled_stages) or {}
+                )
+    finally:
+        # Não espera as threads presas em provedores: o timeout de cada chamada
+        # já está limitado pelo prazo e as etapas que não começaram são canceladas
+        executor.shutdown(wait=False, cancel_futures=True)
 
     end_time = time.time()
+    ANALYSIS_DURATION.observe(end_time - start_time)
+
+    if not skip_virus_total:
+        reputation.record_vt_report(url, vt_result)
+    elif settings.REPUTATION_TRUSTED_MODE == "defer":
+        refresh_domain_reputation_task.delay(url)
 
     # Determinação do veredicto final
     if fact_check_result:
         final_verdict_source = "HUMANO (Fact-Check)"
         final_veredict = fact_check_result.get("veredict", "N/A")
-    else:
+    elif llm_result.get("llm_source") == PRESCREEN_SOURCE:
+        final_verdict_source = "TRIAGEM LOCAL (Classificador)"
+        final_veredict = llm_result["llm_recommendation"]
+    elif llm_result:
         final_verdict_source = "INTELIGÊNCIA ARTIFICIAL (LLM)"
         final_veredict = llm_result.get("llm_recommendation", "INCONCLUSIVO")
+    else:
+        final_verdict_source = "ANÁLISE PARCIAL (Prazo esgotado)"
+        final_veredict = "INCONCLUSIVO"
+
+    if validators and llm_result and not cancelled_stages:
+        store_extraction(
+            url,
+            firecrawl_data,
+            validators,
+            fact_check_result,
+            llm_result,
+            # Resultados reaproveitados mantêm a idade da análise original
+            analyzed_at=cached_extraction["analyzed_at"] if reused else None,
+        )
 
     final_report = {
         "analysis_time_seconds": round(end_time - start_time, 2),
+        "queue_wait_seconds": queue_wait,
+        "stage_timings": dict(timings),
+        "cancelled_stages": cancelled_stages,
+        "resumed_stages": list(checkpoints.resumed),
+        "prescreen": prescreen.as_report() if prescreen is not None else None,
         "final_verdict_source": final_verdict_source,
         "final_veredict": final_veredict,
         "virustotal_report": vt_result,
@@ -72,6 +412,65 @@ def run_full_analysis_task(url, cache_key):
         "llm_analysis": llm_result,
         "firecrawl_data": firecrawl_data,
     }
-    cache.set(cache_key, final_report, timeout=CACHE_5MIN_TTL)
+    _cache_report(url, cache_key, final_report)
 
     return final_report
+
+
+@shared_task(bind=True, max_retries=3)
+def refresh_domain_reputation_task(self, url, url_id=None):
+    # Scan adiado de domínios confiáveis: mantém os agregados atualizados
+    if url_id is None:
+        url_id = _scan_url(url)
+
+    vt_result = get_report(url_id)
+    if vt_result.get("status") != "completed":
+        raise self.retry(countdown=30, kwargs={"url": url, "url_id": url_id})
+
+    get_domain_reputation().record_vt_report(url, vt_result)
+    return vt_result
+
+
+@shared_task()
+def warm_popular_reports_task():
+    # Job do beat: reanalisa as URLs em alta pouco antes do relatório expirar
+    decay_popularity()
+
+    warmed = 0
+    for url, cache_key in reports_to_warm():
+        # Ninguém espera por essas reanálises: não ocupam a fila interativa
+        enqueue_analysis(url, cache_key, lane="bulk")
+        warmed += 1
+    return warmed
+
+
+@shared_task(bind=True)
+def deliver_webhook_task(self, callback_url, payload, api_key_id=None):
+    # Uma tentativa por execução; falhas temporárias voltam para a fila com backoff
+    start = time.perf_counter()
+    # O segredo é lido no worker, a cada tentativa: não trafega pelo broker e uma
+    # chave revogada deixa de receber entregas
+    secret = webhook_secret(api_key_id)
+    if secret is None:
+        result, detail = REJECTED, "chave de API inexistente ou revogada"
+    else:
+        result, detail = post_webhook(callback_url, payload, secret)
+    record_webhook(result, time.perf_counter() - start)
+
+    retries = self.request.retries or 0
+    if result == RETRY:
+        if retries < settings.WEBHOOK_MAX_RETRIES:
+            raise self.retry(
+                countdown=_retry_countdown(
+                    retries, settings.WEBHOOK_RETRY_BACKOFF, settings.WEBHOOK_RETRY_BACKOFF_MAX
+                ),
+                max_retries=settings.WEBHOOK_MAX_RETRIES,
+            )
+        result = "failed"
+        record_webhook(result)
+
+    if result != "delivered":
+        logger.warning(
+            f"Webhook {payload.get('delivery_id')} para {callback_url} não entregue: {detail}"
+        )
+    return {"result": result, "detail": detail, "attempts": retries + 1}
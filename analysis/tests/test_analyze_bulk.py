@@ -0,0 +1,199 @@
+"""Testes para a análise em lote pela linha de comando (analyze_bulk)."""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from analysis import bulk, tasks
+from analysis.bulk import BulkAnalyzer, iter_input_urls
+from analysis.util.fastjson import encode_report
+from analysis.util.rate_limit import ProviderRateLimits, TokenBucket, parse_rate_limits
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def pipeline(mocker):
+    """Pipeline falso que registra as URLs e a concorrência máxima."""
+    state = {"calls": [], "running": 0, "max_running": 0, "fail": set()}
+    lock = threading.Lock()
+
+    def fake_analysis(url, cache_key, lane="interactive", rate_limits=None):
+        with lock:
+            state["calls"].append((url, lane))
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        time.sleep(0.01)
+        with lock:
+            state["running"] -= 1
+        if url in state["fail"]:
+            raise RuntimeError("provedor fora")
+        return {"final_veredict": "CONFIE", "url": url}
+
+    mocker.patch.object(tasks, "_run_full_analysis", side_effect=fake_analysis)
+    mocker.patch.object(bulk, "cache").get.return_value = None
+    return state
+
+
+def test_entrada_em_csv_jsonl_e_texto():
+    """Testa a leitura das URLs nos três formatos, ignorando o resto."""
+    lines = [
+        "# comentário",
+        "id,url,data",
+        '1,"https://a.example/x",2025-10-01',
+        '{"url": "https://b.example/y", "origem": "campanha"}',
+        "https://c.example/z",
+        "{json quebrado",
+        "",
+    ]
+
+    assert list(iter_input_urls(lines)) == [
+        "https://a.example/x",
+        "https://b.example/y",
+        "https://c.example/z",
+    ]
+
+
+def test_normaliza_deduplica_e_descarta_invalidas(pipeline):
+    """Testa a deduplicação pela URL canônica."""
+    output = io.StringIO()
+    urls = [
+        "https://A.example/noticia#topo",
+        "https://a.example/noticia",
+        "https://a.example:443/noticia",
+        "nao-e-url",
+        "https://b.example",
+    ]
+
+    progress = BulkAnalyzer(output, concurrency=2).run(urls)
+
+    analyzed = sorted(url for url, _ in pipeline["calls"])
+    assert analyzed == ["https://a.example/noticia", "https://b.example/"]
+    assert progress.duplicates == 2
+    assert progress.invalid == 1
+    assert all(lane == "bulk" for _, lane in pipeline["calls"])
+
+
+def test_concorrencia_limitada_e_saida_incremental(pipeline):
+    output = io.StringIO()
+    urls = [f"https://site.example/{i}" for i in range(20)]
+
+    progress = BulkAnalyzer(output, concurrency=3).run(urls)
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert len(records) == 20 and progress.ok == 20
+    assert {record["status"] for record in records} == {"ok"}
+    assert pipeline["max_running"] <= 3
+
+
+def test_retoma_pelo_checkpoint_e_repete_erros(pipeline, tmp_path):
+    """Testa que uma segunda execução pula as concluídas e refaz as que falharam."""
+    checkpoint = tmp_path / "saida.jsonl.checkpoint"
+    urls = [f"https://site.example/{i}" for i in range(5)]
+    pipeline["fail"].add("https://site.example/3")
+
+    first = BulkAnalyzer(io.StringIO(), checkpoint_path=checkpoint).run(urls)
+    assert (first.ok, first.errors) == (4, 1)
+
+    pipeline["calls"].clear()
+    pipeline["fail"].clear()
+    second = BulkAnalyzer(io.StringIO(), checkpoint_path=checkpoint).run(urls)
+
+    assert pipeline["calls"] == [("https://site.example/3", "bulk")]
+    assert (second.ok, second.skipped) == (1, 4)
+
+
+def test_relatorio_em_cache_nao_e_reanalisado(pipeline):
+    bulk.cache.get.return_value = {"final_veredict": "EVITE"}
+    output = io.StringIO()
+
+    progress = BulkAnalyzer(output).run(["https://site.example/1"])
+
+    assert progress.cached == 1
+    assert pipeline["calls"] == []
+    assert json.loads(output.getvalue())["report"] == {"final_veredict": "EVITE"}
+
+
+def test_relatorio_com_etapas_canceladas_vira_erro(pipeline, tmp_path):
+    """Testa que o relatório parcial não conta como ok nem entra no checkpoint."""
+    checkpoint = tmp_path / "saida.jsonl.checkpoint"
+    tasks._run_full_analysis.side_effect = lambda url, *a, **kw: {
+        "final_veredict": "INCONCLUSIVO",
+        "cancelled_stages": ["llm"],
+    }
+    output = io.StringIO()
+
+    progress = BulkAnalyzer(output, checkpoint_path=checkpoint).run(["https://site.example/1"])
+
+    record = json.loads(output.getvalue())
+    assert (progress.ok, progress.errors) == (0, 1)
+    assert record["status"] == "error"
+    assert "llm" in record["error"]
+    assert checkpoint.read_text() == ""
+
+
+def test_relatorio_parcial_em_cache_e_reanalisado(pipeline):
+    """Testa que um relatório com etapas canceladas no cache não é reaproveitado."""
+    bulk.cache.get.return_value = encode_report({"cancelled_stages": ["vt_report"]})
+
+    progress = BulkAnalyzer(io.StringIO()).run(["https://site.example/1"])
+
+    assert progress.ok == 1
+    assert pipeline["calls"] == [("https://site.example/1", "bulk")]
+
+
+def test_token_bucket_espaca_as_chamadas():
+    """Testa o limite por provedor: 2 req/s => uma chamada a cada 0,5s."""
+    clock = FakeClock()
+    bucket = TokenBucket(2, clock=clock, sleep=clock.sleep)
+
+    waits = [bucket.acquire() for _ in range(4)]
+
+    assert waits == [0.0, 0.5, 0.5, 0.5]
+    assert clock.now == pytest.approx(1.5)
+
+
+def test_limites_sao_aplicados_por_provedor():
+    clock = FakeClock()
+    limits = ProviderRateLimits(
+        parse_rate_limits("virustotal=1"), clock=clock, sleep=clock.sleep
+    )
+    calls = []
+
+    scan = limits.wrap("vt_submit", lambda: calls.append("vt_submit"))
+    report = limits.wrap("vt_report", lambda: calls.append("vt_report"))
+    scan(), report(), scan()
+
+    assert clock.now == pytest.approx(2)
+    assert limits.wrap("llm", len) is len
+    with pytest.raises(ValueError):
+        parse_rate_limits("openai=1")
+
+
+def test_comando_grava_jsonl_e_checkpoint(pipeline, tmp_path, capsys):
+    source = tmp_path / "campanha.csv"
+    source.write_text("url\nhttps://a.example/1\nhttps://a.example/1\nhttps://b.example/2\n")
+    output = tmp_path / "resultado.jsonl"
+
+    call_command("analyze_bulk", str(source), output=str(output), concurrency=2, rate="gemini=50")
+
+    assert len(output.read_text().splitlines()) == 2
+    assert len((tmp_path / "resultado.jsonl.checkpoint").read_text().splitlines()) == 2
+    assert "Concluído: 2 analisadas" in capsys.readouterr().out
+
+    with pytest.raises(CommandError):
+        call_command("analyze_bulk", str(source), output=str(output), rate="gemini")
@@ -0,0 +1,154 @@
+"""Testes para a autenticação por chave de API e as cotas por plano."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from rest_framework.test import APIClient
+
+from analysis import authentication, throttling
+from analysis.models import ApiKey
+from analysis.throttling import parse_rate
+
+
+@pytest.fixture(autouse=True)
+def limpa_cache_de_chaves():
+    authentication._key_cache.clear()
+    authentication._invalid_key_cache.clear()
+    yield
+    authentication._key_cache.clear()
+    authentication._invalid_key_cache.clear()
+
+
+@pytest.fixture
+def script(mocker):
+    """Script Lua falso: permite e devolve saldo 41 com 30s até renovar."""
+    fake = MagicMock(return_value=[1, 41, b"30.2"])
+    mocker.patch.object(throttling, "_sliding_window_script", return_value=fake)
+    return fake
+
+
+def _status(client, **headers):
+    return client.get("/api/v1/analysis/status/abc", HTTP_HOST="localhost", **headers)
+
+
+@pytest.fixture
+def celery_result(mocker):
+    task = mocker.patch("analysis.view.analysis_status.AsyncResult").return_value
+    task.state = "PENDING"
+    return task
+
+
+@pytest.mark.parametrize(
+    "rate, expected",
+    [("5/min", (5, 60)), ("5000/m", (5000, 60)), ("10/s", (10, 1)), ("100/hour", (100, 3600))],
+)
+def test_parse_rate(rate, expected):
+    """Testa o formato de taxa no padrão do DRF."""
+    assert parse_rate(rate) == expected
+
+
+@pytest.mark.django_db
+def test_generate_salva_apenas_o_hash():
+    """Testa que a chave em texto não é persistida."""
+    api_key, raw_key = ApiKey.generate("Parceiro", tier=ApiKey.TIER_PARTNER)
+
+    assert raw_key.startswith(f"fs_{api_key.prefix}_")
+    assert api_key.key_hash == ApiKey.hash_key(raw_key)
+    assert raw_key not in api_key.key_hash
+
+
+@pytest.mark.django_db
+def test_chave_valida_usa_cota_do_plano(script, celery_result, settings):
+    """Testa que a chave autentica e a cota vem do plano, por chave."""
+    settings.API_QUOTA_TIERS = {**settings.API_QUOTA_TIERS, "partner": "5000/min"}
+    api_key, raw_key = ApiKey.generate("Parceiro", tier=ApiKey.TIER_PARTNER)
+
+    response = _status(APIClient(), HTTP_X_API_KEY=raw_key)
+
+    assert response.status_code == 200
+    script.assert_called_once_with(keys=[f"quota:{{key:{api_key.id}}}"], args=[5000, 60, 1])
+    assert response["X-RateLimit-Limit"] == "5000"
+    assert response["X-RateLimit-Remaining"] == "41"
+    assert response["X-RateLimit-Reset"] == "31"
+
+
+@pytest.mark.django_db
+def test_chave_no_header_authorization(script, celery_result):
+    """Testa o formato 'Authorization: Api-Key <chave>'."""
+    _, raw_key = ApiKey.generate("Parceiro")
+
+    response = _status(APIClient(), HTTP_AUTHORIZATION=f"Api-Key {raw_key}")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+def test_chave_invalida_ou_revogada_retorna_401(script, celery_result):
+    """Testa que chaves desconhecidas e revogadas são recusadas."""
+    api_key, raw_key = ApiKey.generate("Parceiro")
+    api_key.is_active = False
+    api_key.save()
+
+    assert _status(APIClient(), HTTP_X_API_KEY=raw_key).status_code == 401
+    assert _status(APIClient(), HTTP_X_API_KEY="fs_x_y").status_code == 401
+
+
+@pytest.mark.django_db
+def test_validacao_da_chave_fica_em_cache(django_assert_num_queries):
+    """Testa que a chave só vai ao banco na primeira requisição."""
+    _, raw_key = ApiKey.generate("Parceiro")
+
+    with django_assert_num_queries(1):
+        assert authentication.resolve_api_key(raw_key) is not None
+        assert authentication.resolve_api_key(raw_key) is not None
+
+
+@pytest.mark.django_db
+def test_chaves_inventadas_nao_expulsam_as_validas(django_assert_num_queries, mocker):
+    """Testa que chaves inválidas ficam no cache negativo, sem tocar o das válidas."""
+    mocker.patch.object(authentication, "_key_cache", authentication._KeyCache(maxsize=2))
+    mocker.patch.object(
+        authentication, "_invalid_key_cache", authentication._KeyCache(maxsize=2)
+    )
+    _, raw_key = ApiKey.generate("Parceiro")
+    assert authentication.resolve_api_key(raw_key) is not None
+
+    for i in range(10):
+        assert authentication.resolve_api_key(f"fs_x_{i}") is None
+
+    with django_assert_num_queries(0):
+        assert authentication.resolve_api_key(raw_key) is not None
+        # A última inventada segue no cache negativo
+        assert authentication.resolve_api_key("fs_x_9") is None
+
+
+def test_anonimo_usa_cota_por_ip(script, celery_result, settings):
+    """Testa que requisições sem chave usam a cota anônima por IP."""
+    settings.API_QUOTA_TIERS = {**settings.API_QUOTA_TIERS, "anon": "5/min"}
+
+    _status(APIClient(), REMOTE_ADDR="10.0.0.7")
+
+    script.assert_called_once_with(keys=["quota:{ip:10.0.0.7}"], args=[5, 60, 1])
+
+
+def test_cota_esgotada_retorna_429_com_retry_after(script, celery_result):
+    """Testa que a cota esgotada devolve 429 e o tempo de espera."""
+    script.return_value = [0, 0, b"12.5"]
+
+    response = _status(APIClient())
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "13"
+    assert response["X-RateLimit-Remaining"] == "0"
+
+
+def test_sem_redis_a_api_segue_sem_cota(mocker, celery_result):
+    """Testa que uma falha no Redis não derruba a API."""
+    mocker.patch.object(
+        throttling, "_sliding_window_script", side_effect=ConnectionError("redis fora")
+    )
+
+    response = _status(APIClient())
+
+    assert response.status_code == 200
+    assert "X-RateLimit-Limit" not in response
@@ -0,0 +1,154 @@
+"""Testes para as views assíncronas de disparo e status (caminho ASGI)."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+
+from analysis.authentication import ApiKeyIdentity
+from analysis.caching import async_cache
+from analysis.view import async_views
+
+factory = AsyncRequestFactory()
+
+
+@pytest.fixture
+def backends(mocker):
+    """Isola Redis, broker e cotas: só a lógica das views é exercitada."""
+    return SimpleNamespace(
+        cached=mocker.patch.object(async_views, "aget_cached", return_value=None),
+        popularity=mocker.patch.object(async_views, "arecord_request"),
+        meta=mocker.patch.object(async_views, "aget_task_meta"),
+        quota=mocker.patch.object(async_views, "aconsume_quota", return_value=None),
+        resolve=mocker.patch.object(async_views, "aresolve_api_key"),
+        enqueue=mocker.patch.object(
+            async_views, "enqueue_analysis", return_value=SimpleNamespace(id="task-1")
+        ),
+    )
+
+
+def _call(view, request, **kwargs):
+    response = async_to_sync(view.as_view())(request, **kwargs)
+    return response, json.loads(response.content)
+
+
+def _trigger(data, headers=None):
+    request = factory.post(
+        "/api/v1/analysis/", json.dumps(data), content_type="application/json", headers=headers
+    )
+    return _call(async_views.AsyncAnalysisTriggerView, request)
+
+
+def _status(task_id, **params):
+    request = factory.get(f"/api/v1/analysis/status/{task_id}", params)
+    return _call(async_views.AsyncAnalysisStatusView, request, task_id=task_id)
+
+
+def test_disparo_assincrono_enfileira_url_nova(backends):
+    """Testa que um cache miss enfileira a análise e responde 202."""
+    response, body = _trigger({"url": "https://exemplo.com"})
+
+    assert response.status_code == 202
+    assert body["task_id"] == "task-1"
+    backends.popularity.assert_awaited_once_with("https://exemplo.com")
+    assert backends.enqueue.call_args.args[0] == "https://exemplo.com"
+
+
+def test_disparo_assincrono_devolve_relatorio_em_cache(backends):
+    """Testa que um cache hit responde 200 sem enfileirar nada."""
+    backends.cached.return_value = {"final_veredict": "CONFIE"}
+
+    response, body = _trigger({"url": "https://exemplo.com"})
+
+    assert response.status_code == 200
+    assert body["final_report"] == {"final_veredict": "CONFIE"}
+    backends.enqueue.assert_not_called()
+
+
+@pytest.mark.parametrize("data", [{}, {"url": "nao-e-url"}])
+def test_disparo_assincrono_rejeita_url_invalida(backends, data):
+    """Testa que URL ausente ou inválida responde 400 como a view síncrona."""
+    response, body = _trigger(data)
+
+    assert response.status_code == 400
+    assert "error" in body
+    backends.enqueue.assert_not_called()
+
+
+def test_chave_invalida_responde_401(backends):
+    """Testa que uma chave de API desconhecida é recusada antes da view."""
+    backends.resolve.return_value = None
+
+    response, _ = _trigger({"url": "https://exemplo.com"}, headers={"X-API-Key": "fs_x_y"})
+
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"] == "Api-Key"
+    backends.quota.assert_not_called()
+
+
+def test_cota_esgotada_responde_429(backends):
+    """Testa que a cota da chave é aplicada no caminho assíncrono."""
+    backends.resolve.return_value = ApiKeyIdentity(id=1, name="parceiro", tier="partner")
+    backends.quota.return_value = {
+        "allowed": False, "limit": 10, "remaining": 0, "wait": 12.3, "reset": 13,
+    }
+
+    response, _ = _trigger({"url": "https://exemplo.com"}, headers={"X-API-Key": "fs_abc_y"})
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "13"
+    assert backends.quota.call_args.args[0] == "key:1"
+
+
+def test_status_long_poll_espera_a_task_terminar(backends, mocker):
+    """Testa que ?wait=N consulta o backend até a task ficar pronta."""
+    mocker.patch.object(async_views, "LONG_POLL_INTERVAL", 0)
+    backends.meta.side_effect = [
+        {"status": "PENDING", "result": None},
+        {"status": "STARTED", "result": None},
+        {"status": "SUCCESS", "result": {"final_veredict": "CONFIE"}},
+    ]
+
+    response, body = _status("task-1", wait="5")
+
+    assert response.status_code == 200
+    assert body["state"] == "SUCCESS"
+    assert backends.meta.await_count == 3
+
+
+def test_status_sem_wait_consulta_uma_vez(backends):
+    """Testa que sem ?wait o status responde na hora, mesmo pendente."""
+    backends.meta.return_value = {"status": "PENDING", "result": None}
+
+    response, body = _status("task-1")
+
+    assert body["state"] == "PENDING"
+    assert backends.meta.await_count == 1
+
+
+def test_aget_task_meta_le_o_backend_redis_do_celery(mocker):
+    """Testa que o meta da task é lido e decodificado direto do Redis."""
+    from core.celery import app
+
+    payload = app.backend.encode(
+        {"status": "SUCCESS", "result": {"ok": True}, "task_id": "t"}
+    )
+    client = mocker.Mock(get=mocker.AsyncMock(side_effect=[payload, None]))
+    mocker.patch.object(async_cache, "get_async_redis", return_value=client)
+
+    meta = async_to_sync(async_cache.aget_task_meta)("t")
+    missing = async_to_sync(async_cache.aget_task_meta)("outra")
+
+    assert meta["status"] == "SUCCESS" and meta["result"] == {"ok": True}
+    assert missing == {"status": "PENDING", "result": None}
+    assert client.get.await_args_list[0].args[0] == app.backend.get_key_for_task("t")
+
+
+def test_cadeia_de_middlewares_asgi_e_nativa():
+    """Testa que nenhum middleware obriga o ASGI a rodar a cadeia numa thread."""
+    from asgiref.sync import SyncToAsync
+    from django.core.handlers.asgi import ASGIHandler
+
+    assert not isinstance(ASGIHandler()._middleware_chain, SyncToAsync)
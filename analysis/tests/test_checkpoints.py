@@ -0,0 +1,153 @@
+"""Testes para os checkpoints das etapas e as novas tentativas da análise."""
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.exceptions import APIException
+
+from analysis import tasks
+from analysis.caching import StageCheckpoints
+from analysis.services.exceptions import (
+    DeadlineExceeded,
+    ProviderRateLimited,
+    ProviderTransientError,
+)
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+URL = "https://exemplo.com/noticia"
+
+
+@pytest.fixture(autouse=True)
+def local_cache():
+    with override_settings(
+        CACHES=LOCMEM,
+        CHECKPOINT_TTL=3600,
+        ANALYSIS_DEADLINE_SECONDS=5,
+        ANALYSIS_MAX_RETRIES=2,
+        PROFILE_SAMPLE_RATE=0,
+    ):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def pipeline(mocker):
+    """Provedores falsos; o relatório e a reputação ficam isolados."""
+    mocker.patch.object(tasks, "cache")
+    mocker.patch.object(tasks, "popularity_score", return_value=0.0)
+    mocker.patch.object(tasks, "get_extraction", return_value=None)
+    mocker.patch.object(tasks, "store_extraction")
+    mocker.patch.object(tasks, "lookup_threat_feed", return_value=False)
+    reputation = mocker.patch.object(tasks, "get_domain_reputation").return_value
+    reputation.lookup.return_value = None
+    mocker.patch.object(
+        tasks,
+        "extract_content",
+        return_value={"title": "Título", "content": "Conteúdo", "url": URL},
+    )
+    mocker.patch.object(tasks, "_scan_url", return_value="u-1")
+    mocker.patch.object(tasks, "get_report", return_value={"status": "completed"})
+    mocker.patch.object(tasks, "search_fact_check", return_value={})
+    mocker.patch.object(
+        tasks,
+        "analyze_with_llm",
+        side_effect=[ProviderTransientError("Gemini fora"), {"llm_recommendation": "CONFIE"}],
+    )
+    return mocker
+
+
+def test_checkpoints_sobrevivem_entre_tentativas():
+    """Testa que uma nova instância com o mesmo id encontra as etapas salvas."""
+    first = StageCheckpoints("task-1")
+    first.save("firecrawl", {"content": "texto"})
+    first.save("vt_submit", None)
+
+    second = StageCheckpoints("task-1")
+
+    assert second.resumed == ("firecrawl",)
+    assert second.get("firecrawl") == {"content": "texto"}
+    assert "vt_submit" not in second
+
+    second.clear()
+    assert StageCheckpoints("task-1").resumed == ()
+
+
+def test_sem_id_nada_e_persistido():
+    """Testa que chamadas diretas ao pipeline não gravam checkpoints."""
+    StageCheckpoints().save("firecrawl", {"content": "texto"})
+
+    assert cache.get("checkpoint:None:firecrawl") is None
+
+
+def test_retry_retoma_da_etapa_que_falhou(pipeline):
+    """Testa que a falha do Gemini não refaz Firecrawl, VirusTotal e Fact Check."""
+    with pytest.raises(ProviderTransientError):
+        tasks._run_full_analysis(URL, "chave", checkpoints=StageCheckpoints("task-2"))
+
+    report = tasks._run_full_analysis(URL, "chave", checkpoints=StageCheckpoints("task-2"))
+
+    assert report["final_veredict"] == "CONFIE"
+    assert report["resumed_stages"] == ["firecrawl", "vt_submit", "vt_report", "fact_check"]
+    assert tasks.extract_content.call_count == 1
+    assert tasks._scan_url.call_count == 1
+    assert tasks.get_report.call_count == 1
+    assert tasks.search_fact_check.call_count == 1
+    assert tasks.analyze_with_llm.call_count == 2
+
+
+def test_task_tenta_de_novo_e_limpa_os_checkpoints(pipeline):
+    """Testa o retry automático da task e a limpeza ao concluir."""
+    result = tasks.run_full_analysis_task.apply(args=(URL, "chave"), task_id="task-3")
+
+    assert result.successful()
+    assert result.result["resumed_stages"] == [
+        "firecrawl",
+        "vt_submit",
+        "vt_report",
+        "fact_check",
+    ]
+    assert tasks.extract_content.call_count == 1
+    assert StageCheckpoints("task-3").resumed == ()
+
+
+def test_task_desiste_apos_o_limite_de_tentativas(pipeline):
+    """Testa que a falha persistente esgota as tentativas e chega ao cliente."""
+    tasks.analyze_with_llm.side_effect = ProviderRateLimited("cota")
+
+    result = tasks.run_full_analysis_task.apply(args=(URL, "chave"), task_id="task-4")
+
+    assert result.failed()
+    assert isinstance(result.result, ProviderRateLimited)
+    assert tasks.analyze_with_llm.call_count == 3
+    assert tasks.extract_content.call_count == 1
+
+
+def test_erro_definitivo_nao_tem_retry(pipeline):
+    """Testa que erros que não são temporários falham na primeira tentativa."""
+    tasks.analyze_with_llm.side_effect = APIException("Resposta inválida")
+
+    result = tasks.run_full_analysis_task.apply(args=(URL, "chave"), task_id="task-5")
+
+    assert result.failed()
+    assert tasks.analyze_with_llm.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "exc, retry",
+    [
+        (ProviderTransientError("5xx"), True),
+        (ProviderRateLimited("429"), True),
+        (DeadlineExceeded("prazo"), False),
+        (APIException("400"), False),
+    ],
+)
+def test_transient_cause_atravessa_excecoes_embrulhadas(exc, retry):
+    """Testa que falhas das etapas iniciais, embrulhadas em APIException, são reconhecidas."""
+    try:
+        try:
+            raise exc
+        except Exception as e:
+            raise APIException(f"Falha na obtenção de dados iniciais: {e}")
+    except APIException as wrapped:
+        assert (tasks._transient_cause(wrapped) is exc) is retry
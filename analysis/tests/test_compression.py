@@ -0,0 +1,121 @@
+"""Testes para a compressão negociada das respostas JSON."""
+
+import gzip
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from analysis import middleware
+from analysis.middleware import CompressionMiddleware, negotiate_encoding
+
+BODY = b'{"content":"' + b"texto repetido " * 500 + b'"}'
+
+
+@pytest.fixture(autouse=True)
+def compression_settings():
+    with override_settings(COMPRESSION_MIN_BYTES=1024):
+        yield
+
+
+def _respond(body=BODY, content_type="application/json", etag=None, **headers):
+    def view(request):
+        response = HttpResponse(body, content_type=content_type)
+        if etag:
+            response["ETag"] = etag
+        return response
+
+    request = RequestFactory().get("/api/v1/analysis/status/t", headers=headers)
+    return CompressionMiddleware(view)(request)
+
+
+@pytest.mark.parametrize(
+    "header, with_brotli, expected",
+    [
+        ("gzip, deflate, br", True, "br"),
+        ("gzip, deflate, br", False, "gzip"),
+        ("br;q=0.5, gzip", True, "gzip"),
+        ("br;q=0, gzip;q=0", True, None),
+        ("*", False, "gzip"),
+        ("identity", True, None),
+        (None, True, None),
+    ],
+)
+def test_negotiate_encoding(mocker, header, with_brotli, expected):
+    """Testa a escolha da codificação pelos q-values, preferindo brotli."""
+    mocker.patch.object(middleware, "brotli", mocker.Mock() if with_brotli else None)
+
+    assert negotiate_encoding(header) == expected
+
+
+def test_json_grande_sai_com_gzip(mocker):
+    """Testa que uma resposta grande é comprimida e o ETag vira fraco."""
+    mocker.patch.object(middleware, "brotli", None)
+
+    response = _respond(etag='"abc"', accept_encoding="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == BODY
+    assert response["Content-Length"] == str(len(response.content))
+    assert response["ETag"] == 'W/"abc"'
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_json_grande_sai_com_brotli(mocker):
+    """Testa que o brotli é usado quando o cliente aceita e o pacote existe."""
+    brotli = mocker.Mock()
+    compressor = brotli.Compressor.return_value
+    compressor.process.return_value = b"comprimido"
+    compressor.flush.return_value = b""
+    compressor.finish.return_value = b"!"
+    mocker.patch.object(middleware, "brotli", brotli)
+
+    response = _respond(accept_encoding="br, gzip")
+
+    assert response["Content-Encoding"] == "br"
+    assert response.content.startswith(b"comprimido")
+    assert response.content.endswith(b"!")
+    assert compressor.process.call_args.args[0] == BODY
+
+
+def test_brotli_tem_preenchimento_aleatorio_contra_breach():
+    """Testa que o tamanho da resposta em brotli varia e ela continua decodificável."""
+    brotli = pytest.importorskip("brotli")
+
+    sizes = set()
+    for _ in range(20):
+        response = _respond(accept_encoding="br")
+        assert brotli.decompress(response.content) == BODY
+        sizes.add(len(response.content))
+
+    assert len(sizes) > 1
+
+
+def test_resposta_pequena_nao_e_comprimida():
+    """Testa que abaixo de COMPRESSION_MIN_BYTES a resposta sai como está."""
+    response = _respond(body=b'{"ok":true}', accept_encoding="gzip")
+
+    assert not response.has_header("Content-Encoding")
+    assert not response.has_header("Vary")
+
+
+def test_cliente_sem_accept_encoding_recebe_texto_mas_com_vary():
+    """Testa que sem Accept-Encoding não há compressão, mas o Vary avisa os caches."""
+    response = _respond()
+
+    assert response.content == BODY
+    assert not response.has_header("Content-Encoding")
+    assert "Accept-Encoding" in response["Vary"]
+
+
+def test_so_json_e_comprimido():
+    """Testa que outros tipos de conteúdo (ex.: a API navegável) não são tocados."""
+    response = _respond(content_type="text/html", accept_encoding="gzip")
+
+    assert not response.has_header("Content-Encoding")
+
+
+def test_middleware_roda_no_caminho_assincrono():
+    """Testa que a compressão não força o ASGI a passar por threads."""
+    assert CompressionMiddleware.async_capable
+    assert CompressionMiddleware.sync_capable
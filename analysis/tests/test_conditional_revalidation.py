@@ -0,0 +1,144 @@
+"""Testes para a revalidação condicional da extração (ETag, Last-Modified e hash)."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from django.test import override_settings
+
+from analysis import tasks
+from analysis.caching import reusable_results, store_extraction
+from analysis.services.credibility import local_extractor
+
+FIXTURES = Path(__file__).resolve().parents[1] / "services" / "credibility" / "tests" / "fixtures"
+ARTICLE = (FIXTURES / "g1_materia.html").read_bytes()
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class ArticleServer(ThreadingHTTPServer):
+    """Site de notícias local: serve um artigo com ETag e Last-Modified."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _ArticleHandler)
+        self.body = ARTICLE
+        self.etag = '"v1"'
+        self.conditional = True
+        self.responses = []
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/noticia"
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        if server.conditional and self.headers.get("If-None-Match") == server.etag:
+            server.responses.append(304)
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+
+        server.responses.append(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.body)))
+        if server.conditional:
+            self.send_header("ETag", server.etag)
+            self.send_header("Last-Modified", "Wed, 01 Oct 2025 12:12:00 GMT")
+        self.end_headers()
+        self.wfile.write(server.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    server = ArticleServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def pipeline(mocker):
+    """Pipeline real até a extração; VirusTotal, fact-check e LLM falsos."""
+    local_extractor._session.cache_clear()
+    # O site de teste roda em 127.0.0.1, que o extrator barra fora dos testes
+    mocker.patch.object(local_extractor, "is_public_host", return_value=True)
+    mocker.patch.object(tasks, "popularity_score", return_value=0.0)
+    mocker.patch.object(tasks, "lookup_threat_feed", return_value=False)
+    mocker.patch.object(tasks, "get_domain_reputation").return_value.lookup.return_value = None
+    mocker.patch.object(tasks, "_scan_url", return_value="u-1")
+    mocker.patch.object(tasks, "get_report", return_value={"status": "completed"})
+    mocker.patch.object(tasks, "search_fact_check", return_value={})
+    mocker.patch.object(
+        tasks, "analyze_with_llm", return_value={"llm_recommendation": "CONFIE"}
+    )
+    with override_settings(CACHES=LOCMEM):
+        yield mocker
+
+
+def _analyze(site):
+    return tasks._run_full_analysis(site.url, "chave")
+
+
+def test_pagina_nao_modificada_reaproveita_llm_e_fact_check(site, pipeline):
+    """Testa que o 304 reaproveita a extração e os resultados da análise anterior."""
+    first = _analyze(site)
+    second = _analyze(site)
+
+    assert site.responses == [200, 304]
+    assert tasks.analyze_with_llm.call_count == 1
+    assert tasks.search_fact_check.call_count == 1
+    assert second["firecrawl_data"]["revalidation"] == "not_modified"
+    assert second["firecrawl_data"]["content"] == first["firecrawl_data"]["content"]
+    assert second["llm_analysis"] == first["llm_analysis"]
+    assert "validators" not in second["firecrawl_data"]
+
+
+def test_mesmo_conteudo_sem_validadores_reaproveita_pelo_hash(site, pipeline):
+    """Testa que, sem ETag, o hash do conteúdo decide o reaproveitamento."""
+    site.conditional = False
+
+    _analyze(site)
+    second = _analyze(site)
+
+    assert site.responses == [200, 200]
+    assert second["firecrawl_data"]["revalidation"] == "unchanged"
+    assert tasks.analyze_with_llm.call_count == 1
+
+
+def test_pagina_alterada_refaz_a_analise(site, pipeline):
+    """Testa que um ETag novo com conteúdo diferente roda LLM e fact-check de novo."""
+    _analyze(site)
+    site.etag = '"v2"'
+    site.body = ARTICLE.replace(b"120 vagas", b"150 vagas")
+
+    second = _analyze(site)
+
+    assert site.responses == [200, 200]
+    assert second["firecrawl_data"]["revalidation"] == "changed"
+    assert tasks.analyze_with_llm.call_count == 2
+
+
+@override_settings(EXTRACTION_REUSE_MAX_AGE=3600, CACHES=LOCMEM)
+def test_resultados_antigos_nao_sao_reaproveitados():
+    """Testa que fact-check e LLM velhos demais são refeitos mesmo sem mudança."""
+    entry = store_extraction(
+        "https://x.com", {"content": "texto"}, {"content_hash": "h"}, {}, {"llm": 1},
+        analyzed_at=time.time() - 7200,
+    )
+
+    assert reusable_results(entry) is None
+    assert reusable_results({**entry, "analyzed_at": time.time()}) == ({}, {"llm": 1})
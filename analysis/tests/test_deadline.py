@@ -0,0 +1,142 @@
+"""Testes para o prazo total da análise e o cancelamento das etapas."""
+
+import concurrent.futures
+import time
+
+import pytest
+from django.test import override_settings
+
+from analysis import tasks
+from analysis.services.exceptions import DeadlineExceeded
+from analysis.util.deadline import Deadline, request_timeout, timeout_ms
+from analysis.util.fastjson import encode_report
+from analysis.util.rate_limit import ProviderRateLimits
+
+
+@override_settings(PROVIDER_CONNECT_TIMEOUT=5, PROVIDER_READ_TIMEOUT=60)
+def test_request_timeout_limita_ao_tempo_restante():
+    """Testa que connect e read nunca passam do tempo restante do prazo."""
+    assert request_timeout() == (5, 60)
+
+    connect, read = request_timeout(Deadline(2))
+
+    assert connect <= 2 and read <= 2
+    assert timeout_ms(Deadline(2)) <= 2000
+
+
+def test_request_timeout_com_prazo_esgotado():
+    """Testa que nenhuma chamada começa depois do prazo."""
+    with pytest.raises(DeadlineExceeded):
+        request_timeout(Deadline(0))
+
+
+@pytest.fixture
+def pipeline(mocker):
+    """Provedores falsos e cache/reputação isolados para o pipeline."""
+    mocker.patch.object(tasks, "cache")
+    mocker.patch.object(tasks, "popularity_score", return_value=0.0)
+    mocker.patch.object(tasks, "get_extraction", return_value=None)
+    mocker.patch.object(tasks, "store_extraction")
+    mocker.patch.object(tasks, "lookup_threat_feed", return_value=False)
+    reputation = mocker.patch.object(tasks, "get_domain_reputation").return_value
+    reputation.lookup.return_value = None
+    mocker.patch.object(
+        tasks,
+        "extract_content",
+        return_value={"title": "Título", "content": "Conteúdo", "url": ""},
+    )
+    mocker.patch.object(tasks, "_scan_url", return_value="u-1")
+    mocker.patch.object(tasks, "get_report", return_value={"status": "completed"})
+    mocker.patch.object(tasks, "search_fact_check", return_value={})
+    mocker.patch.object(
+        tasks, "analyze_with_llm", return_value={"llm_recommendation": "CONFIE"}
+    )
+    return mocker
+
+
+@override_settings(ANALYSIS_DEADLINE_SECONDS=5, REPORT_TTL_LLM=1800)
+def test_pipeline_completo_sem_etapas_canceladas(pipeline):
+    """Testa que, dentro do prazo, o relatório sai completo."""
+    report = tasks._run_full_analysis("https://exemplo.com", "chave")
+
+    assert report["cancelled_stages"] == []
+    assert report["final_veredict"] == "CONFIE"
+    tasks.cache.set.assert_called_once_with(
+        "chave", encode_report(report), timeout=1800
+    )
+
+
+@override_settings(ANALYSIS_DEADLINE_SECONDS=0.3, REPORT_TTL_PROVISIONAL=60)
+def test_pipeline_cancela_etapa_que_estoura_o_prazo(pipeline):
+    """Testa que a LLM lenta é cancelada sem segurar o worker."""
+
+    def slow_llm(content, deadline=None, lane="interactive"):
+        time.sleep(2)
+        return {"llm_recommendation": "CONFIE"}
+
+    tasks.analyze_with_llm.side_effect = slow_llm
+
+    start = time.perf_counter()
+    report = tasks._run_full_analysis("https://exemplo.com", "chave")
+
+    assert time.perf_counter() - start < 1
+    assert report["cancelled_stages"] == ["llm"]
+    assert report["final_veredict"] == "INCONCLUSIVO"
+    assert report["virustotal_report"] == {"status": "completed"}
+    tasks.cache.set.assert_called_once_with(
+        "chave", encode_report(report), timeout=60
+    )
+
+
+@override_settings(ANALYSIS_DEADLINE_SECONDS=0.3)
+def test_pipeline_sem_conteudo_cancela_etapas_dependentes(pipeline):
+    """Testa que, sem a extração, fact check e LLM entram como canceladas."""
+
+    def slow_firecrawl(url, deadline=None, cached=None):
+        time.sleep(2)
+        return {}
+
+    tasks.extract_content.side_effect = slow_firecrawl
+
+    report = tasks._run_full_analysis("https://exemplo.com", "chave")
+
+    assert report["cancelled_stages"][:3] == ["firecrawl", "fact_check", "llm"]
+    tasks.search_fact_check.assert_not_called()
+    tasks.analyze_with_llm.assert_not_called()
+
+
+@override_settings(ANALYSIS_DEADLINE_SECONDS=0.3)
+def test_espera_pela_cota_do_provedor_nao_consome_o_prazo(pipeline):
+    """Testa que a LLM que espera 0,5s pela cota ainda roda com o prazo de 0,3s."""
+    limits = ProviderRateLimits({"gemini": 2})
+    # Ficha já gasta: a próxima chamada ao Gemini espera 0,5s
+    limits.buckets["gemini"].acquire()
+
+    report = tasks._run_full_analysis("https://exemplo.com", "chave", rate_limits=limits)
+
+    assert report["cancelled_stages"] == []
+    assert report["final_veredict"] == "CONFIE"
+
+
+@pytest.mark.parametrize(
+    "error, cancelled",
+    [
+        (DeadlineExceeded("prazo"), True),
+        (concurrent.futures.TimeoutError(), True),
+        (ValueError("bug na etapa"), False),
+        (KeyError("campo"), False),
+    ],
+)
+def test_so_erros_de_prazo_viram_etapa_cancelada(error, cancelled):
+    """Testa que, com o prazo esgotado, um erro de programação ainda é propagado."""
+    future = concurrent.futures.Future()
+    future.set_exception(error)
+    cancelled_stages = []
+
+    if cancelled:
+        assert tasks._stage_result("llm", future, Deadline(0), cancelled_stages) is None
+        assert cancelled_stages == ["llm"]
+    else:
+        with pytest.raises(type(error)):
+            tasks._stage_result("llm", future, Deadline(0), cancelled_stages)
+        assert cancelled_stages == []
@@ -0,0 +1,118 @@
+"""Testes para os relatórios pré-serializados e o renderer com orjson."""
+
+import json
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory
+from django.utils.translation import gettext_lazy
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from analysis.authentication import ApiKeyIdentity, ApiKeyUser
+from analysis.renderers import FastJSONRenderer
+from analysis.util.fastjson import RawJSON, decode_report, dumps, encode_report, raw_report
+from analysis.view import analysis_batch, analysis_view, async_views
+
+REPORT = {"final_veredict": "CONFIE", "firecrawl_data": {"content": "ação \x00 \"aspas\""}}
+URL = "https://exemplo.com/noticia"
+
+
+def test_raw_json_entra_sem_ser_reprocessado():
+    """Testa que bytes RawJSON são copiados como estão, em qualquer profundidade."""
+    stored = encode_report(REPORT)
+
+    body = dumps({"results": [{"r": RawJSON(stored)}, {"r": RawJSON(b"[1]")}], "n": 2})
+
+    assert stored in body
+    assert json.loads(body) == {"results": [{"r": REPORT}, {"r": [1]}], "n": 2}
+
+
+def test_marcador_no_conteudo_nao_e_trocado():
+    """Testa que texto parecido com o marcador interno continua sendo texto."""
+    data = {"content": "\x00rawjson-00000000:0", "r": RawJSON(b"{}")}
+
+    assert json.loads(dumps(data)) == {"content": "\x00rawjson-00000000:0", "r": {}}
+
+
+def test_dumps_aceita_tipos_do_django():
+    """Testa que lazy strings e Decimal saem como texto, como no renderer do DRF."""
+    assert json.loads(dumps({"msg": gettext_lazy("ok"), "v": Decimal("1.5")})) == {
+        "msg": "ok",
+        "v": "1.5",
+    }
+
+
+def test_entradas_antigas_em_dict_continuam_validas():
+    """Testa que relatórios gravados como dict antes da mudança ainda são servidos."""
+    assert raw_report(REPORT) is REPORT
+    assert decode_report(REPORT) is REPORT
+    assert decode_report(encode_report(REPORT)) == REPORT
+
+
+def test_renderer_repassa_relatorio_pre_serializado():
+    """Testa que o renderer não decodifica os bytes guardados pelo worker."""
+    stored = encode_report(REPORT)
+
+    assert FastJSONRenderer().render(RawJSON(stored)) == stored
+    assert FastJSONRenderer().render(None) == b""
+
+
+@pytest.fixture
+def cached(mocker):
+    mocker.patch.object(analysis_view.AnalysisTriggerView, "throttle_classes", [])
+    mocker.patch.object(analysis_view, "record_request")
+    cache = mocker.patch.object(analysis_view, "cache")
+    cache.get.return_value = encode_report(REPORT)
+    return cache
+
+
+def test_cache_hit_responde_com_os_bytes_do_cache(cached):
+    """Testa que o cache hit embute o relatório guardado byte a byte."""
+    request = APIRequestFactory().post("/api/v1/analysis/", {"url": URL}, format="json")
+
+    response = analysis_view.AnalysisTriggerView.as_view()(request)
+    response.render()
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/json"
+    assert encode_report(REPORT) in response.content
+    assert json.loads(response.content)["final_report"] == REPORT
+
+
+def test_cache_hit_assincrono_responde_com_os_bytes_do_cache(mocker):
+    """Testa o mesmo caminho na view ASGI."""
+    mocker.patch.object(async_views, "aconsume_quota", return_value=None)
+    mocker.patch.object(async_views, "arecord_request")
+    mocker.patch.object(async_views, "arefresh_generations")
+    mocker.patch.object(async_views, "aget_cached", return_value=encode_report(REPORT))
+    request = AsyncRequestFactory().post(
+        "/api/v1/analysis/", json.dumps({"url": URL}), content_type="application/json"
+    )
+
+    response = async_to_sync(async_views.AsyncAnalysisTriggerView.as_view())(request)
+
+    assert response.status_code == 200
+    assert json.loads(response.content)["final_report"] == REPORT
+
+
+def test_lote_embute_os_relatorios_em_cache(mocker):
+    """Testa que o lote monta a resposta com os bytes de cada relatório."""
+    mocker.patch.object(analysis_batch.AnalysisBatchView, "throttle_classes", [])
+    cache = mocker.patch.object(analysis_batch, "cache")
+    cache.get_many.side_effect = lambda keys: {key: encode_report(REPORT) for key in keys}
+    mocker.patch.object(
+        analysis_batch, "enqueue_analysis", return_value=SimpleNamespace(id="t")
+    )
+    request = APIRequestFactory().post(
+        "/api/v1/analysis/batch/", {"urls": [URL, "https://outra.com/"]}, format="json"
+    )
+    identity = ApiKeyIdentity(id=7, name="integrador", tier="partner")
+    force_authenticate(request, user=ApiKeyUser(identity), token=identity)
+
+    response = analysis_batch.AnalysisBatchView.as_view()(request)
+    response.render()
+
+    results = json.loads(response.content)["results"]
+    assert [r["final_report"] for r in results] == [REPORT, REPORT]
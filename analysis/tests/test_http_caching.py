@@ -0,0 +1,158 @@
+"""Testes para ETag, If-None-Match e Cache-Control no status da análise."""
+
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, override_settings
+from rest_framework.test import APIRequestFactory
+
+from analysis import tasks
+from analysis.caching import etag_matches, report_etag, store_report_etag
+from analysis.view import analysis_status, async_views
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REPORT = {"final_veredict": "CONFIE", "firecrawl_data": {"content": "texto " * 500}}
+
+
+@pytest.fixture(autouse=True)
+def local_cache():
+    with override_settings(CACHES=LOCMEM, STATUS_CACHE_MAX_AGE=600):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+@pytest.fixture
+def celery_result(mocker):
+    mocker.patch.object(analysis_status.AnalysisStatusView, "throttle_classes", [])
+    result_class = mocker.patch.object(analysis_status, "AsyncResult")
+    task = result_class.return_value
+    task.id, task.state, task.result = "task-1", "SUCCESS", REPORT
+    return result_class
+
+
+def _get(**headers):
+    request = APIRequestFactory().get("/api/v1/analysis/status/task-1", headers=headers)
+    return analysis_status.AnalysisStatusView.as_view()(request, task_id="task-1")
+
+
+def test_report_etag_e_estavel_e_forte():
+    """Testa que o ETag depende só do conteúdo, não da ordem das chaves."""
+    etag = report_etag({"a": 1, "b": [1, 2]})
+
+    assert etag == report_etag({"b": [1, 2], "a": 1})
+    assert etag != report_etag({"a": 2, "b": [1, 2]})
+    assert etag.startswith('"') and not etag.startswith("W/")
+
+
+@pytest.mark.parametrize(
+    "header, matches",
+    [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"xyz", "abc"', True),
+        ("*", True),
+        ('"xyz"', False),
+        (None, False),
+    ],
+)
+def test_etag_matches(header, matches):
+    """Testa a comparação fraca do If-None-Match, com listas e curinga."""
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_status_concluido_tem_etag_e_cache_control(celery_result):
+    """Testa que o relatório concluído sai com ETag e cache público imutável."""
+    response = _get()
+
+    assert response.status_code == 200
+    assert response["ETag"] == report_etag(REPORT)
+    assert "max-age=600" in response["Cache-Control"]
+    assert "immutable" in response["Cache-Control"]
+
+
+def test_status_pendente_nao_e_guardado(celery_result):
+    """Testa que estados intermediários não podem ser guardados por CDNs."""
+    celery_result.return_value.state = "PENDING"
+
+    response = _get()
+
+    assert response.status_code == 200
+    assert not response.has_header("ETag")
+    assert response["Cache-Control"] == "no-store"
+
+
+def test_if_none_match_responde_304_sem_carregar_o_relatorio(celery_result):
+    """Testa que o ETag guardado pelo worker evita ler o backend do Celery."""
+    etag = store_report_etag("task-1", REPORT)
+
+    response = _get(if_none_match=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert not response.content
+    celery_result.assert_not_called()
+
+
+def test_if_none_match_sem_etag_guardado_calcula_do_relatorio(celery_result):
+    """Testa que, sem o ETag no cache, o 304 ainda sai comparando o hash do relatório."""
+    response = _get(if_none_match=report_etag(REPORT))
+
+    assert response.status_code == 304
+
+
+def test_etag_diferente_devolve_o_relatorio(celery_result):
+    """Testa que um ETag antigo recebe o corpo completo."""
+    store_report_etag("task-1", REPORT)
+
+    response = _get(if_none_match='"antigo"')
+
+    assert response.status_code == 200
+    assert response.data["result"] == REPORT
+
+
+def test_task_guarda_o_etag_ao_concluir(mocker):
+    """Testa que o worker grava o ETag do relatório pelo id da task."""
+    mocker.patch.object(tasks, "_run_full_analysis", return_value=REPORT)
+
+    with override_settings(PROFILE_SAMPLE_RATE=0):
+        tasks.run_full_analysis_task.apply(args=("https://exemplo.com", "k"), task_id="t-9")
+
+    assert cache.get("etag:t-9") == report_etag(REPORT)
+
+
+def test_status_assincrono_responde_304(mocker):
+    """Testa que a view ASGI revalida pelo ETag sem ler o meta da task."""
+    etag = report_etag(REPORT)
+    mocker.patch.object(async_views, "aconsume_quota", return_value=None)
+    mocker.patch.object(async_views, "aget_cached", return_value=etag)
+    meta = mocker.patch.object(async_views, "aget_task_meta")
+    request = AsyncRequestFactory().get(
+        "/api/v1/analysis/status/task-1", headers={"If-None-Match": etag}
+    )
+
+    response = async_to_sync(async_views.AsyncAnalysisStatusView.as_view())(
+        request, task_id="task-1"
+    )
+
+    assert response.status_code == 304
+    meta.assert_not_awaited()
+
+
+def test_status_assincrono_concluido_tem_etag(mocker):
+    """Testa que a view ASGI marca o relatório concluído com ETag."""
+    mocker.patch.object(async_views, "aconsume_quota", return_value=None)
+    mocker.patch.object(async_views, "aget_cached", return_value=None)
+    mocker.patch.object(
+        async_views, "aget_task_meta", return_value={"status": "SUCCESS", "result": REPORT}
+    )
+    request = AsyncRequestFactory().get("/api/v1/analysis/status/task-1")
+
+    response = async_to_sync(async_views.AsyncAnalysisStatusView.as_view())(
+        request, task_id="task-1"
+    )
+
+    assert response["ETag"] == report_etag(REPORT)
+    assert json.loads(response.content)["result"] == REPORT
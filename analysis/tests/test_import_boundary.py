@@ -0,0 +1,38 @@
+"""Testes para a fronteira de imports entre o processo web e os workers."""
+
+import pytest
+
+from analysis import services
+from benchmarks.import_time import measure_startup, parse_importtime, worker_only_imports
+
+
+@pytest.mark.parametrize("entrypoint", ["wsgi", "asgi"])
+def test_processo_web_nao_importa_sdks_dos_provedores(entrypoint):
+    """Testa que subir o web (apps, URLs e views) não carrega genai/firecrawl."""
+    startup = measure_startup(entrypoint)
+
+    assert worker_only_imports(startup["modules"]) == []
+    assert "analysis.dispatch" in startup["modules"]
+
+
+def test_services_carrega_provedor_no_primeiro_acesso():
+    """Testa que os nomes exportados continuam acessíveis pelo pacote."""
+    from analysis.services.ai_llm import analyze_with_llm
+
+    assert services.analyze_with_llm is analyze_with_llm
+    with pytest.raises(AttributeError):
+        services.nao_existe
+
+
+def test_parse_importtime():
+    """Testa a leitura das linhas do -X importtime."""
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        300 | django\n"
+        "import time:       180 |        180 |   django.utils\n"
+    )
+
+    assert parse_importtime(stderr) == {
+        "django": (120, 300, 0),
+        "django.utils": (180, 180, 1),
+    }
@@ -0,0 +1,167 @@
+"""Testes para as métricas por etapa do pipeline e o acesso ao /metrics."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.test import RequestFactory
+from prometheus_client import REGISTRY
+from rest_framework.exceptions import APIException
+
+from analysis.metrics import (
+    error_kind,
+    memory_tracker,
+    record_cache,
+    record_queue_wait,
+    render_metrics,
+    stage_timer,
+    timed,
+)
+from analysis.services.exceptions import (
+    ProviderRateLimited,
+    ProviderTransientError,
+    provider_error_for_status,
+)
+from analysis.view.metrics import metrics_view
+
+
+def _sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0
+
+
+def test_stage_timer_registra_duracao_no_relatorio_e_histograma():
+    """Testa que a etapa é cronometrada no dicionário do relatório e no Prometheus."""
+    timings = {}
+    before = _sample("factshield_stage_duration_seconds_count", {"stage": "firecrawl"})
+
+    with stage_timer("firecrawl", timings):
+        time.sleep(0.01)
+
+    assert timings["firecrawl"] >= 0.01
+    assert (
+        _sample("factshield_stage_duration_seconds_count", {"stage": "firecrawl"})
+        == before + 1
+    )
+
+
+@pytest.mark.parametrize(
+    "exc, kind",
+    [
+        (ProviderRateLimited("429"), "rate_limited"),
+        (ProviderTransientError("503"), "transient"),
+        (APIException("400"), "error"),
+    ],
+    ids=["rate_limited", "transient", "error"],
+)
+def test_timed_conta_erros_por_provedor(exc, kind):
+    """Testa que falhas das etapas são contadas por provedor e tipo."""
+    labels = {"provider": "virustotal", "kind": kind}
+    before = _sample("factshield_provider_errors_total", labels)
+
+    def falha(url):
+        raise exc
+
+    timings = {}
+    with pytest.raises(type(exc)):
+        timed("vt_submit", falha, timings)("http://example.com")
+
+    assert _sample("factshield_provider_errors_total", labels) == before + 1
+    assert "vt_submit" in timings
+
+
+def test_record_cache_e_fila():
+    """Testa os contadores de cache e o histograma de espera na fila."""
+    hits = _sample("factshield_cache_requests_total", {"result": "hit"})
+    misses = _sample("factshield_cache_requests_total", {"result": "miss"})
+
+    record_cache(hit=True)
+    record_cache(hit=False)
+    wait = record_queue_wait(time.time() - 2)
+
+    assert _sample("factshield_cache_requests_total", {"result": "hit"}) == hits + 1
+    assert _sample("factshield_cache_requests_total", {"result": "miss"}) == misses + 1
+    assert 2 <= wait < 3
+    assert record_queue_wait(None) is None
+
+
+@pytest.mark.parametrize(
+    "status_code, expected",
+    [
+        (429, ProviderRateLimited),
+        (500, ProviderTransientError),
+        (408, ProviderTransientError),
+        (403, APIException),
+    ],
+)
+def test_provider_error_for_status(status_code, expected):
+    """Testa a classificação dos status HTTP dos provedores."""
+    exc = provider_error_for_status(status_code, "Erro na API: x")
+
+    assert type(exc) is expected
+    assert error_kind(exc) in ("rate_limited", "transient", "error")
+
+
+def test_render_metrics():
+    """Testa a exposição no formato texto do Prometheus."""
+    body, content_type = render_metrics()
+
+    assert b"factshield_stage_duration_seconds" in body
+    assert content_type.startswith("text/plain")
+
+
+def test_memory_tracker_registra_pico_de_alocacao():
+    """Testa que o pico do tracemalloc e o crescimento de RSS são medidos."""
+    before = _sample("factshield_task_peak_memory_bytes_count")
+
+    with memory_tracker(trace_allocations=True) as usage:
+        buffer = bytearray(5 * 1024 * 1024)
+        del buffer
+
+    assert usage["peak_bytes"] >= 5 * 1024 * 1024
+    assert usage["rss_growth_bytes"] >= 0
+    assert _sample("factshield_task_peak_memory_bytes_count") == before + 1
+
+
+def test_memory_tracker_sem_tracemalloc_mede_apenas_rss():
+    """Testa que, sem tracemalloc, só o RSS é registrado."""
+    with memory_tracker() as usage:
+        pass
+
+    assert "peak_bytes" not in usage
+    assert "rss_growth_bytes" in usage
+
+
+@pytest.fixture
+def metrics_access(settings):
+    settings.METRICS_TOKEN = "token-do-prometheus"
+    settings.METRICS_ALLOWED_IPS = ["10.0.0.9"]
+
+
+@pytest.mark.parametrize(
+    "headers, remote_addr, staff, status_code",
+    [
+        ({}, "203.0.113.7", False, 403),
+        ({"Authorization": "Bearer errado"}, "203.0.113.7", False, 403),
+        ({"Authorization": "Bearer token-do-prometheus"}, "203.0.113.7", False, 200),
+        ({}, "10.0.0.9", False, 200),
+        ({}, "203.0.113.7", True, 200),
+    ],
+    ids=["anonimo", "token_errado", "token", "ip_liberado", "staff"],
+)
+def test_metrics_view_exige_token_ip_ou_staff(
+    metrics_access, headers, remote_addr, staff, status_code
+):
+    """Testa que o /metrics não fica aberto para qualquer um."""
+    request = RequestFactory().get("/metrics", headers=headers, REMOTE_ADDR=remote_addr)
+    request.user = SimpleNamespace(is_active=True, is_staff=staff)
+
+    assert metrics_view(request).status_code == status_code
+
+
+def test_metrics_sem_token_configurado_nao_aceita_bearer_vazio(settings):
+    """Testa que um METRICS_TOKEN vazio não libera "Bearer " sem valor."""
+    settings.METRICS_TOKEN = ""
+    settings.METRICS_ALLOWED_IPS = []
+    request = RequestFactory().get("/metrics", headers={"Authorization": "Bearer "})
+
+    assert metrics_view(request).status_code == 403
@@ -0,0 +1,152 @@
+"""Testes para as filas de prioridade e o endpoint de lote."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from rest_framework.test import APIClient
+
+from analysis import dispatch, tasks, throttling
+from analysis.authentication import ApiKeyIdentity, ApiKeyUser
+from analysis.caching import report_cache_key
+from analysis.view import analysis_batch
+
+IDENTITY = ApiKeyIdentity(id=7, name="integrador", tier="partner")
+
+
+@pytest.fixture
+def send_task(mocker):
+    return mocker.patch.object(
+        dispatch.current_app, "send_task", return_value=SimpleNamespace(id="task-1")
+    )
+
+
+@pytest.mark.parametrize("lane", ["interactive", "bulk"])
+def test_enqueue_analysis_roteia_pela_fila_da_prioridade(send_task, lane, settings):
+    """Testa que cada prioridade vai para a sua fila."""
+    dispatch.enqueue_analysis("https://exemplo.com", "chave", lane=lane)
+
+    args, kwargs = send_task.call_args
+    assert args[0] == tasks.run_full_analysis_task.name
+    assert kwargs["queue"] == settings.ANALYSIS_QUEUES[lane]
+    assert kwargs["args"] == ("https://exemplo.com", "chave")
+    assert kwargs["kwargs"]["profile"] is False
+
+
+def test_reputacao_em_background_vai_para_a_fila_bulk(settings):
+    """Testa que o refresh de reputação não ocupa os workers interativos."""
+    route = settings.CELERY_TASK_ROUTES["analysis.tasks.refresh_domain_reputation_task"]
+    assert route["queue"] == settings.ANALYSIS_QUEUES["bulk"]
+    assert settings.CELERY_TASK_DEFAULT_QUEUE == settings.ANALYSIS_QUEUES["interactive"]
+
+
+def test_aquecimento_do_cache_vai_para_a_fila_bulk(mocker, settings):
+    """Testa que o job do beat e as reanálises que ele agenda não ocupam a fila interativa."""
+    route = settings.CELERY_TASK_ROUTES["analysis.tasks.warm_popular_reports_task"]
+    assert route["queue"] == settings.ANALYSIS_QUEUES["bulk"]
+
+    mocker.patch.object(tasks, "decay_popularity")
+    mocker.patch.object(tasks, "reports_to_warm", return_value=[("https://a.com", "chave-a")])
+    enqueue = mocker.patch.object(tasks, "enqueue_analysis")
+
+    assert tasks.warm_popular_reports_task() == 1
+    enqueue.assert_called_once_with("https://a.com", "chave-a", lane="bulk")
+
+
+@pytest.fixture
+def batch(mocker):
+    mocker.patch.object(analysis_batch.AnalysisBatchView, "throttle_classes", [])
+    cache = mocker.patch.object(analysis_batch, "cache")
+    cache.get_many.return_value = {
+        report_cache_key("https://cache.com"): {"final_veredict": "CONFIE"}
+    }
+    enqueue = mocker.patch.object(
+        analysis_batch, "enqueue_analysis", return_value=SimpleNamespace(id="task-9")
+    )
+    return SimpleNamespace(cache=cache, enqueue=enqueue)
+
+
+def _post(data, identity=IDENTITY):
+    client = APIClient()
+    if identity is not None:
+        client.force_authenticate(user=ApiKeyUser(identity), token=identity)
+    return client.post("/api/v1/analysis/batch/", data, format="json", HTTP_HOST="localhost")
+
+
+def test_batch_enfileira_na_fila_bulk(batch):
+    """Testa que URLs novas vão para a fila bulk e as em cache voltam direto."""
+    response = _post(
+        {"urls": ["https://nova.com", "https://cache.com", "invalida", "https://nova.com"]}
+    )
+
+    assert response.status_code == 202
+    assert [r["status"] for r in response.data["results"]] == [
+        "queued",
+        "cached",
+        "invalid",
+        "queued",
+    ]
+    assert response.data["results"][1]["final_report"] == {"final_veredict": "CONFIE"}
+    batch.enqueue.assert_called_once_with(
+        "https://nova.com",
+        report_cache_key("https://nova.com"),
+        lane="bulk",
+        callback_url=None,
+        api_key_id=IDENTITY.id,
+    )
+    batch.cache.get_many.assert_called_once()
+
+
+def test_batch_rejeita_lote_grande_demais(batch, settings):
+    """Testa o limite de URLs por lote."""
+    settings.BATCH_MAX_URLS = 2
+
+    response = _post({"urls": ["https://a.com", "https://b.com", "https://c.com"]})
+
+    assert response.status_code == 400
+    batch.enqueue.assert_not_called()
+
+
+def test_batch_exige_lista(batch):
+    """Testa que o corpo precisa de uma lista de URLs."""
+    assert _post({"urls": "https://a.com"}).status_code == 400
+
+
+def test_batch_exige_chave_de_api(batch):
+    """Testa que o lote recusa chamadas anônimas sem enfileirar nada."""
+    response = _post({"urls": ["https://a.com"]}, identity=None)
+
+    assert response.status_code == 401
+    batch.enqueue.assert_not_called()
+
+
+@pytest.fixture
+def quota(mocker, batch):
+    """Cota de verdade no lote, com o script Lua falso."""
+    mocker.patch.object(
+        analysis_batch.AnalysisBatchView, "throttle_classes", [throttling.BatchQuotaThrottle]
+    )
+    fake = MagicMock(return_value=[1, 10, b"30"])
+    mocker.patch.object(throttling, "_sliding_window_script", return_value=fake)
+    return fake
+
+
+def test_batch_desconta_uma_unidade_da_cota_por_url(quota, settings):
+    """Testa que o custo do lote na cota é o número de URLs."""
+    settings.API_QUOTA_TIERS = {**settings.API_QUOTA_TIERS, "partner": "50/min"}
+
+    response = _post({"urls": ["https://a.com", "https://b.com", "https://c.com"]})
+
+    assert response.status_code == 202
+    quota.assert_called_once_with(keys=["quota:{key:7}"], args=[50, 60, 3])
+
+
+def test_batch_acima_da_cota_retorna_429(quota, batch):
+    """Testa que um lote maior que o saldo da cota é recusado sem enfileirar nada."""
+    quota.return_value = [0, 0, b"12.5"]
+
+    response = _post({"urls": ["https://a.com", "https://b.com"]})
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "13"
+    batch.enqueue.assert_not_called()
@@ -0,0 +1,167 @@
+"""Testes para o profiling amostral das análises."""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from django.test import RequestFactory, override_settings
+
+from analysis.authentication import ApiKeyIdentity
+from analysis.util import profiling
+from analysis.util.profiling import (
+    SamplingProfiler,
+    profile_requested,
+    profile_task,
+    should_profile,
+    task_thread_prefix,
+)
+
+
+def _busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def storage(mocker):
+    """Cache e Redis falsos para os profiles."""
+    stored = {}
+    cache = mocker.patch.object(profiling, "cache")
+    cache.set.side_effect = lambda key, value, timeout: stored.__setitem__(key, value)
+    cache.get.side_effect = stored.get
+    mocker.patch.object(profiling, "get_redis_connection")
+    return stored
+
+
+def test_sampling_profiler_gera_pilhas_collapsed():
+    """Testa que as amostras saem no formato 'frame;frame;frame contagem'."""
+    with SamplingProfiler(interval=0.001) as profiler:
+        _busy_loop(0.1)
+
+    assert profiler.sample_count > 0
+    line = next(entry for entry in profiler.collapsed().splitlines() if "_busy_loop" in entry)
+    stack, count = line.rsplit(" ", 1)
+    assert int(count) > 0
+    assert stack.startswith("MainThread;")
+    assert "test_profiling:_busy_loop" in stack.split(";")
+
+
+def test_sampling_profiler_ignora_a_propria_thread():
+    """Testa que a thread do profiler não aparece nas amostras."""
+    with SamplingProfiler(interval=0.001) as profiler:
+        _busy_loop(0.05)
+
+    assert "factshield-profiler" not in profiler.collapsed()
+
+
+def test_sampling_profiler_so_amostra_as_threads_da_task():
+    """Testa que threads de outras tasks do mesmo worker ficam fora do profile."""
+    owner = threading.get_ident()
+    helper = threading.Thread(
+        target=_busy_loop, args=(0.1,), name=f"{task_thread_prefix(owner)}_0"
+    )
+    other = threading.Thread(target=_busy_loop, args=(0.1,), name="outra-task")
+
+    with SamplingProfiler(interval=0.001, owner=owner) as profiler:
+        helper.start(), other.start()
+        _busy_loop(0.1)
+        helper.join(), other.join()
+
+    threads = {line.split(";", 1)[0] for line in profiler.collapsed().splitlines()}
+    assert threads == {"MainThread", helper.name}
+
+
+def test_sampling_profiler_nao_confunde_tasks_com_o_mesmo_inicio():
+    """Testa que o prefixo da task 12 não casa com as threads da task 123."""
+    owner = threading.get_ident()
+    other = threading.Thread(
+        target=_busy_loop, args=(0.1,), name=f"{task_thread_prefix(owner)}1_0"
+    )
+
+    with SamplingProfiler(interval=0.001, owner=owner) as profiler:
+        other.start()
+        _busy_loop(0.1)
+        other.join()
+
+    threads = {line.split(";", 1)[0] for line in profiler.collapsed().splitlines()}
+    assert threads == {"MainThread"}
+
+
+@pytest.mark.parametrize(
+    "headers, auth, staff, expected",
+    [
+        ({}, ApiKeyIdentity(1, "parceiro", "partner"), False, False),
+        ({"X-FactShield-Profile": "1"}, None, False, False),
+        ({"X-FactShield-Profile": "1"}, ApiKeyIdentity(1, "parceiro", "partner"), False, True),
+        ({"X-FactShield-Profile": "1"}, None, True, True),
+    ],
+    ids=["sem_header", "anonimo", "chave_de_api", "staff"],
+)
+def test_header_de_profiling_so_vale_para_chave_ou_staff(headers, auth, staff, expected):
+    """Testa que anônimos não conseguem forçar o profiling nos workers."""
+    request = RequestFactory().get("/", headers=headers)
+    request.auth = auth
+    user = SimpleNamespace(is_active=True, is_staff=staff)
+
+    assert profile_requested(request, user) is expected
+
+
+@override_settings(PROFILE_SAMPLE_RATE=0.0)
+def test_should_profile_respeita_header_e_taxa():
+    """Testa que o header força o profiling mesmo com taxa de amostragem zero."""
+    assert should_profile(force=True)
+    assert not should_profile()
+
+    with override_settings(PROFILE_SAMPLE_RATE=1.0):
+        assert should_profile()
+
+
+@override_settings(PROFILE_SAMPLE_RATE=0.0, PROFILE_INTERVAL=0.001)
+def test_profile_task_salva_profile_quando_forcado(storage):
+    """Testa que a task forçada tem as pilhas salvas e indexadas."""
+    with profile_task("task-1", "https://exemplo.com", force=True) as profiler:
+        _busy_loop(0.05)
+
+    assert profiler is not None
+    profile = profiling.get_profile("task-1")
+    assert profile["url"] == "https://exemplo.com"
+    assert profile["samples"] > 0
+    assert "_busy_loop" in profile["collapsed"]
+    pipe = profiling.get_redis_connection.return_value.pipeline.return_value
+    pipe.lpush.assert_called_once_with(profiling.PROFILE_INDEX_KEY, "task-1")
+
+
+@override_settings(PROFILE_SAMPLE_RATE=0.0)
+def test_profile_task_nao_perfila_fora_da_amostra(storage):
+    """Testa que, fora da amostra, nada é medido nem salvo."""
+    with profile_task("task-2", "https://exemplo.com") as profiler:
+        pass
+
+    assert profiler is None
+    assert storage == {}
+
+
+def test_profile_endpoint_exige_admin(client):
+    """Testa que os profiles só são servidos para administradores."""
+    response = client.get("/api/v1/profiles/task-1", HTTP_HOST="localhost")
+
+    assert response.status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_profile_endpoint_serve_collapsed_para_admin(admin_client, storage):
+    """Testa que o admin recebe as pilhas em texto para o flamegraph."""
+    storage[profiling.PROFILE_KEY.format(task_id="task-1")] = {
+        "task_id": "task-1",
+        "collapsed": "MainThread;a:b 3",
+    }
+
+    response = admin_client.get(
+        "/api/v1/profiles/task-1?output=collapsed", HTTP_HOST="localhost"
+    )
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    assert response.content == b"MainThread;a:b 3"
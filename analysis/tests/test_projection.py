@@ -0,0 +1,178 @@
+"""Testes para a projeção de campos (?fields= / ?exclude=) nos endpoints."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from analysis.authentication import ApiKeyIdentity, ApiKeyUser
+from analysis.caching import report_etag, store_report_etag
+from analysis.util.fastjson import encode_report
+from analysis.util.projection import Projection
+from analysis.view import analysis_batch, analysis_status, analysis_view
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+URL = "https://exemplo.com/noticia"
+REPORT = {
+    "final_veredict": "CONFIE",
+    "llm_analysis": {"llm_recommendation": "CONFIE", "llm_summary": "Resumo"},
+    "firecrawl_data": {"url": URL, "content": "texto " * 200},
+    "fact_check_report": {"claims": [{"text": "a", "rating": "Falso"}, {"text": "b"}]},
+}
+
+
+def _projection(**params):
+    return Projection.from_params(params)
+
+
+def test_fields_seleciona_campos_aninhados():
+    """Testa que fields mantém só os caminhos pedidos, descendo por pontos."""
+    projected = _projection(fields="final_veredict,llm_analysis.llm_recommendation").apply(REPORT)
+
+    assert projected == {
+        "final_veredict": "CONFIE",
+        "llm_analysis": {"llm_recommendation": "CONFIE"},
+    }
+
+
+def test_exclude_remove_sem_alterar_o_original():
+    """Testa que exclude tira o conteúdo do artigo sem mexer no relatório de origem."""
+    projected = _projection(exclude="firecrawl_data.content").apply(REPORT)
+
+    assert projected["firecrawl_data"] == {"url": URL}
+    assert "content" in REPORT["firecrawl_data"]
+
+
+def test_projecao_vale_para_cada_item_de_lista():
+    """Testa que o caminho é aplicado a cada objeto de uma lista."""
+    projected = _projection(fields="fact_check_report.claims.rating").apply(REPORT)
+
+    assert projected == {"fact_check_report": {"claims": [{"rating": "Falso"}, {}]}}
+
+
+def test_campo_inteiro_vence_caminho_mais_fundo():
+    """Testa que pedir "a" e "a.b" devolve "a" inteiro."""
+    projected = _projection(fields="llm_analysis.llm_summary,llm_analysis").apply(REPORT)
+
+    assert projected == {"llm_analysis": REPORT["llm_analysis"]}
+
+
+def test_projecao_decodifica_relatorio_pre_serializado():
+    """Testa que a projeção funciona sobre os bytes guardados pelo worker."""
+    projected = _projection(fields="final_veredict").apply(encode_report(REPORT))
+
+    assert projected == {"final_veredict": "CONFIE"}
+
+
+def test_sem_parametros_o_relatorio_segue_intacto():
+    """Testa que, sem projeção, os bytes do cache não são decodificados."""
+    stored = encode_report(REPORT)
+    projection = _projection()
+
+    assert not projection
+    assert projection.apply(stored) is stored
+    assert projection.etag('"abc"') == '"abc"'
+
+
+@pytest.mark.parametrize("params", [{"fields": "a..b"}, {"exclude": ".a"}])
+def test_caminho_invalido(params):
+    """Testa que caminhos com segmentos vazios são recusados."""
+    with pytest.raises(ValueError):
+        Projection.from_params(params)
+
+
+def test_etag_muda_com_a_projecao():
+    """Testa que cada projeção tem ETag próprio e estável, independente da ordem."""
+    a = _projection(fields="x,y").etag('"abc"')
+
+    assert a != '"abc"'
+    assert a == _projection(fields="y,x").etag('W/"abc"')
+    assert a != _projection(exclude="x,y").etag('"abc"')
+
+
+@pytest.fixture
+def cached(mocker):
+    mocker.patch.object(analysis_view.AnalysisTriggerView, "throttle_classes", [])
+    mocker.patch.object(analysis_view, "record_request")
+    mocker.patch.object(analysis_view, "cache").get.return_value = encode_report(REPORT)
+
+
+def _trigger(query=""):
+    request = APIRequestFactory().post(f"/api/v1/analysis/{query}", {"url": URL}, format="json")
+    response = analysis_view.AnalysisTriggerView.as_view()(request)
+    response.render()
+    return response
+
+
+def test_disparo_aplica_fields_no_cache_hit(cached):
+    """Testa que o cache hit devolve só os campos pedidos."""
+    response = _trigger("?fields=final_veredict")
+
+    assert json.loads(response.content)["final_report"] == {"final_veredict": "CONFIE"}
+
+
+def test_disparo_recusa_projecao_invalida(cached):
+    """Testa que uma projeção malformada responde 400."""
+    assert _trigger("?fields=a..b").status_code == 400
+
+
+def test_lote_aplica_exclude(mocker):
+    """Testa que o lote projeta cada relatório em cache."""
+    mocker.patch.object(analysis_batch.AnalysisBatchView, "throttle_classes", [])
+    mocker.patch.object(analysis_batch, "cache").get_many.side_effect = lambda keys: {
+        key: encode_report(REPORT) for key in keys
+    }
+    mocker.patch.object(analysis_batch, "enqueue_analysis", return_value=SimpleNamespace(id="t"))
+    request = APIRequestFactory().post(
+        "/api/v1/analysis/batch/?exclude=firecrawl_data", {"urls": [URL]}, format="json"
+    )
+    identity = ApiKeyIdentity(id=7, name="integrador", tier="partner")
+    force_authenticate(request, user=ApiKeyUser(identity), token=identity)
+
+    response = analysis_batch.AnalysisBatchView.as_view()(request)
+    response.render()
+
+    report = json.loads(response.content)["results"][0]["final_report"]
+    assert "firecrawl_data" not in report
+    assert report["final_veredict"] == "CONFIE"
+
+
+@pytest.fixture
+def celery_result(mocker):
+    mocker.patch.object(analysis_status.AnalysisStatusView, "throttle_classes", [])
+    result_class = mocker.patch.object(analysis_status, "AsyncResult")
+    task = result_class.return_value
+    task.id, task.state, task.result = "task-1", "SUCCESS", REPORT
+    with override_settings(CACHES=LOCMEM):
+        cache.clear()
+        yield result_class
+        cache.clear()
+
+
+def _status(query="", **headers):
+    request = APIRequestFactory().get(f"/api/v1/analysis/status/task-1{query}", headers=headers)
+    response = analysis_status.AnalysisStatusView.as_view()(request, task_id="task-1")
+    if response.status_code == 200:
+        response.render()
+    return response
+
+
+def test_status_projetado_tem_etag_proprio(celery_result):
+    """Testa que o status projetado não reaproveita o ETag do relatório inteiro."""
+    response = _status("?fields=final_veredict")
+
+    assert json.loads(response.content)["result"] == {"final_veredict": "CONFIE"}
+    assert response["ETag"] == _projection(fields="final_veredict").etag(report_etag(REPORT))
+
+
+def test_status_projetado_responde_304_sem_carregar_o_relatorio(celery_result):
+    """Testa que a revalidação da projeção também só lê o ETag guardado."""
+    etag = store_report_etag("task-1", REPORT)
+    projected = _projection(fields="final_veredict").etag(etag)
+
+    assert _status("?fields=final_veredict", if_none_match=projected).status_code == 304
+    assert _status("?fields=final_veredict", if_none_match=etag).status_code == 200
+    assert celery_result.call_count == 1
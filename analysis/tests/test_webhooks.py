@@ -0,0 +1,290 @@
+"""Testes para os webhooks de conclusão: validação, assinatura e entrega."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.exceptions import APIException
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from analysis import tasks, webhooks
+from analysis.authentication import ApiKeyIdentity, ApiKeyUser
+from analysis.models import ApiKey
+from analysis.view import analysis_view
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+URL = "https://exemplo.com/noticia"
+CALLBACK = "https://integrador.com.br/hooks/factshield"
+SECRET = "whsec_segredo"
+IDENTITY = ApiKeyIdentity(id=7, name="integrador", tier="partner")
+
+
+@pytest.fixture(autouse=True)
+def webhook_settings():
+    with override_settings(
+        CACHES=LOCMEM,
+        WEBHOOK_ALLOW_HTTP=False,
+        WEBHOOK_MAX_RETRIES=2,
+        ANALYSIS_MAX_RETRIES=0,
+        PROFILE_SAMPLE_RATE=0,
+    ):
+        cache.clear()
+        yield
+        cache.clear()
+
+
+@pytest.mark.parametrize(
+    "callback_url, valid",
+    [
+        (None, True),
+        (CALLBACK, True),
+        ("http://integrador.com.br/hook", False),
+        ("https://localhost/hook", False),
+        ("https://api.internal/hook", False),
+        ("https://10.0.0.5/hook", False),
+        ("https://169.254.169.254/latest", False),
+        ("https://8.8.8.8/hook", True),
+        ("nao-e-url", False),
+        (123, False),
+    ],
+)
+def test_validate_callback_url(callback_url, valid):
+    """Testa que só URLs https públicas são aceitas como callback."""
+    assert (webhooks.validate_callback_url(callback_url, IDENTITY) is None) is valid
+
+
+def test_callback_url_exige_chave_de_api():
+    """Testa que chamadas anônimas não podem pedir webhooks."""
+    assert webhooks.validate_callback_url(CALLBACK, None) is not None
+    assert webhooks.validate_callback_url(None, None) is None
+
+
+@pytest.mark.django_db
+def test_segredo_e_por_chave_e_some_na_revogacao():
+    """Testa que cada chave tem o seu segredo e que a revogada não assina mais."""
+    first, _ = ApiKey.generate("a")
+    second, _ = ApiKey.generate("b")
+
+    assert webhooks.webhook_secret(first.id) == first.webhook_secret
+    assert first.webhook_secret != second.webhook_secret
+
+    ApiKey.objects.filter(pk=first.pk).update(is_active=False)
+    assert webhooks.webhook_secret(first.id) is None
+    assert webhooks.webhook_secret(None) is None
+
+
+def test_assinatura_confere_e_detecta_adulteracao():
+    """Testa que o integrador valida a assinatura e rejeita corpo alterado ou antigo."""
+    body = webhooks.encode_payload({"event": "analysis.completed"})
+    header = webhooks.signature_header(body, SECRET, timestamp=1_000)
+
+    assert webhooks.verify_signature(body, header, SECRET, now=1_010)
+    assert not webhooks.verify_signature(body + b" ", header, SECRET, now=1_010)
+    assert not webhooks.verify_signature(body, header, SECRET, now=2_000)
+    assert not webhooks.verify_signature(body, header, "outro", now=1_010)
+    assert not webhooks.verify_signature(body, "lixo", SECRET, now=1_010)
+
+
+@pytest.fixture
+def session(mocker):
+    session = mocker.Mock()
+    mocker.patch.object(webhooks, "_session", return_value=session)
+    mocker.patch.object(webhooks, "is_public_host", return_value=True)
+    return session
+
+
+@pytest.mark.parametrize(
+    "status_code, result",
+    [
+        (200, webhooks.DELIVERED),
+        (204, webhooks.DELIVERED),
+        (429, webhooks.RETRY),
+        (503, webhooks.RETRY),
+        (404, webhooks.REJECTED),
+        (301, webhooks.REJECTED),
+    ],
+)
+def test_post_webhook_classifica_a_resposta(session, status_code, result):
+    """Testa que 429 e 5xx pedem nova tentativa e os demais erros não."""
+    session.post.return_value = SimpleNamespace(status_code=status_code)
+    payload = webhooks.completion_payload("task-1", URL, report={"final_veredict": "OK"})
+
+    assert webhooks.post_webhook(CALLBACK, payload, SECRET) == (result, status_code)
+
+    kwargs = session.post.call_args.kwargs
+    assert kwargs["allow_redirects"] is False
+    header = kwargs["headers"][webhooks.SIGNATURE_HEADER]
+    assert webhooks.verify_signature(kwargs["data"], header, SECRET)
+    assert json.loads(kwargs["data"])["result"] == {"final_veredict": "OK"}
+
+
+def test_post_webhook_trata_erro_de_rede_como_temporario(session):
+    """Testa que falha de conexão vira nova tentativa, não exceção."""
+    session.post.side_effect = requests.ConnectionError("recusada")
+
+    payload = webhooks.completion_payload("t", URL, error="x")
+
+    result, detail = webhooks.post_webhook(CALLBACK, payload, SECRET)
+
+    assert result == webhooks.RETRY
+    assert "recusada" in detail
+
+
+def test_post_webhook_recusa_host_que_resolve_para_a_rede_interna(session):
+    """Testa que nomes como 127.0.0.1.nip.io são barrados na hora da entrega."""
+    webhooks.is_public_host.return_value = False
+    payload = webhooks.completion_payload("t", URL, error="x")
+
+    result, _ = webhooks.post_webhook("https://127.0.0.1.nip.io/hook", payload, SECRET)
+
+    assert result == webhooks.REJECTED
+    webhooks.is_public_host.assert_called_once_with("127.0.0.1.nip.io")
+    session.post.assert_not_called()
+
+
+@pytest.fixture
+def secret(mocker):
+    return mocker.patch.object(tasks, "webhook_secret", return_value=SECRET)
+
+
+def test_entrega_tenta_de_novo_ate_conseguir(mocker, secret):
+    """Testa que a task de entrega refaz a chamada com backoff e conta o resultado."""
+    post = mocker.patch.object(
+        tasks, "post_webhook", side_effect=[(webhooks.RETRY, 503), (webhooks.DELIVERED, 200)]
+    )
+    record = mocker.patch.object(tasks, "record_webhook")
+
+    result = tasks.deliver_webhook_task.apply(args=(CALLBACK, {"delivery_id": "d-1"}, 7))
+
+    assert result.get() == {"result": "delivered", "detail": 200, "attempts": 2}
+    assert post.call_count == 2
+    assert post.call_args.args[2] == SECRET
+    secret.assert_called_with(7)
+    assert [c.args[0] for c in record.call_args_list] == ["retry", "delivered"]
+
+
+def test_entrega_desiste_apos_o_limite(mocker, secret):
+    """Testa que a entrega para depois de WEBHOOK_MAX_RETRIES e é contada como falha."""
+    post = mocker.patch.object(tasks, "post_webhook", return_value=(webhooks.RETRY, 500))
+    record = mocker.patch.object(tasks, "record_webhook")
+
+    result = tasks.deliver_webhook_task.apply(args=(CALLBACK, {"delivery_id": "d-2"}, 7))
+
+    assert result.get()["result"] == "failed"
+    assert post.call_count == 3
+    assert record.call_args_list[-1].args == ("failed",)
+
+
+def test_entrega_rejeitada_nao_tem_retry(mocker, secret):
+    """Testa que um 4xx do integrador não é repetido."""
+    post = mocker.patch.object(tasks, "post_webhook", return_value=(webhooks.REJECTED, 410))
+    mocker.patch.object(tasks, "record_webhook")
+
+    result = tasks.deliver_webhook_task.apply(args=(CALLBACK, {"delivery_id": "d-3"}, 7))
+
+    assert result.get()["result"] == webhooks.REJECTED
+    assert post.call_count == 1
+
+
+def test_entrega_de_chave_revogada_e_descartada(mocker, secret):
+    """Testa que sem o segredo da chave nada é enviado nem repetido."""
+    secret.return_value = None
+    post = mocker.patch.object(tasks, "post_webhook")
+    mocker.patch.object(tasks, "record_webhook")
+
+    result = tasks.deliver_webhook_task.apply(args=(CALLBACK, {"delivery_id": "d-4"}, 7))
+
+    assert result.get()["result"] == webhooks.REJECTED
+    post.assert_not_called()
+
+
+@pytest.fixture
+def deliver(mocker):
+    return mocker.patch.object(tasks.deliver_webhook_task, "delay")
+
+
+def test_analise_concluida_agenda_o_webhook(mocker, deliver):
+    """Testa que a task da análise agenda a entrega com o relatório."""
+    mocker.patch.object(tasks, "_run_full_analysis", return_value={"final_veredict": "OK"})
+
+    tasks.run_full_analysis_task.apply(
+        args=(URL, "chave"),
+        kwargs={"callback_url": CALLBACK, "api_key_id": 7},
+        task_id="task-7",
+    ).get()
+
+    callback_url, payload, api_key_id = deliver.call_args.args
+    assert callback_url == CALLBACK
+    assert api_key_id == 7
+    assert payload["event"] == webhooks.EVENT_COMPLETED
+    assert payload["task_id"] == "task-7"
+    assert payload["result"] == {"final_veredict": "OK"}
+
+
+def test_analise_com_falha_agenda_o_webhook_de_erro(mocker, deliver):
+    """Testa que a falha definitiva também é avisada ao integrador."""
+    mocker.patch.object(tasks, "_run_full_analysis", side_effect=APIException("quebrou"))
+
+    result = tasks.run_full_analysis_task.apply(
+        args=(URL, "chave"), kwargs={"callback_url": CALLBACK}, task_id="task-8"
+    )
+
+    assert result.failed()
+    payload = deliver.call_args.args[1]
+    assert payload["event"] == webhooks.EVENT_FAILED
+    assert payload["error"] == "quebrou"
+
+
+def test_analise_sem_callback_nao_agenda_nada(mocker, deliver):
+    """Testa que o webhook é opcional."""
+    mocker.patch.object(tasks, "_run_full_analysis", return_value={"final_veredict": "OK"})
+
+    tasks.run_full_analysis_task.apply(args=(URL, "chave")).get()
+
+    deliver.assert_not_called()
+
+
+@pytest.fixture
+def trigger(mocker):
+    mocker.patch.object(analysis_view.AnalysisTriggerView, "throttle_classes", [])
+    mocker.patch.object(analysis_view, "record_request")
+    mocker.patch.object(analysis_view, "cache").get.return_value = None
+    return mocker.patch.object(
+        analysis_view, "enqueue_analysis", return_value=SimpleNamespace(id="task-1")
+    )
+
+
+def _post(data, identity=IDENTITY):
+    request = APIRequestFactory().post("/api/v1/analysis/", data, format="json")
+    if identity is not None:
+        force_authenticate(request, user=ApiKeyUser(identity), token=identity)
+    return analysis_view.AnalysisTriggerView.as_view()(request)
+
+
+def test_disparo_repassa_callback_url(trigger):
+    """Testa que a callback_url vai junto com a análise enfileirada, com a chave dona."""
+    response = _post({"url": URL, "callback_url": CALLBACK})
+
+    assert response.status_code == 202
+    assert response.data["callback_url"] == CALLBACK
+    assert trigger.call_args.kwargs["callback_url"] == CALLBACK
+    assert trigger.call_args.kwargs["api_key_id"] == IDENTITY.id
+
+
+def test_disparo_anonimo_nao_aceita_callback_url(trigger):
+    """Testa que sem chave de API a callback_url é recusada com 400."""
+    response = _post({"url": URL, "callback_url": CALLBACK}, identity=None)
+
+    assert response.status_code == 400
+    trigger.assert_not_called()
+
+
+def test_disparo_rejeita_callback_url_interna(trigger):
+    """Testa que uma callback_url para a rede interna é recusada com 400."""
+    response = _post({"url": URL, "callback_url": "https://127.0.0.1/hook"})
+
+    assert response.status_code == 400
+    trigger.assert_not_called()
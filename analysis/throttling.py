@@ -0,0 +1,152 @@
+import logging
+import weakref
+from functools import lru_cache
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework.throttling import BaseThrottle
+
+from analysis.authentication import ApiKeyIdentity
+from analysis.caching.async_cache import cache_redis_url, get_async_redis
+
+logger = logging.getLogger(__name__)
+
+QUOTA_KEY = "quota:{{{identity}}}"
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# Janela deslizante aproximada (contador da janela atual + fração da anterior),
+# numa única ida ao Redis. ARGV[3] é o custo da requisição (1 por padrão; o lote
+# paga uma unidade por URL). Retorna {permitido, restante, segundos até liberar}.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3] or '1')
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local index = math.floor(now / window)
+local offset = now - index * window
+local current_key = KEYS[1] .. ':' .. index
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', KEYS[1] .. ':' .. (index - 1)) or '0')
+local estimated = previous * (1 - offset / window) + current
+
+if estimated + cost > limit then
+    local wait
+    if current + cost > limit then
+        -- Só libera na próxima janela, quando a atual passa a pesar menos
+        wait = (window - offset) + window * math.max(0, 1 - (limit - cost) / math.max(current, 1))
+    else
+        wait = window * (1 - (limit - current - cost) / previous) - offset
+    end
+    return {0, 0, tostring(math.max(wait, 0))}
+end
+
+current = redis.call('INCRBY', current_key, cost)
+if current == cost then
+    redis.call('EXPIRE', current_key, window * 2)
+end
+return {1, math.floor(limit - estimated - cost), tostring(window - offset)}
+"""
+
+
+def parse_rate(rate):
+    # Mesmo formato do DRF: "5/min", "5000/m", "100/hour"
+    count, _, period = rate.partition("/")
+    return int(count), _PERIODS[period.strip()[0]]
+
+
+@lru_cache(maxsize=1)
+def _sliding_window_script():
+    return get_redis_connection("default").register_script(SLIDING_WINDOW_SCRIPT)
+
+
+_async_scripts = weakref.WeakKeyDictionary()
+
+
+def _async_sliding_window_script(client):
+    if client not in _async_scripts:
+        _async_scripts[client] = client.register_script(SLIDING_WINDOW_SCRIPT)
+    return _async_scripts[client]
+
+
+def quota_for(auth, user, ident):
+    """Identidade da cota e plano: por chave de API, usuário ou IP (anônimo)."""
+    if isinstance(auth, ApiKeyIdentity):
+        return f"key:{auth.id}", auth.tier
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}", "free"
+    return f"ip:{ident}", "anon"
+
+
+def _quota(limit, allowed, remaining, wait):
+    return {
+        "allowed": bool(allowed),
+        "limit": limit,
+        "remaining": max(0, int(remaining)),
+        "wait": float(wait),
+        "reset": int(float(wait) + 0.999),
+    }
+
+
+def consume_quota(identity, tier, cost=1):
+    limit, window = parse_rate(settings.API_QUOTA_TIERS[tier])
+    try:
+        result = _sliding_window_script()(
+            keys=[QUOTA_KEY.format(identity=identity)], args=[limit, window, cost]
+        )
+    except Exception as e:
+        # Sem Redis, a API continua no ar sem aplicar cota
+        logger.warning(f"Falha ao aplicar cota de {identity}: {e}")
+        return None
+    return _quota(limit, *result)
+
+
+async def aconsume_quota(identity, tier, cost=1):
+    redis_url = cache_redis_url()
+    if redis_url is None:
+        return None
+
+    limit, window = parse_rate(settings.API_QUOTA_TIERS[tier])
+    script = _async_sliding_window_script(get_async_redis(redis_url))
+    try:
+        result = await script(
+            keys=[QUOTA_KEY.format(identity=identity)], args=[limit, window, cost]
+        )
+    except Exception as e:
+        logger.warning(f"Falha ao aplicar cota de {identity}: {e}")
+        return None
+    return _quota(limit, *result)
+
+
+class QuotaThrottle(BaseThrottle):
+    """Cota por chave de API (conforme o plano) ou por IP para anônimos."""
+
+    def cost(self, request):
+        return 1
+
+    def allow_request(self, request, view):
+        identity, tier = quota_for(request.auth, request.user, self.get_ident(request))
+        quota = consume_quota(identity, tier, self.cost(request))
+        if quota is None:
+            return True
+
+        self._wait = quota["wait"]
+        # Lido pelo QuotaHeadersMiddleware para expor o saldo na resposta
+        request._request.quota = quota
+        return quota["allowed"]
+
+    def wait(self):
+        return getattr(self, "_wait", None)
+
+
+class BatchQuotaThrottle(QuotaThrottle):
+    """Cota do lote: cada URL custa o mesmo que uma análise avulsa."""
+
+    def cost(self, request):
+        urls = request.data.get("urls") if isinstance(request.data, dict) else None
+        if not isinstance(urls, list) or not urls:
+            return 1
+        # Lotes acima do limite são recusados pela view; não pagam mais que ele
+        return min(len(urls), settings.BATCH_MAX_URLS)
@@ -1,12 +1,35 @@
+from django.conf import settings
 from django.urls import path
 
-from analysis.view import AnalysisStatusView, AnalysisTriggerView
+from analysis.view import (
+    AnalysisBatchView,
+    AnalysisStatusView,
+    AnalysisTriggerView,
+    AsyncAnalysisStatusView,
+    AsyncAnalysisTriggerView,
+    ProfileDetailView,
+    ProfileListView,
+)
+
+# No caminho ASGI (core/asgi.py liga ASYNC_API) as views de disparo e status
+# são assíncronas; no WSGI seguem as views DRF síncronas
+if settings.ASYNC_API:
+    trigger_view, status_view = AsyncAnalysisTriggerView, AsyncAnalysisStatusView
+else:
+    trigger_view, status_view = AnalysisTriggerView, AnalysisStatusView
 
 urlpatterns = [
-    path("analysis/", AnalysisTriggerView.as_view(), name="analysis-trigger"),
+    path("analysis/", trigger_view.as_view(), name="analysis-trigger"),
+    path("analysis/batch/", AnalysisBatchView.as_view(), name="analysis-batch"),
     path(
         "analysis/status/<str:task_id>",
-        AnalysisStatusView.as_view(),
+        status_view.as_view(),
         name="analysis-status",
     ),
+    path("profiles/", ProfileListView.as_view(), name="profile-list"),
+    path(
+        "profiles/<str:task_id>",
+        ProfileDetailView.as_view(),
+        name="profile-detail",
+    ),
 ]
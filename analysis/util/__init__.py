@@ -1 +1,2 @@
 from .clean import clean_content
+from .url import canonicalize_url
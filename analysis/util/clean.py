@@ -1,18 +1,14 @@
 import re
 
+_WHITESPACE = re.compile(r"[\n\t ]+")
+_SPACES = re.compile(r" +")
+_MARKDOWN_CHARS = re.compile(r"[#*`>_-]")
+_MARKDOWN_LINK = re.compile(r"\[(.*?)\]\(.*?\)")
+_BARE_URL = re.compile(r"http\S+")
 
-def clean_content(content):
-    cleaned = content
-
-    cleaned = cleaned.replace("\n", " ").replace("\t", " ")
-    cleaned = re.sub(r" +", " ", cleaned)
-    cleaned = re.sub(r"[#*`>_-]", "", cleaned)
-    cleaned = re.sub(r"\[(.*?)\]\(.*?\)", r"\1", cleaned)
-    cleaned = re.sub(r"http\S+", "", cleaned)
-    cleaned = cleaned.strip()
-
-    cleaned = re.sub(r" +", " ", cleaned).strip()
-    patterns_to_remove = [
+_PATTERNS_TO_REMOVE = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
         r"Assista também.*",
         r"Leia também.*",
         r"Veja também.*",
@@ -22,9 +18,18 @@ def clean_content(content):
         r"VÍDEOS:.*",
         r"Mais do G1.*",
         r"Resumo do dia.*",
-    ]
+    )
+]
+
+
+def clean_content(content):
+    cleaned = _WHITESPACE.sub(" ", content)
+    cleaned = _MARKDOWN_CHARS.sub("", cleaned)
+    cleaned = _MARKDOWN_LINK.sub(r"\1", cleaned)
+    cleaned = _BARE_URL.sub("", cleaned)
+    cleaned = _SPACES.sub(" ", cleaned).strip()
 
-    for pattern in patterns_to_remove:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.IGNORECASE)
+    for pattern in _PATTERNS_TO_REMOVE:
+        cleaned = pattern.sub("", cleaned)
 
     return cleaned
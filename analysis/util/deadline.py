@@ -0,0 +1,47 @@
+import threading
+import time
+
+from django.conf import settings
+
+from analysis.services.exceptions import DeadlineExceeded
+
+
+class Deadline:
+    """Prazo total de uma análise, repartido entre as chamadas aos provedores."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def ensure(self, seconds):
+        """Garante pelo menos `seconds` de prazo a partir de agora; nunca encurta."""
+        with self._lock:
+            self.expires_at = max(self.expires_at, time.monotonic() + seconds)
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Prazo de {self.seconds}s da análise esgotado.")
+        return remaining
+
+
+def request_timeout(deadline=None):
+    # (connect, read) para o requests; com prazo, nunca além do tempo restante
+    connect = settings.PROVIDER_CONNECT_TIMEOUT
+    read = settings.PROVIDER_READ_TIMEOUT
+    if deadline is None:
+        return (connect, read)
+    remaining = deadline.check()
+    return (min(connect, remaining), min(read, remaining))
+
+
+def timeout_ms(deadline=None):
+    # SDKs que recebem o timeout em milissegundos (Firecrawl, Gemini)
+    return int(max(request_timeout(deadline)) * 1000)
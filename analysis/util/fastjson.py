@@ -0,0 +1,67 @@
+"""JSON com orjson e relatórios pré-serializados.
+
+O worker grava o relatório no cache já como bytes JSON (encode_report). As
+views embutem esses bytes na resposta como RawJSON: o relatório não é
+decodificado nem codificado de novo a cada cache hit.
+"""
+
+import re
+import secrets
+
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+class RawJSON(bytes):
+    """Trecho já serializado, copiado como está para a saída de dumps()."""
+
+
+def _default(obj):
+    # Lazy strings do Django, Decimal e afins saem como texto
+    return str(obj)
+
+
+def dumps(data):
+    """bytes JSON de `data`; valores RawJSON entram sem ser reprocessados."""
+    if isinstance(data, RawJSON):
+        return bytes(data)
+
+    fragments = []
+    marker = f"\x00rawjson-{secrets.token_hex(4)}:"
+
+    def default(obj):
+        if isinstance(obj, RawJSON):
+            fragments.append(obj)
+            return f"{marker}{len(fragments) - 1}"
+        return _default(obj)
+
+    body = orjson.dumps(data, default=default, option=_OPTIONS)
+    if not fragments:
+        return body
+    # Cada RawJSON virou uma string marcadora; troca pelos bytes originais numa passada
+    pattern = re.compile(b'"' + re.escape(orjson.dumps(marker)[1:-1]) + rb'(\d+)"')
+    return pattern.sub(lambda match: fragments[int(match.group(1))], body)
+
+
+def loads(raw):
+    return orjson.loads(raw)
+
+
+def encode_report(report):
+    """Forma guardada no cache: bytes JSON prontos para a resposta."""
+    return dumps(report)
+
+
+def decode_report(value):
+    """Relatório do cache como dict (aceita as entradas antigas, já em dict)."""
+    if isinstance(value, (bytes, bytearray)):
+        return loads(value)
+    return value
+
+
+def raw_report(value):
+    """Relatório do cache pronto para embutir na resposta sem decodificar."""
+    if isinstance(value, (bytes, bytearray)):
+        return RawJSON(value)
+    return value
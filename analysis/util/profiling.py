@@ -0,0 +1,167 @@
+import logging
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from analysis.authentication import ApiKeyIdentity
+
+logger = logging.getLogger(__name__)
+
+PROFILE_KEY = "profile:{task_id}"
+PROFILE_INDEX_KEY = "profile:index"
+PROFILE_INDEX_SIZE = 200
+PROFILE_HEADER = "X-FactShield-Profile"
+
+
+def task_thread_prefix(owner=None):
+    """Prefixo dos nomes das threads auxiliares de uma análise (pool das etapas)."""
+    return f"analysis-{owner or threading.get_ident()}"
+
+
+class SamplingProfiler:
+    """Profiler estatístico: amostra as pilhas das threads do processo.
+
+    Com `owner`, só entram a thread dona e as threads nomeadas com
+    task_thread_prefix(owner): outras tasks do mesmo worker (pool de threads)
+    ficam fora do profile. O resultado sai no formato "collapsed" (uma pilha
+    por linha, frames separados por ";" e a contagem no final), aceito pelo
+    flamegraph.pl e pelo speedscope.
+    """
+
+    def __init__(self, interval=0.01, owner=None):
+        self.interval = interval
+        self.owner = owner
+        self.thread_prefix = task_thread_prefix(owner) if owner else None
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="factshield-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                name = names.get(thread_id, thread_id)
+                if thread_id == own_id or not self._sampled(thread_id, name):
+                    continue
+                self.samples[self._collapse(name, frame)] += 1
+            self.sample_count += 1
+
+    def _sampled(self, thread_id, name):
+        if self.owner is None:
+            return True
+        # O ThreadPoolExecutor nomeia as threads "<prefixo>_<n>"; o "_" evita que
+        # a task 12 amostre as threads da task 123
+        return thread_id == self.owner or str(name).startswith(f"{self.thread_prefix}_")
+
+    @staticmethod
+    def _collapse(thread_name, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            stack.append(f"{module}:{code.co_qualname}")
+            frame = frame.f_back
+        stack.append(str(thread_name))
+        return ";".join(reversed(stack))
+
+    def collapsed(self):
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+def should_profile(force=False):
+    return force or random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def profile_requested(request, user=None):
+    """Header de profiling forçado, atendido só para chaves de API e staff."""
+    if request.headers.get(PROFILE_HEADER) != "1":
+        return False
+    # Cada profile custa CPU no worker e ocupa o Redis: anônimos não escolhem
+    return isinstance(getattr(request, "auth", None), ApiKeyIdentity) or bool(
+        user is not None and user.is_active and user.is_staff
+    )
+
+
+def store_profile(task_id, url, profiler, duration):
+    profile = {
+        "task_id": task_id,
+        "url": url,
+        "duration_seconds": round(duration, 3),
+        "samples": profiler.sample_count,
+        "interval_seconds": profiler.interval,
+        "collapsed": profiler.collapsed(),
+    }
+    cache.set(PROFILE_KEY.format(task_id=task_id), profile, timeout=settings.PROFILE_TTL)
+
+    try:
+        redis = get_redis_connection("default")
+        pipe = redis.pipeline()
+        pipe.lpush(PROFILE_INDEX_KEY, task_id)
+        pipe.ltrim(PROFILE_INDEX_KEY, 0, PROFILE_INDEX_SIZE - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Falha ao indexar o profile {task_id}: {e}")
+    return profile
+
+
+def get_profile(task_id):
+    return cache.get(PROFILE_KEY.format(task_id=task_id))
+
+
+def recent_profiles():
+    try:
+        redis = get_redis_connection("default")
+        task_ids = redis.lrange(PROFILE_INDEX_KEY, 0, -1)
+    except Exception as e:
+        logger.warning(f"Falha ao listar profiles: {e}")
+        return []
+    return [t.decode() if isinstance(t, bytes) else t for t in task_ids]
+
+
+@contextmanager
+def profile_task(task_id, url, force=False):
+    if not should_profile(force):
+        yield None
+        return
+
+    task_id = task_id or str(uuid.uuid4())
+    start = time.perf_counter()
+    profiler = SamplingProfiler(interval=settings.PROFILE_INTERVAL, owner=threading.get_ident())
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        try:
+            store_profile(task_id, url, profiler, time.perf_counter() - start)
+        except Exception as e:
+            logger.warning(f"Falha ao salvar o profile da task {task_id}: {e}")
@@ -0,0 +1,110 @@
+"""Projeção dos relatórios por ?fields= e ?exclude=.
+
+Os caminhos usam ponto para descer nos objetos ("llm_analysis.llm_recommendation")
+e valem para cada item quando o valor é uma lista. A projeção roda antes da
+serialização: sem parâmetros, o relatório pré-serializado segue intacto.
+"""
+
+import hashlib
+
+from analysis.util.fastjson import decode_report
+
+MAX_PATHS = 50
+
+
+def _parse(value):
+    paths = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        path = tuple(segment.strip() for segment in part.split("."))
+        if not all(path):
+            raise ValueError(f"Campo inválido: {part!r}")
+        paths.append(path)
+    if len(paths) > MAX_PATHS:
+        raise ValueError(f"Máximo de {MAX_PATHS} campos por projeção")
+    return tuple(paths)
+
+
+def _tree(paths):
+    # {"a": {"b": None}}: None marca o campo inteiro e vence os caminhos mais fundos
+    tree = {}
+    for path in paths:
+        node = tree
+        for segment in path[:-1]:
+            child = node.setdefault(segment, {})
+            if child is None:
+                break
+            node = child
+        else:
+            node[path[-1]] = None
+    return tree
+
+
+def _each(value, func, tree):
+    if isinstance(value, dict):
+        return func(value, tree)
+    if isinstance(value, list):
+        return [func(item, tree) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+def _include(data, tree):
+    selected = {}
+    for key, subtree in tree.items():
+        if key in data:
+            selected[key] = data[key] if subtree is None else _each(data[key], _include, subtree)
+    return selected
+
+
+def _exclude(data, tree):
+    # Cópia rasa por nível: o relatório original (do cache ou do Celery) não é alterado
+    kept = dict(data)
+    for key, subtree in tree.items():
+        if key not in kept:
+            continue
+        if subtree is None:
+            del kept[key]
+        else:
+            kept[key] = _each(kept[key], _exclude, subtree)
+    return kept
+
+
+class Projection:
+    def __init__(self, fields=(), exclude=()):
+        self.fields = fields
+        self.exclude = exclude
+
+    @classmethod
+    def from_params(cls, params):
+        """Projeção dos parâmetros da query; ValueError se algum caminho for inválido."""
+        return cls(_parse(params.get("fields")), _parse(params.get("exclude")))
+
+    def __bool__(self):
+        return bool(self.fields or self.exclude)
+
+    @property
+    def key(self):
+        fields = ",".join(sorted(".".join(path) for path in self.fields))
+        exclude = ",".join(sorted(".".join(path) for path in self.exclude))
+        return f"fields={fields};exclude={exclude}"
+
+    def etag(self, etag):
+        """ETag da representação projetada, derivado do ETag do relatório inteiro."""
+        if not self or not etag:
+            return etag
+        suffix = hashlib.sha256(self.key.encode()).hexdigest()[:8]
+        return f'"{etag.removeprefix("W/").strip(chr(34))}-{suffix}"'
+
+    def apply(self, report):
+        if not self or report is None:
+            return report
+        report = decode_report(report)
+        if not isinstance(report, dict):
+            return report
+        if self.fields:
+            report = _include(report, _tree(self.fields))
+        if self.exclude:
+            report = _exclude(report, _tree(self.exclude))
+        return report
@@ -0,0 +1,81 @@
+import threading
+import time
+
+from analysis.metrics import STAGE_PROVIDERS
+
+
+class TokenBucket:
+    """Limite de requisições por segundo compartilhado entre threads.
+
+    Quem chega sem ficha reserva a próxima e dorme até ela: as chamadas saem
+    espaçadas em 1/rate segundos, com rajadas de até `burst`.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Reserva uma ficha e devolve quantos segundos esperar por ela, sem dormir."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+def parse_rate_limits(spec):
+    # "firecrawl=2,gemini=0.5" -> {"firecrawl": 2.0, "gemini": 0.5} (req/s)
+    limits = {}
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        provider, _, rate = part.partition("=")
+        try:
+            limits[provider.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Limite inválido: {part!r} (use provedor=req/s)")
+    unknown = set(limits) - set(STAGE_PROVIDERS.values())
+    if unknown:
+        raise ValueError(f"Provedores desconhecidos: {', '.join(sorted(unknown))}")
+    return limits
+
+
+class ProviderRateLimits:
+    """Um TokenBucket por provedor, aplicado às etapas do pipeline."""
+
+    def __init__(self, rates, **bucket_options):
+        self.buckets = {
+            provider: TokenBucket(rate, **bucket_options)
+            for provider, rate in rates.items()
+            if rate > 0
+        }
+
+    def wrap(self, stage, func, deadline=None):
+        bucket = self.buckets.get(STAGE_PROVIDERS.get(stage, stage))
+        if bucket is None:
+            return func
+
+        def wrapper(*args, **kwargs):
+            wait = bucket.reserve()
+            if wait:
+                if deadline is not None:
+                    # A espera pela cota não consome o prazo: estendido antes de
+                    # dormir, a etapa começa com o tempo que tinha ao entrar na fila
+                    deadline.ensure(deadline.remaining() + wait)
+                bucket.sleep(wait)
+            return func(*args, **kwargs)
+
+        return wrapper
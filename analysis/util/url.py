@@ -0,0 +1,48 @@
+import ipaddress
+import socket
+from urllib.parse import urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonicalize_url(url):
+    url = (url or "").strip()
+    if not url:
+        return ""
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if ":" in host:
+        host = f"[{host}]"
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    path = parts.path or "/"
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+def is_public_host(host):
+    """True só se todos os endereços do host são públicos (is_global).
+
+    Barra loopback, redes privadas, link-local (metadados da nuvem, como
+    169.254.169.254) e nomes que resolvem para eles (ex.: 127.0.0.1.nip.io).
+    """
+    host = (host or "").strip("[]")
+    if not host:
+        return False
+    try:
+        infos = socket.getaddrinfo(host, None, proto=socket.IPPROTO_TCP)
+    except (socket.gaierror, UnicodeError):
+        return False
+    addresses = set()
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        addresses.add(getattr(address, "ipv4_mapped", None) or address)
+    return bool(addresses) and all(address.is_global for address in addresses)
@@ -1,2 +1,6 @@
+from .analysis_batch import AnalysisBatchView
 from .analysis_status import AnalysisStatusView
 from .analysis_view import AnalysisTriggerView
+from .metrics import metrics_view
+from .profiles import ProfileDetailView, ProfileListView
+from .async_views import AsyncAnalysisStatusView, AsyncAnalysisTriggerView
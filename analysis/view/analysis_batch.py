@@ -0,0 +1,88 @@
+import validators
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from analysis.authentication import HasApiKey
+from analysis.caching import report_cache_key
+from analysis.dispatch import enqueue_analysis
+from analysis.throttling import BatchQuotaThrottle
+from analysis.util.fastjson import raw_report
+from analysis.util.projection import Projection
+from analysis.webhooks import validate_callback_url
+
+
+class AnalysisBatchView(APIView):
+    # Um lote enfileira até BATCH_MAX_URLS análises: exige chave de API e
+    # desconta da cota uma unidade por URL
+    permission_classes = [HasApiKey]
+    throttle_classes = [BatchQuotaThrottle]
+
+    def post(self, request):
+        urls = request.data.get("urls")
+        if not isinstance(urls, list) or not urls:
+            return Response(
+                {"error": "Campo urls deve ser uma lista de URLs"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        callback_url = request.data.get("callback_url")
+        error = validate_callback_url(callback_url, request.auth)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            projection = Projection.from_params(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if len(urls) > settings.BATCH_MAX_URLS:
+            return Response(
+                {"error": f"Máximo de {settings.BATCH_MAX_URLS} URLs por lote"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        valid_urls = [
+            url for url in dict.fromkeys(u for u in urls if isinstance(u, str))
+            if validators.url(url)
+        ]
+        keys = {url: report_cache_key(url) for url in valid_urls}
+        # Uma única ida ao cache para o lote inteiro
+        cached = cache.get_many(keys.values())
+
+        results = []
+        task_ids = {}
+        for url in urls:
+            cache_key = keys.get(url) if isinstance(url, str) else None
+            if cache_key is None:
+                results.append({"url": url, "status": "invalid"})
+                continue
+            if cache_key in cached:
+                results.append(
+                    {
+                        "url": url,
+                        "status": "cached",
+                        "final_report": raw_report(projection.apply(cached[cache_key])),
+                    }
+                )
+                continue
+
+            # Lotes vão para a fila "bulk" e não atrasam as análises interativas;
+            # com callback_url, cada URL enfileirada gera o seu próprio webhook
+            if url not in task_ids:
+                task_ids[url] = enqueue_analysis(
+                    url,
+                    cache_key,
+                    lane="bulk",
+                    callback_url=callback_url,
+                    api_key_id=getattr(request.auth, "id", None),
+                ).id
+            results.append(
+                {
+                    "url": url,
+                    "status": "queued",
+                    "task_id": task_ids[url],
+                    "status_endpoint": f"/analysis/status/{task_ids[url]}",
+                }
+            )
+
+        return Response({"results": results}, status=status.HTTP_202_ACCEPTED)
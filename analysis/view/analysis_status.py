@@ -1,14 +1,73 @@
+from celery import states
 from celery.result import AsyncResult
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
+from analysis.caching import etag_matches, get_report_etag, report_etag
+from analysis.throttling import QuotaThrottle
+from analysis.util.projection import Projection
+
+
+def status_payload(task_id, state, result):
+    response_data = {"state": state}
+
+    if state == "STARTED":
+        response_data["status"] = "Em processamento..."
+
+    elif state == "PENDING":
+        response_data["status"] = "Aguardando na Fila..."
+
+    elif state == "RETRY":
+        response_data["status"] = "Nova tentativa agendada..."
+
+    elif state == "FAILURE":
+        response_data["status"] = "Falha na execução..."
+        response_data["error"] = str(result)
+        print(f"Task {task_id} falhou: {result}")
+
+    elif state == "SUCCESS":
+        response_data["status"] = "Concluido"
+        response_data["result"] = result
+
+    return response_data
+
+
+def with_http_caching(response, state, etag=None):
+    if state == states.SUCCESS and etag:
+        # Relatório concluído não muda mais: clientes e CDNs podem guardar
+        response["ETag"] = etag
+        patch_cache_control(
+            response, public=True, max_age=settings.STATUS_CACHE_MAX_AGE, immutable=True
+        )
+    else:
+        # Estados intermediários mudam a cada consulta
+        patch_cache_control(response, no_store=True)
+    return response
+
+
+def not_modified(etag):
+    return with_http_caching(HttpResponseNotModified(), states.SUCCESS, etag)
+
 
 class AnalysisStatusView(APIView):
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [QuotaThrottle]
 
     def get(self, request, task_id):
+        try:
+            projection = Projection.from_params(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Revalidação sem tocar no backend do Celery: só a chave do ETag é lida
+        if_none_match = request.headers.get("If-None-Match")
+        etag = get_report_etag(task_id) if if_none_match else None
+        if etag_matches(if_none_match, projection.etag(etag)):
+            return not_modified(projection.etag(etag))
+
         task = AsyncResult(task_id)
 
         if not task:
@@ -16,22 +75,17 @@ class AnalysisStatusView(APIView):
                 {"error": "Task não encontrada"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        state = task.state
-        response_data = {"state": state}
-
-        if state == "STARTED":
-            response_data["status"] = "Em processamento..."
-
-        elif state == "PENDING":
-            response_data["status"] = "Aguardando na Fila..."
-
-        elif state == "FAILURE":
-            response_data["status"] = "Falha na execução..."
-            response_data["error"] = str(task.result)
-            print(f"Task {task.id} falhou: {task.result}")
-
-        elif state == "SUCCESS":
-            response_data["status"] = "Concluido"
-            response_data["result"] = task.result
+        state, result = task.state, task.result
+        if state == states.SUCCESS:
+            etag = etag or get_report_etag(task_id) or report_etag(result)
+            # Cada projeção é uma representação diferente, com o seu próprio ETag
+            etag = projection.etag(etag)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            result = projection.apply(result)
 
-        return Response(response_data, status=status.HTTP_200_OK)
+        return with_http_caching(
+            Response(status_payload(task.id, state, result), status=status.HTTP_200_OK),
+            state,
+            etag,
+        )
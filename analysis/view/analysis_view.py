@@ -1,43 +1,78 @@
-from hashlib import sha256
-
 import validators
 from django.core.cache import cache
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.throttling import AnonRateThrottle
 from rest_framework.views import APIView
 
-from analysis.tasks import run_full_analysis_task
+from analysis.caching import record_request, report_cache_key
+from analysis.metrics import record_cache
+from analysis.dispatch import enqueue_analysis
+from analysis.throttling import QuotaThrottle
+from analysis.util.fastjson import raw_report
+from analysis.util.profiling import profile_requested
+from analysis.util.projection import Projection
+from analysis.webhooks import validate_callback_url
+
+
+def validate_url(url):
+    if not url:
+        return "URL é obrigatorio"
+    if not validators.url(url):
+        return "Campo URL é obrigatorio"
+    return None
+
+
+def cached_payload(report):
+    return {
+        "message": "Resultado retornado do Cache",
+        "analysis_time_second": 0,
+        # Bytes JSON gravados pelo worker vão para a resposta sem decodificar
+        "final_report": raw_report(report),
+    }
+
+
+def accepted_payload(task_id, callback_url=None):
+    payload = {
+        "message": "Analise iniciada em Backgroud",
+        "task_id": task_id,
+        "status_endpoint": f"/analysis/status/{task_id}",
+    }
+    if callback_url:
+        payload["callback_url"] = callback_url
+    return payload
 
 
 class AnalysisTriggerView(APIView):
-    throttle_classes = [AnonRateThrottle]
+    throttle_classes = [QuotaThrottle]
 
     def post(self, request):
         url = request.data.get("url")
-        if not url:
-            return Response(
-                {"error": "URL é obrigatorio"}, status=status.HTTP_400_BAD_REQUEST
-            )
-        if not validators.url(url):
-            return Response(
-                {"error": "Campo URL é obrigatorio"}, status=status.HTTP_400_BAD_REQUEST
-            )
+        callback_url = request.data.get("callback_url")
+        error = validate_url(url) or validate_callback_url(callback_url, request.auth)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            projection = Projection.from_params(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        cache_key = sha256(url.encode()).hexdigest()
+        record_request(url)
+        cache_key = report_cache_key(url)
         cached_result = cache.get(cache_key)
+        record_cache(hit=bool(cached_result))
         if cached_result:
             return Response(
-                {
-                    "message": "Resultado retornado do Cache",
-                    "analysis_time_second": 0,
-                    "final_report": cached_result,
-                },
-                status=status.HTTP_200_OK,
+                cached_payload(projection.apply(cached_result)), status=status.HTTP_200_OK
             )
 
         try:
-            task_result = run_full_analysis_task.delay(url, cache_key)
+            task_result = enqueue_analysis(
+                url,
+                cache_key,
+                profile=profile_requested(request, request.user),
+                callback_url=callback_url,
+                api_key_id=getattr(request.auth, "id", None),
+            )
             print(f"Task {task_result.id} iniciada para a URL: {url}")
 
         except Exception as e:
@@ -48,10 +83,5 @@ class AnalysisTriggerView(APIView):
             )
 
         return Response(
-            {
-                "message": "Analise iniciada em Backgroud",
-                "task_id": task_result.id,
-                "status_endpoint": f"/analysis/status/{task_result.id}",
-            },
-            status=status.HTTP_202_ACCEPTED,
+            accepted_payload(task_result.id, callback_url), status=status.HTTP_202_ACCEPTED
         )
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from celery import states
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.throttling import BaseThrottle
+
+from analysis.authentication import (
+    AUTHORIZATION_KEYWORD,
+    INVALID_KEY_MESSAGE,
+    aresolve_api_key,
+    api_key_from_headers,
+)
+from analysis.caching import (
+    aget_cached,
+    aget_task_meta,
+    arecord_request,
+    arefresh_generations,
+    etag_key,
+    etag_matches,
+    report_cache_key,
+    report_etag,
+)
+from analysis.metrics import record_cache
+from analysis.renderers import FastJSONResponse
+from analysis.dispatch import enqueue_analysis
+from analysis.throttling import aconsume_quota, quota_for
+from analysis.util.profiling import PROFILE_HEADER, profile_requested
+from analysis.util.projection import Projection
+from analysis.webhooks import validate_callback_url
+
+from .analysis_status import not_modified, status_payload, with_http_caching
+from .analysis_view import accepted_payload, cached_payload, validate_url
+
+# Intervalo entre consultas ao backend durante o long-poll do status
+LONG_POLL_INTERVAL = 0.25
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncAPIView(View):
+    """Base das views assíncronas: chave de API e cota sem bloquear o event loop.
+
+    Mesmo contrato das views DRF (X-API-Key, cotas por plano, headers
+    X-RateLimit-*), servido pelo caminho ASGI sem segurar uma thread por
+    requisição.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        identity = None
+        raw_key = api_key_from_headers(request.headers)
+        if raw_key is not None:
+            identity = await aresolve_api_key(raw_key)
+            if identity is None:
+                response = FastJSONResponse({"detail": INVALID_KEY_MESSAGE}, status=401)
+                response["WWW-Authenticate"] = AUTHORIZATION_KEYWORD
+                return response
+        request.auth = identity
+
+        quota = await aconsume_quota(
+            *quota_for(identity, None, BaseThrottle().get_ident(request))
+        )
+        if quota is not None:
+            request.quota = quota
+            if not quota["allowed"]:
+                response = FastJSONResponse(
+                    {"detail": "Limite de requisições excedido."}, status=429
+                )
+                response["Retry-After"] = str(quota["reset"])
+                return response
+
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncAnalysisTriggerView(AsyncAPIView):
+    async def post(self, request):
+        try:
+            body = json.loads(request.body or b"{}")
+            url, callback_url = body.get("url"), body.get("callback_url")
+        except (ValueError, AttributeError):
+            url = callback_url = None
+        error = validate_url(url) or validate_callback_url(callback_url, request.auth)
+        if error:
+            return FastJSONResponse({"error": error}, status=400)
+        try:
+            projection = Projection.from_params(request.GET)
+        except ValueError as e:
+            return FastJSONResponse({"error": str(e)}, status=400)
+
+        await arecord_request(url)
+        await arefresh_generations()
+        cache_key = report_cache_key(url)
+        cached_result = await aget_cached(cache_key)
+        record_cache(hit=bool(cached_result))
+        if cached_result:
+            return FastJSONResponse(cached_payload(projection.apply(cached_result)), status=200)
+
+        # A sessão só é carregada para quem pede o profiling sem chave de API
+        user = None
+        if request.auth is None and request.headers.get(PROFILE_HEADER) == "1":
+            user = await request.auser()
+        try:
+            # Publicar no broker é rápido, mas bloqueante: vai para uma thread
+            task_result = await sync_to_async(enqueue_analysis, thread_sensitive=False)(
+                url,
+                cache_key,
+                profile=profile_requested(request, user),
+                callback_url=callback_url,
+                api_key_id=getattr(request.auth, "id", None),
+            )
+            print(f"Task {task_result.id} iniciada para a URL: {url}")
+        except Exception as e:
+            print(f"Erro ao inciar a Task Celery: {e}")
+            return FastJSONResponse({"error": "Falha ao iniciar a Analise"}, status=500)
+
+        return FastJSONResponse(accepted_payload(task_result.id, callback_url), status=202)
+
+
+class AsyncAnalysisStatusView(AsyncAPIView):
+    async def get(self, request, task_id):
+        # ?wait=N: long-poll de até N segundos enquanto a task não termina
+        try:
+            wait = min(float(request.GET.get("wait", 0)), settings.STATUS_LONG_POLL_MAX)
+        except ValueError:
+            wait = 0
+        deadline = time.monotonic() + wait
+        try:
+            projection = Projection.from_params(request.GET)
+        except ValueError as e:
+            return FastJSONResponse({"error": str(e)}, status=400)
+
+        # Revalidação sem tocar no backend do Celery: só a chave do ETag é lida
+        if_none_match = request.headers.get("If-None-Match")
+        etag = await aget_cached(etag_key(task_id)) if if_none_match else None
+        if etag_matches(if_none_match, projection.etag(etag)):
+            return not_modified(projection.etag(etag))
+
+        meta = await aget_task_meta(task_id)
+        while meta["status"] not in states.READY_STATES and time.monotonic() < deadline:
+            await asyncio.sleep(LONG_POLL_INTERVAL)
+            meta = await aget_task_meta(task_id)
+
+        state, result = meta["status"], meta.get("result")
+        if state == states.SUCCESS:
+            etag = etag or await aget_cached(etag_key(task_id)) or report_etag(result)
+            etag = projection.etag(etag)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+            result = projection.apply(result)
+
+        return with_http_caching(
+            FastJSONResponse(status_payload(task_id, state, result), status=200), state, etag
+        )
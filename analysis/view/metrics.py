@@ -0,0 +1,25 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from analysis.metrics import render_metrics
+
+
+def metrics_allowed(request):
+    # Prometheus com o token, IPs da rede de monitoramento ou staff logado no admin
+    token = settings.METRICS_TOKEN
+    keyword, _, value = request.headers.get("Authorization", "").partition(" ")
+    if token and keyword == "Bearer" and hmac.compare_digest(value.strip(), token):
+        return True
+    if request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS:
+        return True
+    user = getattr(request, "user", None)
+    return bool(user and user.is_active and user.is_staff)
+
+
+def metrics_view(request):
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
@@ -0,0 +1,30 @@
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from analysis.util.profiling import get_profile, recent_profiles
+
+
+class ProfileListView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response({"profiles": recent_profiles()}, status=status.HTTP_200_OK)
+
+
+class ProfileDetailView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, task_id):
+        profile = get_profile(task_id)
+        if not profile:
+            return Response(
+                {"error": "Profile não encontrado"}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Pilhas "collapsed", prontas para flamegraph.pl ou speedscope
+        if request.query_params.get("output") == "collapsed":
+            return HttpResponse(profile["collapsed"], content_type="text/plain")
+        return Response(profile, status=status.HTTP_200_OK)
@@ -0,0 +1,163 @@
+"""Callbacks de conclusão da análise: validação, assinatura e entrega.
+
+O corpo é assinado com HMAC-SHA256 sobre "<timestamp>.<corpo>" e vai no header
+X-FactShield-Signature ("t=<timestamp>,v1=<assinatura>"); o integrador recalcula
+com o segredo da sua chave de API (ApiKey.webhook_secret) e rejeita timestamps
+antigos para evitar replays. Só chamadas autenticadas por chave podem pedir
+callbacks.
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import time
+import uuid
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+import validators
+from django.conf import settings
+
+from analysis.authentication import ApiKeyIdentity
+from analysis.models import ApiKey
+from analysis.util.url import is_public_host
+
+SIGNATURE_HEADER = "X-FactShield-Signature"
+EVENT_COMPLETED = "analysis.completed"
+EVENT_FAILED = "analysis.failed"
+
+# Resultados da entrega usados nas métricas e na decisão de retry
+DELIVERED = "delivered"
+RETRY = "retry"
+REJECTED = "rejected"
+
+
+def validate_callback_url(callback_url, identity=None):
+    """Mensagem de erro para a callback_url, ou None se ela for aceitável."""
+    if callback_url is None:
+        return None
+    if not isinstance(identity, ApiKeyIdentity):
+        # O segredo da assinatura é por chave: sem chave não há com o que assinar
+        return "callback_url exige autenticação por chave de API"
+    if not isinstance(callback_url, str) or not validators.url(callback_url):
+        return "callback_url inválida"
+
+    parts = urlsplit(callback_url)
+    if parts.scheme != "https" and not settings.WEBHOOK_ALLOW_HTTP:
+        return "callback_url precisa usar https"
+    host = (parts.hostname or "").lower()
+    if host == "localhost" or host.endswith((".localhost", ".internal", ".local")):
+        return "callback_url não pode apontar para a rede interna"
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    if not address.is_global:
+        return "callback_url não pode apontar para a rede interna"
+    return None
+
+
+def webhook_secret(api_key_id):
+    """Segredo de assinatura da chave de API, ou None se ela não existe mais ou foi revogada."""
+    if not api_key_id:
+        return None
+    return (
+        ApiKey.objects.filter(pk=api_key_id, is_active=True)
+        .values_list("webhook_secret", flat=True)
+        .first()
+    )
+
+
+def sign(body, timestamp, secret):
+    message = f"{timestamp}.".encode() + body
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def signature_header(body, secret, timestamp=None):
+    timestamp = int(timestamp or time.time())
+    return f"t={timestamp},v1={sign(body, timestamp, secret)}"
+
+
+def verify_signature(body, header, secret, tolerance=300, now=None):
+    """Confere a assinatura como o integrador faria (usado nos testes e exemplos)."""
+    try:
+        fields = dict(part.split("=", 1) for part in header.split(","))
+        timestamp = int(fields["t"])
+    except (ValueError, KeyError):
+        return False
+    if abs((now or time.time()) - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(fields.get("v1", ""), sign(body, timestamp, secret))
+
+
+def completion_payload(task_id, url, report=None, error=None):
+    payload = {
+        "event": EVENT_FAILED if error is not None else EVENT_COMPLETED,
+        "delivery_id": str(uuid.uuid4()),
+        "task_id": task_id,
+        "url": url,
+        "state": "FAILURE" if error is not None else "SUCCESS",
+    }
+    if error is not None:
+        payload["error"] = error
+    else:
+        payload["result"] = report
+    return payload
+
+
+def encode_payload(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+@lru_cache(maxsize=1)
+def _session():
+    # requests só é carregado no worker que faz a entrega, não no processo web
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    # Conexões reaproveitadas entre entregas para os mesmos integradores
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.WEBHOOK_POOL_SIZE, pool_maxsize=settings.WEBHOOK_POOL_SIZE
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {"Content-Type": "application/json", "User-Agent": "FactShield-Webhooks/1.0"}
+    )
+    return session
+
+
+def post_webhook(callback_url, payload, secret):
+    """Faz uma tentativa de entrega; devolve (resultado, status HTTP ou erro)."""
+    import requests
+
+    # Resolvido a cada tentativa: nomes como 127.0.0.1.nip.io passam na validação
+    # do disparo, e o DNS de um host público pode mudar entre as tentativas
+    if not is_public_host(urlsplit(callback_url).hostname):
+        return REJECTED, "callback_url resolve para a rede interna"
+
+    body = encode_payload(payload)
+    headers = {
+        SIGNATURE_HEADER: signature_header(body, secret),
+        "X-FactShield-Event": payload["event"],
+        "X-FactShield-Delivery": payload["delivery_id"],
+    }
+    try:
+        response = _session().post(
+            callback_url,
+            data=body,
+            headers=headers,
+            timeout=settings.WEBHOOK_TIMEOUT,
+            # Um redirect poderia levar a entrega para a rede interna
+            allow_redirects=False,
+        )
+    except requests.RequestException as e:
+        return RETRY, str(e)
+
+    if 200 <= response.status_code < 300:
+        return DELIVERED, response.status_code
+    if response.status_code == 429 or response.status_code >= 500:
+        return RETRY, response.status_code
+    return REJECTED, response.status_code
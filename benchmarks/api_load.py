@@ -0,0 +1,304 @@
+"""Teste de carga HTTP da API (AnalysisTriggerView e AnalysisStatusView).
+
+Reproduz uma mistura de tráfego realista — acertos de cache, análises novas,
+rajadas de requisições duplicadas e polling de status — e reporta vazão,
+percentis de latência por tipo de requisição e operações de Redis/cache por
+requisição.
+
+Sem --base-url, a aplicação roda no próprio processo (servidor WSGI do Django,
+worker Celery em thread e stubs dos provedores), com um cache local que conta
+as operações feitas durante as requisições. Com --base-url, o alvo é um
+ambiente já no ar (ex.: docker compose apontado para `python -m
+benchmarks.stubs`) e, com --redis-url, as operações vêm do INFO do Redis.
+
+Uso:
+    python -m benchmarks.api_load --duration 30 --concurrency 32 \\
+        --mix hit=0.6,miss=0.1,burst=0.1,poll=0.2
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import requests
+
+from benchmarks.counting_cache import cache_operations, counting_app
+from benchmarks.pipeline_bench import percentile
+
+API_PREFIX = "/api/v1"
+DEFAULT_MIX = "hit=0.6,miss=0.1,burst=0.1,poll=0.2"
+
+class InProcessApp:
+    """Servidor WSGI do Django + worker Celery + stubs, tudo no mesmo processo."""
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._stack = []
+
+    def __enter__(self):
+        os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+        os.environ.setdefault("SECRET_KEY", "benchmark")
+        os.environ["ANON_THROTTLE_RATE"] = "100000000/min"
+        os.environ["CELERY_BROKER_URL"] = "memory://"
+        os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+
+        import django
+
+        django.setup()
+        logging.getLogger("django.server").setLevel(logging.ERROR)
+        logging.getLogger("analysis").setLevel(logging.ERROR)
+
+        from celery.contrib.testing.worker import start_worker
+        from django.conf import settings
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+        from django.core.wsgi import get_wsgi_application
+
+        from benchmarks.stubs import configure_settings, start_stubs, stop_stubs
+        from core.celery import app as celery_app
+
+        settings.CACHES = {
+            "default": {"BACKEND": "benchmarks.counting_cache.CountingLocMemCache"}
+        }
+        self.stubs = start_stubs(seed=7)
+        configure_settings(self.stubs)
+        self._stack.append(lambda: stop_stubs(self.stubs))
+
+        worker = start_worker(
+            celery_app,
+            pool="threads",
+            concurrency=self.workers,
+            loglevel="CRITICAL",
+            perform_ping_check=False,
+        )
+        worker.__enter__()
+        self._stack.append(lambda: worker.__exit__(None, None, None))
+
+        self.server = ThreadedWSGIServer(("127.0.0.1", 0), WSGIRequestHandler)
+        self.server.daemon_threads = True
+        self.server.set_app(counting_app(get_wsgi_application()))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self._stack.append(self.server.shutdown)
+
+        host, port = self.server.server_address[:2]
+        self.base_url = f"http://{host}:{port}"
+        return self
+
+    def __exit__(self, *exc):
+        while self._stack:
+            self._stack.pop()()
+
+    def cache_operations(self):
+        return cache_operations()
+
+
+class RedisCommandCounter:
+    def __init__(self, redis_url):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_url)
+
+    def cache_operations(self):
+        # Desconta o próprio comando INFO
+        return self.client.info("stats")["total_commands_processed"] - 1
+
+
+class LoadGenerator:
+    def __init__(self, base_url, mix, hot_urls, burst_size=5):
+        self.base_url = base_url.rstrip("/")
+        self.kinds, weights = zip(*mix.items())
+        self.weights = weights
+        self.hot_urls = hot_urls
+        self.burst_size = burst_size
+
+        self.latencies = defaultdict(list)
+        self.status_codes = Counter()
+        self.requests = 0
+        self.task_ids = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _record(self, kind, started, response):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.requests += 1
+            self.latencies[kind].append(elapsed)
+            self.status_codes[response.status_code if response is not None else "erro"] += 1
+
+    def trigger(self, url, kind):
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.base_url}{API_PREFIX}/analysis/", json={"url": url}, timeout=30
+            )
+        except requests.RequestException:
+            self._record(kind, started, None)
+            return None
+        self._record(kind, started, response)
+        if response.status_code == 202:
+            task_id = response.json().get("task_id")
+            with self._lock:
+                self.task_ids.append(task_id)
+                del self.task_ids[:-1000]
+            return task_id
+        return None
+
+    def status(self, task_id, kind="poll"):
+        started = time.perf_counter()
+        try:
+            response = self.session.get(
+                f"{self.base_url}{API_PREFIX}/analysis/status/{task_id}", timeout=30
+            )
+        except requests.RequestException:
+            self._record(kind, started, None)
+            return None
+        self._record(kind, started, response)
+        return response.json() if response.ok else None
+
+    def one(self, rng):
+        kind = rng.choices(self.kinds, self.weights)[0]
+        if kind == "hit":
+            self.trigger(rng.choice(self.hot_urls), "hit")
+        elif kind == "miss":
+            self.trigger(f"https://noticias.example/{uuid.uuid4().hex}", "miss")
+        elif kind == "burst":
+            url = f"https://viral.example/{uuid.uuid4().hex}"
+            threads = [
+                threading.Thread(target=self.trigger, args=(url, "burst"))
+                for _ in range(self.burst_size)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        elif kind == "poll":
+            with self._lock:
+                task_id = rng.choice(self.task_ids) if self.task_ids else None
+            if task_id:
+                self.status(task_id)
+            else:
+                self.trigger(rng.choice(self.hot_urls), "hit")
+
+    def warm_up(self, timeout=120):
+        pending = [task_id for task_id in map(lambda u: self.trigger(u, "warmup"), self.hot_urls) if task_id]
+        deadline = time.monotonic() + timeout
+        while pending and time.monotonic() < deadline:
+            pending = [
+                task_id
+                for task_id in pending
+                if (self.status(task_id, "warmup") or {}).get("state")
+                not in ("SUCCESS", "FAILURE")
+            ]
+            time.sleep(0.2)
+        self.latencies.pop("warmup", None)
+        self.requests = 0
+        self.status_codes.clear()
+        return not pending
+
+    def run(self, duration, concurrency, rate=None, seed=0):
+        stop_at = time.monotonic() + duration
+        interval = concurrency / rate if rate else 0
+
+        def loop(worker_index):
+            rng = random.Random(seed + worker_index)
+            next_at = time.monotonic()
+            while time.monotonic() < stop_at:
+                self.one(rng)
+                if interval:
+                    next_at += interval
+                    time.sleep(max(0.0, next_at - time.monotonic()))
+
+        threads = [threading.Thread(target=loop, args=(i,)) for i in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+
+def _parse_mix(spec):
+    mix = {}
+    for part in spec.split(","):
+        kind, _, weight = part.partition("=")
+        mix[kind.strip()] = float(weight)
+    unknown = set(mix) - {"hit", "miss", "burst", "poll"}
+    if unknown:
+        raise SystemExit(f"Tipos de tráfego desconhecidos: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", help="Alvo já em execução (ex.: http://localhost:8000)")
+    parser.add_argument("--redis-url", help="Conta operações pelo INFO deste Redis")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, help="Requisições/s alvo (malha aberta)")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--hot-urls", type=int, default=50)
+    parser.add_argument("--burst-size", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4, help="Workers Celery locais")
+    args = parser.parse_args(argv)
+
+    hot_urls = [f"https://g1.example/noticia/{i}" for i in range(args.hot_urls)]
+
+    if args.base_url:
+        target = None
+        base_url = args.base_url
+    else:
+        target = InProcessApp(workers=args.workers).__enter__()
+        base_url = target.base_url
+
+    counter = RedisCommandCounter(args.redis_url) if args.redis_url else target
+
+    # Os prints das views no processo local poluiriam o relatório
+    quiet = contextlib.redirect_stdout(io.StringIO()) if target else contextlib.nullcontext()
+    try:
+        with quiet:
+            generator = LoadGenerator(
+                base_url, _parse_mix(args.mix), hot_urls, args.burst_size
+            )
+            warmed = generator.warm_up()
+
+            ops_before = counter.cache_operations() if counter else 0
+            cpu_before = time.process_time()
+            wall = generator.run(args.duration, args.concurrency, args.rate)
+            cpu = time.process_time() - cpu_before
+            ops = (counter.cache_operations() - ops_before) if counter else None
+    finally:
+        if target:
+            target.__exit__(None, None, None)
+
+    if not warmed:
+        print("Aviso: nem todas as URLs quentes terminaram o aquecimento.")
+
+    total = generator.requests
+    print(f"{total} requisições em {wall:.1f}s -> {total / wall:.0f} req/s (cpu={cpu / wall:.0%})")
+    for kind, samples in sorted(generator.latencies.items()):
+        print(
+            f"  {kind:<6} n={len(samples):<7} p50={percentile(samples, 50) * 1000:7.2f}ms "
+            f"p95={percentile(samples, 95) * 1000:7.2f}ms "
+            f"p99={percentile(samples, 99) * 1000:7.2f}ms"
+        )
+    print("  status HTTP:", dict(generator.status_codes))
+    if ops is not None and total:
+        print(f"  operações de Redis/cache por requisição: {ops / total:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+"""Compara o caminho WSGI (gunicorn) com o ASGI (uvicorn + views assíncronas).
+
+Sobe cada servidor como subprocesso apontado para o mesmo Redis, abre N
+conexões simultâneas com um cliente httpx assíncrono e mede requisições/s,
+latências p50/p99 e a memória residente (soma do RSS de toda a árvore de
+processos do servidor) por conexão concorrente. O tráfego mistura acertos de
+cache no disparo e consultas de status com long-poll (?wait=N) de tasks que
+nunca terminam; no WSGI a view síncrona ignora o ?wait e responde na hora,
+então a diferença aparece na memória por conexão e na vazão sob muitas
+conexões abertas.
+
+Precisa de um Redis acessível (ex.: o do docker compose, em localhost:6380);
+não precisa de worker Celery nem das APIs externas.
+
+Uso:
+    python -m benchmarks.asgi_vs_wsgi --redis-url redis://localhost:6380 \\
+        --connections 64,256,1024 --duration 15 --wait 2
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import httpx
+
+from benchmarks.pipeline_bench import percentile
+
+API_PREFIX = "/api/v1"
+HOT_REPORT = {
+    "url": "https://g1.example/noticia",
+    "final_verdict": {"verdict": "CONFIÁVEL", "recommendation": "CONFIE NO CONTEÚDO"},
+}
+
+
+def server_command(kind, port, workers, threads):
+    if kind == "asgi":
+        return [
+            sys.executable, "-m", "uvicorn", "core.asgi:application",
+            "--port", str(port), "--workers", str(workers), "--no-access-log",
+            "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "gunicorn", "core.wsgi:application",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(workers),
+        "--threads", str(threads), "--log-level", "warning",
+    ]
+
+
+def server_environment(redis_url, kind):
+    redis_url = redis_url.rstrip("/")
+    return {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "core.settings",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+        "REDIS_URL": f"{redis_url}/1",
+        "CELERY_BROKER_URL": f"{redis_url}/0",
+        "CELERY_RESULT_BACKEND": f"{redis_url}/2",
+        "ANON_THROTTLE_RATE": "100000000/min",
+        "ASYNC_API": "1" if kind == "asgi" else "0",
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid):
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children += [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    return children
+
+
+def tree_rss_bytes(pid):
+    """RSS somado do processo e de todos os descendentes (Linux, via /proc)."""
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+        pending += _children(current)
+    return total
+
+
+class RssSampler:
+    def __init__(self, pid, interval=0.2):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss_bytes(self.pid))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class Server:
+    def __init__(self, kind, redis_url, workers, threads):
+        self.kind = kind
+        self.port = _free_port()
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            server_command(kind, self.port, workers, threads),
+            env=server_environment(redis_url, kind),
+            start_new_session=True,
+        )
+
+    def wait_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise SystemExit(f"{self.kind}: o servidor saiu com código {self.process.returncode}")
+            try:
+                httpx.get(f"{self.base_url}{API_PREFIX}/analysis/status/ready", timeout=1)
+                return
+            except httpx.HTTPError:
+                time.sleep(0.2)
+        raise SystemExit(f"{self.kind}: o servidor não respondeu em {timeout}s")
+
+    def stop(self):
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+
+
+def seed_cache(redis_url, hot_urls):
+    """Grava relatórios prontos para as URLs quentes no cache do Django."""
+    os.environ.update(server_environment(redis_url, "wsgi"))
+    import django
+
+    django.setup()
+    from django.core.cache import cache
+
+    from analysis.caching import report_cache_key
+    from analysis.util.fastjson import encode_report
+
+    for url in hot_urls:
+        cache.set(
+            report_cache_key(url), encode_report({**HOT_REPORT, "url": url}), timeout=3600
+        )
+
+
+async def drive(base_url, connections, duration, wait, hot_urls):
+    latencies = {"trigger": [], "status": []}
+    status_codes = {}
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=wait + 30) as client:
+
+        async def connection(index):
+            count = 0
+            while time.monotonic() < stop_at:
+                count += 1
+                if count % 2:
+                    kind = "trigger"
+                    request = client.post(
+                        f"{API_PREFIX}/analysis/",
+                        json={"url": hot_urls[(index + count) % len(hot_urls)]},
+                    )
+                else:
+                    kind = "status"
+                    request = client.get(
+                        f"{API_PREFIX}/analysis/status/{uuid.uuid4()}",
+                        params={"wait": wait} if wait else None,
+                    )
+                started = time.perf_counter()
+                try:
+                    response = await request
+                    code = response.status_code
+                except httpx.HTTPError:
+                    code = "erro"
+                latencies[kind].append(time.perf_counter() - started)
+                status_codes[code] = status_codes.get(code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(connection(i) for i in range(connections)))
+        wall = time.perf_counter() - started
+
+    return wall, latencies, status_codes
+
+
+def run_level(server, connections, duration, wait, hot_urls):
+    idle_rss = tree_rss_bytes(server.process.pid)
+    with RssSampler(server.process.pid) as sampler:
+        wall, latencies, status_codes = asyncio.run(
+            drive(server.base_url, connections, duration, wait, hot_urls)
+        )
+    total = sum(len(samples) for samples in latencies.values())
+    return {
+        "server": server.kind,
+        "connections": connections,
+        "requests_per_second": round(total / wall, 1),
+        "p50": {kind: round(percentile(s, 50), 4) for kind, s in latencies.items()},
+        "p99": {kind: round(percentile(s, 99), 4) for kind, s in latencies.items()},
+        "idle_rss_bytes": idle_rss,
+        "peak_rss_bytes": sampler.peak,
+        "rss_per_connection_bytes": max(0, sampler.peak - idle_rss) // connections,
+        "status_codes": status_codes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379")
+    parser.add_argument("--servers", default="wsgi,asgi")
+    parser.add_argument("--connections", default="64,256,1024")
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--wait", type=float, default=2, help="Long-poll do status (s)")
+    parser.add_argument("--workers", type=int, default=2, help="Processos por servidor")
+    parser.add_argument("--threads", type=int, default=8, help="Threads por processo (gunicorn)")
+    parser.add_argument("--hot-urls", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    hot_urls = [f"https://g1.example/noticia/{i}" for i in range(args.hot_urls)]
+    seed_cache(args.redis_url, hot_urls)
+
+    for kind in args.servers.split(","):
+        server = Server(kind, args.redis_url, args.workers, args.threads)
+        try:
+            server.wait_ready()
+            for connections in (int(c) for c in args.connections.split(",")):
+                result = run_level(server, connections, args.duration, args.wait, hot_urls)
+                print(
+                    f"{kind:<4} conexões={connections:<5} "
+                    f"{result['requests_per_second']:>8.1f} req/s  "
+                    f"p50 disparo={result['p50']['trigger'] * 1000:.1f}ms "
+                    f"status={result['p50']['status'] * 1000:.1f}ms  "
+                    f"p99 disparo={result['p99']['trigger'] * 1000:.1f}ms "
+                    f"status={result['p99']['status'] * 1000:.1f}ms  "
+                    f"RSS={result['peak_rss_bytes'] / 2**20:.0f}MB "
+                    f"({result['rss_per_connection_bytes'] / 1024:.1f}KB/conexão)  "
+                    f"HTTP={result['status_codes']}"
+                )
+        finally:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
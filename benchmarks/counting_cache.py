@@ -0,0 +1,59 @@
+"""Cache local que conta as operações feitas durante requisições HTTP."""
+
+import threading
+from collections import Counter
+
+from django.core.cache.backends.locmem import LocMemCache
+
+_request_context = threading.local()
+_cache_ops = Counter()
+_cache_ops_lock = threading.Lock()
+
+
+class CountingLocMemCache(LocMemCache):
+    """LocMemCache que conta as operações feitas dentro das requisições HTTP."""
+
+    def _count(self, operation):
+        if getattr(_request_context, "active", False):
+            with _cache_ops_lock:
+                _cache_ops[operation] += 1
+
+    def get(self, *args, **kwargs):
+        self._count("get")
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self._count("set")
+        return super().set(*args, **kwargs)
+
+    def add(self, *args, **kwargs):
+        self._count("add")
+        return super().add(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        self._count("delete")
+        return super().delete(*args, **kwargs)
+
+    def incr(self, *args, **kwargs):
+        self._count("incr")
+        return super().incr(*args, **kwargs)
+
+    def touch(self, *args, **kwargs):
+        self._count("touch")
+        return super().touch(*args, **kwargs)
+
+
+def counting_app(app):
+    def wrapped(environ, start_response):
+        _request_context.active = True
+        try:
+            return app(environ, start_response)
+        finally:
+            _request_context.active = False
+
+    return wrapped
+
+
+def cache_operations():
+    with _cache_ops_lock:
+        return sum(_cache_ops.values())
@@ -0,0 +1,181 @@
+"""Velocidade do extrator local de artigos e concordância com o Firecrawl.
+
+Offline (padrão), roda o extrator sobre o corpus de HTMLs salvos em
+`analysis/services/credibility/tests/fixtures` e compara o texto com o
+markdown do Firecrawl guardado ao lado (`<nome>.firecrawl.md`). Com --urls,
+baixa páginas reais e chama o Firecrawl de verdade (precisa de KEY_FIRECRAWL),
+medindo a latência dos dois caminhos.
+
+A concordância é o F1 entre as palavras dos dois textos, depois da mesma
+limpeza aplicada ao conteúdo que vai para a LLM.
+
+Uso:
+    python -m benchmarks.extraction_bench --repeat 200
+    python -m benchmarks.extraction_bench --urls urls.txt --json resultado.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.pipeline_bench import percentile
+
+CORPUS_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "analysis" / "services" / "credibility" / "tests" / "fixtures"
+)
+
+
+def content_agreement(local, reference):
+    """Precisão, cobertura e F1 entre as palavras dos dois textos."""
+    local_words = Counter(local.lower().split())
+    reference_words = Counter(reference.lower().split())
+    common = sum((local_words & reference_words).values())
+    if not common:
+        return {"precision": 0.0, "recall": 0.0, "f1": 0.0}
+    precision = common / sum(local_words.values())
+    recall = common / sum(reference_words.values())
+    return {
+        "precision": round(precision, 3),
+        "recall": round(recall, 3),
+        "f1": round(2 * precision * recall / (precision + recall), 3),
+    }
+
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    with open(Path(corpus_dir) / "corpus.json") as f:
+        entries = json.load(f)
+    for entry in entries:
+        path = Path(corpus_dir) / entry["file"]
+        entry["html"] = path.read_bytes().decode(entry.get("encoding", "utf-8"))
+        snapshot = path.with_suffix(".firecrawl.md")
+        entry["firecrawl_markdown"] = snapshot.read_text() if snapshot.exists() else None
+    return entries
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+
+def run_offline(corpus_dir, repeat):
+    from analysis.services.credibility.local_extractor import extract_article, quality_problem
+    from analysis.util.clean import clean_content
+
+    results = []
+    for entry in load_corpus(corpus_dir):
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            article = extract_article(entry["html"], entry["url"])
+            durations.append(time.perf_counter() - start)
+
+        result = {
+            "file": entry["file"],
+            "bytes": len(entry["html"].encode()),
+            "problem": quality_problem(article),
+            "p50_ms": round(percentile(durations, 50) * 1000, 3),
+            "p99_ms": round(percentile(durations, 99) * 1000, 3),
+        }
+        result["mb_per_second"] = round(result["bytes"] / 2**20 / percentile(durations, 50), 1)
+        if entry["firecrawl_markdown"] is not None:
+            result["agreement"] = content_agreement(
+                article.content, clean_content(entry["firecrawl_markdown"])
+            )
+        results.append(result)
+    return results
+
+
+def run_live(urls):
+    from analysis.services.credibility._firecrawl import extract_content_firecrawl
+    from analysis.services.credibility.local_extractor import (
+        LowQualityExtraction,
+        extract_article,
+        fetch_html,
+        quality_problem,
+    )
+
+    results = []
+    for url in urls:
+        result = {"url": url}
+        start = time.perf_counter()
+        try:
+            html, final_url, _ = fetch_html(url)
+            article = extract_article(html, final_url)
+            result["problem"] = quality_problem(article)
+        except LowQualityExtraction as e:
+            article = None
+            result["problem"] = e.reason
+        except Exception as e:
+            article = None
+            result["problem"] = f"erro: {e}"
+        result["local_seconds"] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        try:
+            firecrawl = extract_content_firecrawl(url)
+        except Exception as e:
+            firecrawl = None
+            result["firecrawl_error"] = str(e)
+        result["firecrawl_seconds"] = round(time.perf_counter() - start, 3)
+
+        if article is not None and firecrawl is not None:
+            result["agreement"] = content_agreement(article.content, firecrawl["content"])
+            result["same_title"] = article.title.strip() == firecrawl["title"].strip()
+        results.append(result)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=str(CORPUS_DIR))
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--urls", help="Arquivo com uma URL por linha (modo ao vivo)")
+    parser.add_argument("--json", help="Grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    setup_django()
+
+    if args.urls:
+        with open(args.urls) as f:
+            urls = [line.strip() for line in f if line.strip()]
+        results = run_live(urls)
+        for result in results:
+            agreement = result.get("agreement", {}).get("f1", "-")
+            print(
+                f"{result['url']}\n  local={result['local_seconds']:.2f}s "
+                f"({result['problem'] or 'ok'})  firecrawl={result['firecrawl_seconds']:.2f}s  "
+                f"F1={agreement}"
+            )
+        local_ok = [r for r in results if r["problem"] is None]
+        print(f"Extração local aproveitada em {len(local_ok)}/{len(results)} URLs")
+    else:
+        results = run_offline(args.corpus, args.repeat)
+        for result in results:
+            agreement = result.get("agreement")
+            print(
+                f"{result['file']:<24} {result['p50_ms']:7.2f}ms p50 {result['p99_ms']:7.2f}ms p99 "
+                f"{result['mb_per_second']:6.1f}MB/s  {result['problem'] or 'ok':<12}"
+                + (
+                    f" F1={agreement['f1']:.3f} (precisão {agreement['precision']:.3f},"
+                    f" cobertura {agreement['recall']:.3f})"
+                    if agreement
+                    else ""
+                )
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
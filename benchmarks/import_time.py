@@ -0,0 +1,141 @@
+"""Tempo de import e memória na subida do processo web (`python -X importtime`).
+
+Sobe o Django como o servidor web faz (settings, apps, URLconf e as views
+carregadas) num subprocesso com `-X importtime`, e reporta o tempo total de
+import, os pacotes mais caros e o RSS ao final. Falha (código de saída 1) se
+algum SDK de provedor for importado pelo processo web ou, com --baseline, se o
+tempo ou a memória piorarem além da tolerância.
+
+Uso:
+    python -m benchmarks.import_time --repeat 5 --json atual.json --baseline baseline.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+# Só os workers Celery precisam destes módulos
+WORKER_ONLY_MODULES = ("google.genai", "firecrawl", "analysis.tasks")
+
+WEB_STARTUP = """
+import json, resource, sys
+from core.{entrypoint} import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({{
+    "rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr):
+    """Linhas do -X importtime -> {módulo: (self_us, cumulative_us, nível)}."""
+    imports = {}
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports[module] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return imports
+
+
+def measure_startup(entrypoint="wsgi"):
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "core.settings",
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WEB_STARTUP.format(entrypoint=entrypoint)],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    imports = parse_importtime(result.stderr)
+    output = json.loads(result.stdout.strip().splitlines()[-1])
+    return {
+        "import_seconds": sum(self_us for self_us, _, _ in imports.values()) / 1e6,
+        "rss_bytes": output["rss_bytes"],
+        "modules": output["modules"],
+        "imports": imports,
+    }
+
+
+def worker_only_imports(modules):
+    return [
+        worker_module
+        for worker_module in WORKER_ONLY_MODULES
+        if any(name == worker_module or name.startswith(f"{worker_module}.") for name in modules)
+    ]
+
+
+def top_packages(imports, limit):
+    # Tempo próprio somado por pacote de primeiro nível (django, celery, ...)
+    totals = Counter()
+    for module, (self_us, _, _) in imports.items():
+        totals[module.split(".")[0]] += self_us
+    return [(us, package) for package, us in totals.most_common(limit)]
+
+
+def compare_with_baseline(result, baseline, tolerance):
+    regressions = []
+    for metric in ("import_seconds", "rss_bytes"):
+        if result[metric] > baseline[metric] * (1 + tolerance):
+            regressions.append(f"{metric}: {result[metric]} > baseline {baseline[metric]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entrypoint", choices=("wsgi", "asgi"), default="wsgi")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo")
+    parser.add_argument("--baseline", help="Resultados anteriores para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args(argv)
+
+    runs = [measure_startup(args.entrypoint) for _ in range(args.repeat)]
+    # Mediana: o -X importtime oscila bastante entre execuções
+    result = {
+        "entrypoint": args.entrypoint,
+        "import_seconds": round(statistics.median(r["import_seconds"] for r in runs), 4),
+        "rss_bytes": int(statistics.median(r["rss_bytes"] for r in runs)),
+        "modules": len(runs[-1]["modules"]),
+    }
+
+    print(
+        f"{args.entrypoint}: imports={result['import_seconds'] * 1000:.0f}ms "
+        f"RSS={result['rss_bytes'] / 2**20:.0f}MB módulos={result['modules']}"
+    )
+    for self_us, package in top_packages(runs[-1]["imports"], args.top):
+        print(f"  {self_us / 1000:8.1f}ms  {package}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+    failures = [
+        f"módulo exclusivo dos workers importado pelo processo web: {name}"
+        for name in worker_only_imports(runs[-1]["modules"])
+    ]
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures += compare_with_baseline(result, json.load(f), args.tolerance)
+    if failures:
+        print("REGRESSÃO NA SUBIDA DO PROCESSO WEB:\n  " + "\n  ".join(failures))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
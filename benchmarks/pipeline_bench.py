@@ -0,0 +1,207 @@
+"""Benchmark ponta a ponta do run_full_analysis_task contra stubs locais.
+
+Sobe stubs HTTP para Firecrawl, VirusTotal, Fact Check e Gemini, roda o
+pipeline completo em diferentes níveis de concorrência e reporta análises/s,
+latências p50/p95/p99, taxa de erros e ocupação dos workers. Com --baseline,
+funciona como gate de regressão (código de saída 1 se piorar além da
+tolerância).
+
+Uso:
+    python -m benchmarks.pipeline_bench --concurrency 1,4,16 --analyses 200 \\
+        --latency gemini=lognormal:0.8:0.4 --rate-limit virustotal=0.02 \\
+        --json resultado.json --baseline baseline.json
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+
+DEFAULT_LATENCIES = {
+    "firecrawl": "lognormal:0.5:0.3",
+    "virustotal": "uniform:0.05:0.2",
+    "fact_check": "uniform:0.05:0.2",
+    "gemini": "lognormal:0.8:0.4",
+}
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def _parse_pairs(values, cast=str):
+    parsed = {}
+    for value in values or []:
+        name, _, spec = value.partition("=")
+        parsed[name.strip()] = cast(spec.strip())
+    return parsed
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+
+    # Sem Redis: cache local e tarefas auxiliares executadas no próprio processo
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    from core.celery import app
+
+    app.conf.task_always_eager = True
+    logging.getLogger("analysis").setLevel(logging.ERROR)
+
+
+def run_level(task, concurrency, analyses):
+    durations = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(index):
+        nonlocal errors
+        url = f"https://noticias.example/{uuid.uuid4().hex}/{index}"
+        start = time.perf_counter()
+        try:
+            task(url, f"bench:{uuid.uuid4().hex}")
+            ok = True
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - start
+        with lock:
+            durations.append(elapsed)
+            if not ok:
+                errors += 1
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(analyses)))
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "concurrency": concurrency,
+        "analyses": analyses,
+        "errors": errors,
+        "wall_seconds": round(wall, 3),
+        "analyses_per_second": round(analyses / wall, 3),
+        "p50": round(percentile(durations, 50), 4),
+        "p95": round(percentile(durations, 95), 4),
+        "p99": round(percentile(durations, 99), 4),
+        "worker_utilization": round(sum(durations) / (wall * concurrency), 3),
+        "cpu_utilization": round(cpu / wall, 3),
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    regressions = []
+    by_level = {item["concurrency"]: item for item in baseline.get("levels", [])}
+    for result in results:
+        reference = by_level.get(result["concurrency"])
+        if not reference:
+            continue
+        if result["analyses_per_second"] < reference["analyses_per_second"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"c={result['concurrency']}: vazão {result['analyses_per_second']}/s "
+                f"< baseline {reference['analyses_per_second']}/s"
+            )
+        if result["p95"] > reference["p95"] * (1 + tolerance):
+            regressions.append(
+                f"c={result['concurrency']}: p95 {result['p95']}s "
+                f"> baseline {reference['p95']}s"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    parser.add_argument("--analyses", type=int, default=100)
+    parser.add_argument("--latency", action="append", help="provedor=dist:params")
+    parser.add_argument("--error-rate", action="append", help="provedor=fração")
+    parser.add_argument("--rate-limit", action="append", help="provedor=fração de 429")
+    parser.add_argument("--quota", action="append", help="provedor=requisições/s")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="Grava os resultados neste arquivo")
+    parser.add_argument("--baseline", help="Resultados anteriores para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    setup_django()
+
+    from analysis.tasks import run_full_analysis_task
+    from benchmarks.stubs import (
+        Latency,
+        StubBehavior,
+        configure_settings,
+        start_stubs,
+        stop_stubs,
+    )
+
+    latencies = {**DEFAULT_LATENCIES, **_parse_pairs(args.latency)}
+    error_rates = _parse_pairs(args.error_rate, float)
+    rate_limits = _parse_pairs(args.rate_limit, float)
+    quotas = _parse_pairs(args.quota, float)
+    behaviors = {
+        name: StubBehavior(
+            latency=Latency.parse(latencies[name]),
+            error_rate=error_rates.get(name, 0.0),
+            rate_limit_rate=rate_limits.get(name, 0.0),
+            quota_per_second=quotas.get(name, 0.0),
+        )
+        for name in DEFAULT_LATENCIES
+    }
+
+    stubs = start_stubs(behaviors, seed=args.seed)
+    configure_settings(stubs)
+
+    results = []
+    try:
+        for concurrency in (int(c) for c in args.concurrency.split(",")):
+            result = run_level(run_full_analysis_task, concurrency, args.analyses)
+            results.append(result)
+            print(
+                f"c={concurrency:<3} {result['analyses_per_second']:>8.2f} análises/s  "
+                f"p50={result['p50']:.3f}s p95={result['p95']:.3f}s "
+                f"p99={result['p99']:.3f}s erros={result['errors']} "
+                f"ocupação={result['worker_utilization']:.0%} "
+                f"cpu={result['cpu_utilization']:.0%}"
+            )
+    finally:
+        stop_stubs(stubs)
+
+    provider_stats = {name: stub.stats for name, stub in stubs.items()}
+    print("requisições aos stubs:", json.dumps(provider_stats))
+
+    output = {"levels": results, "providers": provider_stats}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.tolerance)
+        if regressions:
+            print("REGRESSÃO DE DESEMPENHO:\n  " + "\n  ".join(regressions))
+            return 1
+        print("Sem regressões em relação ao baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
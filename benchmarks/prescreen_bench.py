@@ -0,0 +1,166 @@
+"""Acurácia e latência da triagem local que dispensa a chamada ao Gemini.
+
+Treina o classificador em parte das amostras e avalia no restante
+(validação cruzada em --folds partes): acurácia, fração de análises em que a
+LLM seria dispensada e dispensas indevidas (a LLM teria recomendado cautela)
+para cada limite em --thresholds, além da latência da predição por artigo.
+
+Sem --dataset, usa um corpus sintético (notícias de rotina x correntes
+sensacionalistas); para números reais, exporte os vereditos guardados com
+`manage.py train_prescreen --export vereditos.jsonl`.
+
+Uso:
+    python -m benchmarks.prescreen_bench --synthetic 2000
+    python -m benchmarks.prescreen_bench --dataset vereditos.jsonl --thresholds 0.02,0.05,0.1
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+from benchmarks.pipeline_bench import percentile
+
+ROUTINE = [
+    "A prefeitura informou que as obras na avenida principal seguem o cronograma previsto.",
+    "Segundo o instituto, a inflação do mês ficou dentro das expectativas do mercado.",
+    "O campeonato estadual terá a rodada final disputada no próximo domingo.",
+    "As inscrições para o concurso podem ser feitas pelo site oficial até sexta-feira.",
+    "A secretaria de saúde ampliou o horário de vacinação nas unidades básicas.",
+    "O tribunal marcou para a próxima semana o julgamento do recurso apresentado.",
+    "Pesquisadores da universidade publicaram o estudo em uma revista científica.",
+    "A companhia divulgou o balanço trimestral com alta moderada na receita.",
+]
+SENSATIONAL = [
+    "URGENTE!!! Compartilhe antes que apaguem este vídeo chocante!",
+    "A mídia esconde a verdade que ninguém tem coragem de contar!",
+    "Cura milagrosa que os médicos não querem que você conheça!",
+    "Divulgue para todos os seus grupos, é a maior farsa da história!",
+    "BOMBA: documento secreto revelado prova o golpe!",
+    "Atenção! Isso foi censurado em todos os jornais, repasse agora!",
+    "Inacreditável o que descobriram, o segredo finalmente exposto!",
+]
+
+
+def synthetic_samples(count, seed=0, noise=0.1):
+    """Amostras rotuladas; noise troca o estilo de parte dos textos."""
+    from analysis.services.prescreen import LabeledSample
+
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        risky = int(rng.random() < 0.35)
+        style = risky if rng.random() >= noise else 1 - risky
+        source = SENSATIONAL if style else ROUTINE
+        sentences = [rng.choice(source) for _ in range(rng.randint(6, 30))]
+        sentences += [rng.choice(ROUTINE) for _ in range(rng.randint(0, 6))]
+        rng.shuffle(sentences)
+        trusted = rng.random() < (0.15 if risky else 0.6)
+        samples.append(LabeledSample(" ".join(sentences), risky, trusted))
+    return samples
+
+
+def cross_validate(samples, folds, thresholds, epochs=15, seed=0):
+    from analysis.services.prescreen import train_model
+
+    samples = list(samples)
+    random.Random(seed).shuffle(samples)
+    results = {"train_seconds": [], "latencies": [], "scored": []}
+
+    for fold in range(folds):
+        holdout = samples[fold::folds]
+        train = [sample for i, sample in enumerate(samples) if i % folds != fold]
+
+        start = time.perf_counter()
+        model = train_model(train, epochs=epochs, seed=seed)
+        results["train_seconds"].append(time.perf_counter() - start)
+
+        for sample in holdout:
+            start = time.perf_counter()
+            score = model.risk_score(sample.content, sample.trusted_domain)
+            results["latencies"].append(time.perf_counter() - start)
+            results["scored"].append((score, sample))
+
+    scored = results["scored"]
+    total = len(scored)
+    summary = {
+        "samples": total,
+        "folds": folds,
+        "accuracy": round(
+            sum((score >= 0.5) == bool(sample.risky) for score, sample in scored) / total, 4
+        ),
+        "train_seconds_mean": round(sum(results["train_seconds"]) / folds, 3),
+        "predict_us_p50": round(percentile(results["latencies"], 50) * 1e6, 1),
+        "predict_us_p99": round(percentile(results["latencies"], 99) * 1e6, 1),
+        "thresholds": {},
+    }
+    for threshold in thresholds:
+        for trusted_only in (True, False):
+            skipped = [
+                sample
+                for score, sample in scored
+                if score <= threshold and (sample.trusted_domain or not trusted_only)
+            ]
+            summary["thresholds"][f"{threshold}{'/confiáveis' if trusted_only else ''}"] = {
+                "skip_rate": round(len(skipped) / total, 4),
+                "false_skips": sum(sample.risky for sample in skipped),
+                "false_skip_rate": round(
+                    sum(sample.risky for sample in skipped) / len(skipped), 4
+                )
+                if skipped
+                else 0.0,
+            }
+    return summary
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", help="Vereditos em JSON Lines")
+    parser.add_argument("--synthetic", type=int, default=2000, help="Amostras sintéticas")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--epochs", type=int, default=15)
+    parser.add_argument("--thresholds", default="0.02,0.05,0.1,0.2")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Salva o resultado neste arquivo")
+    args = parser.parse_args(argv)
+
+    setup_django()
+    from analysis.services.prescreen import read_dataset
+
+    if args.dataset:
+        samples = list(read_dataset(args.dataset))
+    else:
+        samples = synthetic_samples(args.synthetic, seed=args.seed)
+    thresholds = [float(value) for value in args.thresholds.split(",")]
+
+    summary = cross_validate(samples, args.folds, thresholds, args.epochs, args.seed)
+
+    print(
+        f"{summary['samples']} amostras, {args.folds} partes: acurácia {summary['accuracy']:.1%}, "
+        f"treino {summary['train_seconds_mean']:.2f}s, predição "
+        f"p50={summary['predict_us_p50']:.0f}µs p99={summary['predict_us_p99']:.0f}µs"
+    )
+    for name, result in summary["thresholds"].items():
+        print(
+            f"  limite {name:<16} LLM dispensada em {result['skip_rate']:6.1%}  "
+            f"dispensas indevidas: {result['false_skips']} ({result['false_skip_rate']:.1%})"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
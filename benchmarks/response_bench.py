@@ -0,0 +1,129 @@
+"""Latência e CPU por requisição do cache hit em POST /api/v1/analysis/.
+
+Compara o formato antigo (relatório guardado como dict, desserializado pelo
+django-redis e codificado de novo pelo JSONRenderer do DRF) com o atual
+(bytes JSON gravados pelo worker e copiados para a resposta pelo
+FastJSONRenderer). Roda no próprio processo, com cache em memória que
+serializa com pickle como o django-redis, sem Redis nem rede.
+
+Uso:
+    python -m benchmarks.response_bench --requests 2000 --content-chars 20000,200000
+"""
+
+import argparse
+import json
+import os
+import time
+from unittest import mock
+
+from benchmarks.pipeline_bench import percentile
+
+URL = "https://noticias.example/politica/materia-longa"
+
+
+def sample_report(content_chars):
+    paragraph = "Texto da matéria com números, citações e acentuação — ação, pão. "
+    return {
+        "analysis_time_seconds": 12.4,
+        "final_verdict_source": "IA (LLM)",
+        "final_veredict": "PROSSIGA COM CAUTELA",
+        "virustotal_report": {
+            "status": "completed",
+            "stats": {"malicious": 0, "suspicious": 0, "harmless": 71, "undetected": 23},
+        },
+        "fact_check_report": {"claims": []},
+        "llm_analysis": {
+            "llm_summary": "Resumo " * 40,
+            "llm_risk_assessment": "Sem sinais relevantes. " * 10,
+            "llm_recommendation": "PROSSIGA COM CAUTELA",
+            "llm_model": "gemini-2.5-flash",
+        },
+        "firecrawl_data": {
+            "url": URL,
+            "title": "Matéria longa",
+            "content": (paragraph * (content_chars // len(paragraph) + 1))[:content_chars],
+        },
+        "cancelled_stages": [],
+        "resumed_stages": [],
+    }
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    import django
+
+    django.setup()
+
+
+def measure(view, stored, requests):
+    from django.core.cache import cache
+    from rest_framework.test import APIRequestFactory
+
+    from analysis.caching import report_cache_key
+
+    cache.set(report_cache_key(URL), stored, timeout=3600)
+    factory = APIRequestFactory()
+    latencies = []
+    size = 0
+    cpu_start = time.process_time()
+    for _ in range(requests):
+        request = factory.post("/api/v1/analysis/", {"url": URL}, format="json")
+        start = time.perf_counter()
+        response = view(request)
+        response.render()
+        latencies.append(time.perf_counter() - start)
+        size = len(response.content)
+    cpu = time.process_time() - cpu_start
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "cpu_ms_per_request": round(cpu / requests * 1000, 3),
+        "response_bytes": size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--content-chars", default="20000,200000")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    from analysis.renderers import FastJSONRenderer
+    from analysis.util.fastjson import encode_report
+    from analysis.view import analysis_view
+
+    results = []
+    locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    with override_settings(CACHES=locmem), mock.patch.object(
+        analysis_view, "record_request"
+    ), mock.patch.object(analysis_view.AnalysisTriggerView, "throttle_classes", []):
+        for chars in (int(value) for value in args.content_chars.split(",")):
+            report = sample_report(chars)
+            variants = {
+                "dict + JSONRenderer": (JSONRenderer, report),
+                "bytes + FastJSONRenderer": (FastJSONRenderer, encode_report(report)),
+            }
+            for label, (renderer, stored) in variants.items():
+                view = analysis_view.AnalysisTriggerView.as_view(renderer_classes=[renderer])
+                result = {"content_chars": chars, "variant": label}
+                result.update(measure(view, stored, args.requests))
+                results.append(result)
+                print(
+                    f"{chars:>8} chars  {label:<26} p50={result['p50_ms']:.3f}ms "
+                    f"p99={result['p99_ms']:.3f}ms cpu/req={result['cpu_ms_per_request']:.3f}ms "
+                    f"({result['response_bytes']} bytes)"
+                )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
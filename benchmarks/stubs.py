@@ -0,0 +1,354 @@
+"""Servidores HTTP locais que imitam Firecrawl, VirusTotal, Fact Check e Gemini.
+
+Cada stub tem latência, taxa de erro (HTTP 500) e comportamento de rate limit
+(HTTP 429 aleatório ou por cota de requisições/segundo) configuráveis, para
+exercitar o pipeline sem gastar cota das APIs reais.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+ARTICLE = (
+    "O governo anunciou nesta terça-feira um novo programa de incentivo ao "
+    "emprego, com previsão de abertura de vagas em diversas regiões do país. "
+    "Segundo o ministério, as inscrições começam no próximo mês e seguem até o "
+    "fim do ano. Especialistas ouvidos pela reportagem avaliam a medida. "
+) * 20
+
+
+@dataclass
+class Latency:
+    """Distribuição de latência em segundos: fixed, uniform ou lognormal."""
+
+    distribution: str = "fixed"
+    params: tuple = (0.0,)
+
+    @classmethod
+    def parse(cls, spec):
+        # "fixed:0.2", "uniform:0.1:0.5", "lognormal:<mediana>:<sigma>"
+        name, *values = spec.split(":")
+        return cls(name, tuple(float(v) for v in values))
+
+    def sample(self, rng):
+        if self.distribution == "fixed":
+            return self.params[0]
+        if self.distribution == "uniform":
+            return rng.uniform(*self.params)
+        if self.distribution == "lognormal":
+            median, sigma = self.params
+            return median * rng.lognormvariate(0, sigma)
+        raise ValueError(f"Distribuição desconhecida: {self.distribution}")
+
+
+@dataclass
+class StubBehavior:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    # Cota de requisições por segundo; acima dela o stub responde 429
+    quota_per_second: float = 0.0
+
+
+class _QuotaWindow:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._second = 0
+        self._count = 0
+
+    def exceeded(self, quota):
+        if not quota:
+            return False
+        now = int(time.monotonic())
+        with self._lock:
+            if now != self._second:
+                self._second = now
+                self._count = 0
+            self._count += 1
+            return self._count > quota
+
+
+class ProviderStub(ThreadingHTTPServer):
+    daemon_threads = True
+    name = "stub"
+
+    def __init__(self, behavior=None, seed=None, address=("127.0.0.1", 0)):
+        super().__init__(address, _StubHandler)
+        self.behavior = behavior or StubBehavior()
+        self.rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._quota = _QuotaWindow()
+        self._thread = None
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def decide(self):
+        with self._rng_lock:
+            delay = max(0.0, self.behavior.latency.sample(self.rng))
+            roll = self.rng.random()
+
+        if self._quota.exceeded(self.behavior.quota_per_second):
+            outcome = "rate_limited"
+        elif roll < self.behavior.rate_limit_rate:
+            outcome = "rate_limited"
+        elif roll < self.behavior.rate_limit_rate + self.behavior.error_rate:
+            outcome = "errors"
+        else:
+            outcome = "ok"
+
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            if outcome != "ok":
+                self.stats[outcome] += 1
+        return delay, outcome
+
+    def route(self, method, path, query, body):
+        raise NotImplementedError
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        delay, outcome = self.server.decide()
+        time.sleep(delay)
+
+        if outcome == "rate_limited":
+            self._send(429, {"error": {"code": 429, "message": "Quota exceeded"}})
+            return
+        if outcome == "errors":
+            self._send(500, {"error": {"code": 500, "message": "Stub failure"}})
+            return
+
+        parsed = urlparse(self.path)
+        status, payload = self.server.route(
+            method, parsed.path, parse_qs(parsed.query), raw_body
+        )
+        self._send(status, payload)
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FirecrawlStub(ProviderStub):
+    name = "firecrawl"
+
+    def route(self, method, path, query, body):
+        if method != "POST" or path != "/v2/scrape":
+            return 404, {"success": False, "error": "Not found"}
+        url = json.loads(body or b"{}").get("url", "")
+        return 200, {
+            "success": True,
+            "data": {
+                "markdown": f"# Notícia\n\n{ARTICLE}",
+                "metadata": {
+                    "title": "Governo anuncia programa de emprego",
+                    "description": "Programa prevê novas vagas",
+                    "url": url,
+                    "sourceURL": url,
+                    "statusCode": 200,
+                },
+            },
+        }
+
+
+class VirusTotalStub(ProviderStub):
+    name = "virustotal"
+
+    def route(self, method, path, query, body):
+        if method == "POST" and path.endswith("/urls"):
+            url = parse_qs(body.decode()).get("url", [""])[0]
+            analysis_id = "u-" + hashlib.sha256(url.encode()).hexdigest()[:32]
+            return 200, {"data": {"type": "analysis", "id": analysis_id}}
+
+        if method == "GET" and "/analyses/" in path:
+            return 200, {
+                "data": {
+                    "attributes": {
+                        "stats": {
+                            "harmless": 60,
+                            "malicious": 0,
+                            "suspicious": 0,
+                            "undetected": 30,
+                        },
+                        "status": "completed",
+                    }
+                },
+                "meta": {"url_info": {"url": "stub"}},
+            }
+        return 404, {"error": {"message": "Not found"}}
+
+
+class FactCheckStub(ProviderStub):
+    name = "fact_check"
+
+    def __init__(self, behavior=None, seed=None, address=("127.0.0.1", 0), claim_rate=0.2):
+        super().__init__(behavior, seed, address)
+        self.claim_rate = claim_rate
+
+    def route(self, method, path, query, body):
+        with self._rng_lock:
+            has_claim = self.rng.random() < self.claim_rate
+        if not has_claim:
+            return 200, {}
+        return 200, {
+            "claims": [
+                {
+                    "text": query.get("query", [""])[0],
+                    "claimant": "Redes sociais",
+                    "claimDate": "2025-10-01T00:00:00Z",
+                    "claimReview": [
+                        {
+                            "publisher": {"name": "Agência Stub"},
+                            "url": "https://checagem.example/1",
+                            "textualRating": "Falso",
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+class GeminiStub(ProviderStub):
+    name = "gemini"
+
+    def route(self, method, path, query, body):
+        if method != "POST" or ":generateContent" not in path:
+            return 404, {"error": {"code": 404, "message": "Not found"}}
+        answer = {
+            "summary": "Resumo gerado pelo stub.",
+            "risk_assessment": "Sem sinais relevantes de desinformação.",
+            "recommendation": "CONFIE NO CONTEÚDO",
+        }
+        return 200, {
+            "candidates": [
+                {
+                    "content": {"role": "model", "parts": [{"text": json.dumps(answer)}]},
+                    "finishReason": "STOP",
+                }
+            ]
+        }
+
+
+STUB_CLASSES = {
+    stub.name: stub for stub in (FirecrawlStub, VirusTotalStub, FactCheckStub, GeminiStub)
+}
+
+
+def start_stubs(behaviors=None, seed=None, host="127.0.0.1", port_base=0):
+    behaviors = behaviors or {}
+    return {
+        name: stub_class(
+            behaviors.get(name),
+            seed=seed,
+            address=(host, port_base + offset if port_base else 0),
+        ).start()
+        for offset, (name, stub_class) in enumerate(STUB_CLASSES.items())
+    }
+
+
+def stub_environment(stubs, public_host=None):
+    """Variáveis de ambiente que apontam a aplicação para os stubs."""
+
+    def base_url(name):
+        url = stubs[name].base_url
+        if public_host:
+            url = url.replace(stubs[name].server_address[0], public_host, 1)
+        return url
+
+    return {
+        "FIRECRAWL_API_URL": base_url("firecrawl"),
+        "VIRUS_TOTAL_API_URL": f"{base_url('virustotal')}/api/v3",
+        "FACT_CHECK_API_URL": f"{base_url('fact_check')}/v1alpha1/claims:search",
+        "GEMINI_API_URL": base_url("gemini"),
+    }
+
+
+def configure_settings(stubs):
+    """Aponta os serviços para os stubs (settings e chaves de API falsas)."""
+    import os
+
+    from django.conf import settings
+
+    for name, value in stub_environment(stubs).items():
+        setattr(settings, name, value)
+    # As URLs dos benchmarks não existem: a extração vai direto ao stub do Firecrawl
+    settings.LOCAL_EXTRACTOR_ENABLED = False
+
+    for key in ("KEY_FIRECRAWL", "KEY_VIRUS_TOTAL", "KEY_FACT_CHECK", "KEY_GEMINI_API"):
+        os.environ[key] = "stub-key"
+
+
+def stop_stubs(stubs):
+    for stub in stubs.values():
+        stub.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Sobe os stubs dos provedores como processo independente."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port-base", type=int, default=9100)
+    parser.add_argument("--public-host", default="localhost")
+    parser.add_argument("--latency", default="fixed:0.2")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    args = parser.parse_args()
+
+    behavior = StubBehavior(
+        latency=Latency.parse(args.latency),
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit,
+    )
+    running = start_stubs(
+        {name: behavior for name in STUB_CLASSES}, host=args.host, port_base=args.port_base
+    )
+    print("Stubs no ar. Configure a aplicação (web e workers) com:")
+    for name, value in stub_environment(running, args.public_host).items():
+        print(f"{name}={value}")
+    print("LOCAL_EXTRACTOR_ENABLED=False")
+    print("KEY_FIRECRAWL, KEY_VIRUS_TOTAL, KEY_FACT_CHECK e KEY_GEMINI_API podem ter qualquer valor.")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stop_stubs(running)
@@ -0,0 +1,131 @@
+"""Benchmark do índice offline de ameaças.
+
+Mede o tempo de ingestão, a latência de busca (acertos e falhas) e o uso de
+memória do índice mapeado, inclusive em processos filhos (como no prefork do
+Celery), onde as páginas do arquivo devem ser compartilhadas.
+
+Uso:
+    python -m benchmarks.threat_feed_bench --entries 5000000 --children 4
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+
+def _memory_kib():
+    # RSS, PSS e memória privada do processo atual (Linux)
+    values = {"Rss": 0, "Pss": 0, "Private_Clean": 0, "Private_Dirty": 0}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in values:
+                    values[key] = int(rest.split()[0])
+    except OSError:
+        pass
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def _measure_lookups(index, urls):
+    latencies = []
+    for url in urls:
+        start = time.perf_counter_ns()
+        url in index  # noqa: B015
+        latencies.append(time.perf_counter_ns() - start)
+    return latencies
+
+
+def _touch_all_pages(index):
+    hashes = index._current()
+    step = max(1, 4096 // hashes.itemsize)
+    return sum(hashes[i] & 1 for i in range(0, len(hashes), step))
+
+
+def _report_latency(label, latencies):
+    print(
+        f"{label:<8} p50={_percentile(latencies, 50) / 1000:.2f}us "
+        f"p99={_percentile(latencies, 99) / 1000:.2f}us "
+        f"média={statistics.fmean(latencies) / 1000:.2f}us"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--children", type=int, default=4)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+
+    from analysis.services.threat_feed.threat_index import ThreatFeedIndex, build_index
+
+    feed = [f"https://host{i}.malicioso.example/p/{i}" for i in range(args.entries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "threat_feed.idx")
+
+        start = time.perf_counter()
+        total = build_index(feed, path)
+        build_seconds = time.perf_counter() - start
+        size_mib = os.path.getsize(path) / 1024 / 1024
+        print(f"ingestão: {total} URLs em {build_seconds:.2f}s ({size_mib:.1f} MiB)")
+
+        hits = random.sample(feed, min(args.lookups, len(feed)))
+        misses = [f"https://limpo{i}.example/" for i in range(args.lookups)]
+        del feed
+
+        before = _memory_kib()
+        index = ThreatFeedIndex(path)
+        _touch_all_pages(index)
+        after = _memory_kib()
+        print(f"memória do índice: +{(after['rss'] - before['rss']) / 1024:.1f} MiB RSS")
+
+        _report_latency("acertos", _measure_lookups(index, hits))
+        _report_latency("falhas", _measure_lookups(index, misses))
+
+        # Filhos "prefork": cada um percorre o índice inteiro
+        children = []
+        for _ in range(args.children):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                child_index = ThreatFeedIndex(path)
+                _touch_all_pages(child_index)
+                _measure_lookups(child_index, hits[:1000])
+                memory = _memory_kib()
+                os.write(write_fd, f"{memory['pss']} {memory['private']}".encode())
+                os._exit(0)
+            os.close(write_fd)
+            children.append((pid, read_fd))
+
+        for pid, read_fd in children:
+            pss, private = map(int, os.read(read_fd, 64).split())
+            os.close(read_fd)
+            os.waitpid(pid, 0)
+            print(
+                f"filho {pid}: PSS={pss / 1024:.1f} MiB "
+                f"privada={private / 1024:.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
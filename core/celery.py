@@ -1,9 +1,15 @@
+import glob
 import os
 
 from celery import Celery
+from celery.signals import celeryd_init, worker_process_shutdown, worker_ready
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
 app = Celery("core")
 
 
@@ -16,3 +22,33 @@ app.autodiscover_tasks()
 @app.task(bind=True)
 def debug_task(self):
     print(f"Request: {self.request!r}")
+
+
+@celeryd_init.connect
+def reset_metrics(**kwargs):
+    # Descarta métricas de execuções anteriores do worker
+    if PROMETHEUS_MULTIPROC_DIR:
+        for path in glob.glob(os.path.join(PROMETHEUS_MULTIPROC_DIR, "*.db")):
+            os.remove(path)
+
+
+@worker_ready.connect
+def start_metrics_server(**kwargs):
+    from django.conf import settings
+
+    if not settings.WORKER_METRICS_PORT:
+        return
+
+    from prometheus_client import start_http_server
+
+    from analysis.metrics import metrics_registry
+
+    start_http_server(settings.WORKER_METRICS_PORT, registry=metrics_registry())
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    if PROMETHEUS_MULTIPROC_DIR:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
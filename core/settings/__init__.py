@@ -11,3 +11,8 @@ from .templates import *
 
 
 from .rest_framework import *
+from .metrics import *
+from .providers import *
+from .reputation import *
+from .caching import *
+
@@ -0,0 +1,45 @@
+from decouple import config
+
+# Popularidade das URLs: placar no Redis com meia-vida, usado para reanalisar
+# as URLs em alta antes que o relatório em cache expire
+POPULARITY_HALF_LIFE = config("POPULARITY_HALF_LIFE", default=60 * 30, cast=int)
+POPULARITY_TOP_N = config("POPULARITY_TOP_N", default=200, cast=int)
+POPULARITY_MIN_SCORE = config("POPULARITY_MIN_SCORE", default=3.0, cast=float)
+POPULARITY_MAX_TRACKED = config("POPULARITY_MAX_TRACKED", default=10_000, cast=int)
+# Intervalo do job de aquecimento e antecedência (s) em relação à expiração
+POPULARITY_WARM_INTERVAL = config("POPULARITY_WARM_INTERVAL", default=30, cast=int)
+POPULARITY_REFRESH_WINDOW = config("POPULARITY_REFRESH_WINDOW", default=60, cast=int)
+
+CELERY_BEAT_SCHEDULE = {
+    "warm-popular-reports": {
+        "task": "analysis.tasks.warm_popular_reports_task",
+        "schedule": POPULARITY_WARM_INTERVAL,
+    },
+}
+
+# TTLs (s) dos relatórios em cache, escolhidos por analysis.caching.report_ttl
+REPORT_TTL_FACT_CHECK = config("REPORT_TTL_FACT_CHECK", default=60 * 60 * 24 * 7, cast=int)
+REPORT_TTL_BLOCKED = config("REPORT_TTL_BLOCKED", default=60 * 60 * 6, cast=int)
+REPORT_TTL_LLM = config("REPORT_TTL_LLM", default=60 * 30, cast=int)
+REPORT_TTL_PROVISIONAL = config("REPORT_TTL_PROVISIONAL", default=60, cast=int)
+REPORT_TTL_POPULAR_MAX = config("REPORT_TTL_POPULAR_MAX", default=60 * 10, cast=int)
+# Conteúdo publicado há mais que isso (dias) muda pouco: TTL maior
+REPORT_OLD_CONTENT_DAYS = config("REPORT_OLD_CONTENT_DAYS", default=7, cast=int)
+
+# Extrações guardadas para revalidação condicional (ETag, Last-Modified e hash do
+# conteúdo): se a página não mudou, fact-check e LLM da análise anterior são
+# reaproveitados, desde que tenham menos de EXTRACTION_REUSE_MAX_AGE segundos
+EXTRACTION_CACHE_TTL = config("EXTRACTION_CACHE_TTL", default=60 * 60 * 24 * 7, cast=int)
+EXTRACTION_REUSE_MAX_AGE = config("EXTRACTION_REUSE_MAX_AGE", default=60 * 60 * 24, cast=int)
+
+# Saídas das etapas concluídas, guardadas pelo id da task para que um retry
+# retome a análise em vez de recomeçar; somem ao fim da análise ou pelo TTL
+CHECKPOINT_TTL = config("CHECKPOINT_TTL", default=60 * 60, cast=int)
+
+# Validade (s) do Cache-Control dos relatórios concluídos em /analysis/status/<id>
+# (clientes e CDNs revalidam com If-None-Match) e do ETag guardado pelo worker
+STATUS_CACHE_MAX_AGE = config("STATUS_CACHE_MAX_AGE", default=60 * 60 * 24, cast=int)
+
+# Intervalo (s) em que cada processo relê do Redis as gerações dos namespaces de
+# cache; um bump_cache_generation chega a todos os processos dentro desse prazo
+CACHE_GENERATION_REFRESH = config("CACHE_GENERATION_REFRESH", default=5, cast=float)
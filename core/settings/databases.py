@@ -23,10 +23,33 @@ DATABASES = {
     }
 }
 
-CELERY_BROKER_URL = "redis://redis:6379/0"
-CELERY_RESULT_BACKEND = "redis://redis:6379/2"
+CELERY_BROKER_URL = config("CELERY_BROKER_URL", "redis://redis:6379/0")
+CELERY_RESULT_BACKEND = config("CELERY_RESULT_BACKEND", "redis://redis:6379/2")
 
 CELERY_TASK_SERIALIZER = "json"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Sao_Paulo"
+
+# Reciclagem dos filhos do pool prefork: memória residente máxima (em KB) e
+# número máximo de tasks por processo (0 = sem limite)
+CELERY_WORKER_MAX_MEMORY_PER_CHILD = config(
+    "CELERY_WORKER_MAX_MEMORY_PER_CHILD", default=512_000, cast=int
+)
+CELERY_WORKER_MAX_TASKS_PER_CHILD = config(
+    "CELERY_WORKER_MAX_TASKS_PER_CHILD", default=500, cast=int
+)
+
+# Filas por prioridade: análises interativas (usuário esperando na página de
+# status) nunca disputam worker com importações em lote
+ANALYSIS_QUEUES = {"interactive": "interactive", "bulk": "bulk"}
+CELERY_TASK_DEFAULT_QUEUE = ANALYSIS_QUEUES["interactive"]
+# Entregas de webhooks têm fila própria: não esperam atrás de lotes nem de análises
+WEBHOOK_QUEUE = config("WEBHOOK_QUEUE", default="webhooks")
+CELERY_TASK_ROUTES = {
+    "analysis.tasks.refresh_domain_reputation_task": {"queue": ANALYSIS_QUEUES["bulk"]},
+    "analysis.tasks.warm_popular_reports_task": {"queue": ANALYSIS_QUEUES["bulk"]},
+    "analysis.tasks.deliver_webhook_task": {"queue": WEBHOOK_QUEUE},
+}
+# Cada processo reserva uma task por vez: uma fila parada não segura as outras
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
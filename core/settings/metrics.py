@@ -0,0 +1,21 @@
+from decouple import Csv, config
+
+# Acesso ao /metrics da API: "Authorization: Bearer <METRICS_TOKEN>", IPs de
+# METRICS_ALLOWED_IPS (REMOTE_ADDR) ou usuário staff; sem nada disso, 403
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+METRICS_ALLOWED_IPS = config("METRICS_ALLOWED_IPS", default="", cast=Csv())
+
+# Porta do endpoint /metrics dos workers Celery (0 = desativado). Com o pool
+# prefork, defina também PROMETHEUS_MULTIPROC_DIR para agregar os filhos.
+WORKER_METRICS_PORT = config("WORKER_METRICS_PORT", default=0, cast=int)
+
+# Profiling amostral das análises: fração das tasks perfiladas (0.0 a 1.0).
+# Requisições com o header "X-FactShield-Profile: 1" feitas com chave de API ou
+# por staff são sempre perfiladas; o header de anônimos é ignorado.
+PROFILE_SAMPLE_RATE = config("PROFILE_SAMPLE_RATE", default=0.0, cast=float)
+PROFILE_INTERVAL = config("PROFILE_INTERVAL", default=0.01, cast=float)
+PROFILE_TTL = config("PROFILE_TTL", default=60 * 60 * 24, cast=int)
+
+# Pico de memória por análise via tracemalloc (deixa as alocações mais lentas;
+# o crescimento de RSS é medido sempre)
+TASK_TRACEMALLOC = config("TASK_TRACEMALLOC", default=False, cast=bool)
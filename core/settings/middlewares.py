@@ -1,9 +1,17 @@
+from decouple import config
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "analysis.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "analysis.middleware.QuotaHeadersMiddleware",
 ]
+
+# Compressão negociada (brotli ou gzip) das respostas JSON a partir deste tamanho
+COMPRESSION_MIN_BYTES = config("COMPRESSION_MIN_BYTES", default=1024, cast=int)
+COMPRESSION_BROTLI_QUALITY = config("COMPRESSION_BROTLI_QUALITY", default=5, cast=int)
@@ -0,0 +1,80 @@
+from decouple import Csv, config
+
+from .environment import BASE_DIR
+
+# URLs base das APIs externas (sobrescritas pelos stubs locais nos benchmarks)
+VIRUS_TOTAL_API_URL = config(
+    "VIRUS_TOTAL_API_URL", default="https://www.virustotal.com/api/v3"
+)
+FACT_CHECK_API_URL = config(
+    "FACT_CHECK_API_URL",
+    default="https://factchecktools.googleapis.com/v1alpha1/claims:search",
+)
+FIRECRAWL_API_URL = config("FIRECRAWL_API_URL", default="https://api.firecrawl.dev")
+# Vazio = endpoint padrão do SDK do Gemini
+GEMINI_API_URL = config("GEMINI_API_URL", default="")
+
+# Tamanho máximo (em caracteres) do markdown aceito do Firecrawl; o excedente é
+# descartado antes da limpeza. A LLM usa apenas os primeiros 8000 caracteres.
+FIRECRAWL_MAX_DOCUMENT_CHARS = config(
+    "FIRECRAWL_MAX_DOCUMENT_CHARS", default=100_000, cast=int
+)
+
+# Extrator local (antes do Firecrawl): baixa o HTML e extrai o artigo no worker.
+# Abaixo de LOCAL_EXTRACTOR_MIN_CHARS caracteres ou LOCAL_EXTRACTOR_MIN_PARAGRAPHS
+# parágrafos (ou em páginas só com JavaScript), a análise cai para o Firecrawl.
+LOCAL_EXTRACTOR_ENABLED = config("LOCAL_EXTRACTOR_ENABLED", default=True, cast=bool)
+LOCAL_EXTRACTOR_MIN_CHARS = config("LOCAL_EXTRACTOR_MIN_CHARS", default=800, cast=int)
+LOCAL_EXTRACTOR_MIN_PARAGRAPHS = config("LOCAL_EXTRACTOR_MIN_PARAGRAPHS", default=3, cast=int)
+LOCAL_EXTRACTOR_MAX_BYTES = config("LOCAL_EXTRACTOR_MAX_BYTES", default=3_000_000, cast=int)
+LOCAL_EXTRACTOR_TIMEOUT = config("LOCAL_EXTRACTOR_TIMEOUT", default=8, cast=float)
+LOCAL_EXTRACTOR_POOL_SIZE = config("LOCAL_EXTRACTOR_POOL_SIZE", default=20, cast=int)
+LOCAL_EXTRACTOR_MAX_REDIRECTS = config("LOCAL_EXTRACTOR_MAX_REDIRECTS", default=5, cast=int)
+LOCAL_EXTRACTOR_USER_AGENT = config(
+    "LOCAL_EXTRACTOR_USER_AGENT",
+    default="Mozilla/5.0 (compatible; FactShield/1.0; +https://github.com/tioRaffa/FactShield)",
+)
+
+# Roteamento da LLM: o modelo leve atende textos curtos e as filas de
+# LLM_LIGHT_LANES; o principal, o resto. Cada um serve de reserva do outro.
+# Modelos lentos (latência média acima de LLM_SLOW_SECONDS), com muitos erros
+# ou em cooldown após um 429 vão para o fim da fila; uma tentativa que não é a
+# última dura no máximo LLM_ATTEMPT_TIMEOUT segundos. Um modelo rebaixado recebe
+# uma chamada de teste a cada LLM_HEALTH_PROBE_INTERVAL segundos e volta à ativa
+# se ela for bem. LLM_BACKEND=fake responde localmente, sem chave nem rede.
+LLM_BACKEND = config("LLM_BACKEND", default="gemini")
+LLM_MODEL_PRIMARY = config("LLM_MODEL_PRIMARY", default="gemini-2.5-flash")
+LLM_MODEL_LIGHT = config("LLM_MODEL_LIGHT", default="gemini-2.5-flash-lite")
+LLM_LIGHT_MAX_CHARS = config("LLM_LIGHT_MAX_CHARS", default=1500, cast=int)
+LLM_LIGHT_LANES = config("LLM_LIGHT_LANES", default="bulk", cast=Csv())
+LLM_ATTEMPT_TIMEOUT = config("LLM_ATTEMPT_TIMEOUT", default=20, cast=float)
+LLM_SLOW_SECONDS = config("LLM_SLOW_SECONDS", default=15, cast=float)
+LLM_MAX_ERROR_RATE = config("LLM_MAX_ERROR_RATE", default=0.5, cast=float)
+LLM_MIN_CALLS_FOR_HEALTH = config("LLM_MIN_CALLS_FOR_HEALTH", default=5, cast=int)
+LLM_RATE_LIMIT_COOLDOWN = config("LLM_RATE_LIMIT_COOLDOWN", default=30, cast=float)
+LLM_HEALTH_PROBE_INTERVAL = config("LLM_HEALTH_PROBE_INTERVAL", default=60, cast=float)
+
+# Triagem local antes do Gemini: classificador linear treinado com os vereditos
+# guardados da LLM ("manage.py train_prescreen"). Com risco estimado até
+# PRESCREEN_TRUST_THRESHOLD, a LLM é dispensada; por padrão, só em domínios
+# confiáveis (allowlist ou reputação aprendida). Sem modelo, tudo vai para a LLM.
+PRESCREEN_ENABLED = config("PRESCREEN_ENABLED", default=True, cast=bool)
+PRESCREEN_MODEL_PATH = config(
+    "PRESCREEN_MODEL_PATH", default=str(BASE_DIR / "data" / "prescreen_model.json")
+)
+PRESCREEN_TRUST_THRESHOLD = config("PRESCREEN_TRUST_THRESHOLD", default=0.05, cast=float)
+PRESCREEN_TRUSTED_DOMAINS_ONLY = config(
+    "PRESCREEN_TRUSTED_DOMAINS_ONLY", default=True, cast=bool
+)
+
+# Timeouts das chamadas HTTP aos provedores (segundos) e prazo total de cada
+# análise; o tempo restante do prazo limita o timeout de cada chamada
+PROVIDER_CONNECT_TIMEOUT = config("PROVIDER_CONNECT_TIMEOUT", default=5, cast=float)
+PROVIDER_READ_TIMEOUT = config("PROVIDER_READ_TIMEOUT", default=60, cast=float)
+ANALYSIS_DEADLINE_SECONDS = config("ANALYSIS_DEADLINE_SECONDS", default=90, cast=float)
+
+# Novas tentativas automáticas da análise em falhas temporárias dos provedores
+# (5xx, timeout, 429): backoff exponencial com jitter, limitado a RETRY_BACKOFF_MAX
+ANALYSIS_MAX_RETRIES = config("ANALYSIS_MAX_RETRIES", default=3, cast=int)
+ANALYSIS_RETRY_BACKOFF = config("ANALYSIS_RETRY_BACKOFF", default=5, cast=int)
+ANALYSIS_RETRY_BACKOFF_MAX = config("ANALYSIS_RETRY_BACKOFF_MAX", default=120, cast=int)
@@ -0,0 +1,27 @@
+from decouple import Csv, config
+
+from .environment import BASE_DIR
+
+# Listas curadas: a allowlist vale para o host exato (ex.: "g1.globo.com"); a
+# denylist, para o domínio registrável inteiro (ex.: "golpe.com.br")
+REPUTATION_ALLOWLIST = config("REPUTATION_ALLOWLIST", default="", cast=Csv())
+REPUTATION_DENYLIST = config("REPUTATION_DENYLIST", default="", cast=Csv())
+
+# "skip" = domínios confiáveis não passam pelo VirusTotal
+# "defer" = o scan do VirusTotal roda em background, fora do caminho crítico
+REPUTATION_TRUSTED_MODE = config("REPUTATION_TRUSTED_MODE", default="defer")
+
+# Reputação aprendida a partir dos relatórios agregados do VirusTotal
+REPUTATION_MIN_REPORTS = config("REPUTATION_MIN_REPORTS", default=20, cast=int)
+REPUTATION_MALICIOUS_RATIO = config(
+    "REPUTATION_MALICIOUS_RATIO", default=0.5, cast=float
+)
+REPUTATION_STATS_TTL = config("REPUTATION_STATS_TTL", default=60 * 60 * 24 * 30, cast=int)
+REPUTATION_REFRESH_SECONDS = config("REPUTATION_REFRESH_SECONDS", default=60, cast=int)
+
+# Índice offline de URLs maliciosas (URLhaus, PhishTank...), gerado pelo
+# comando "manage.py ingest_threat_feed"
+THREAT_FEED_INDEX_PATH = config(
+    "THREAT_FEED_INDEX_PATH", default=str(BASE_DIR / "data" / "threat_feed.idx")
+)
+THREAT_FEED_CHECK_SECONDS = config("THREAT_FEED_CHECK_SECONDS", default=5, cast=int)
@@ -1,8 +1,49 @@
+from decouple import config
+
 REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "analysis.authentication.ApiKeyAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
+        "analysis.throttling.QuotaThrottle",
+    ],
+    # orjson; relatórios do cache já chegam serializados e passam direto
+    "DEFAULT_RENDERER_CLASSES": [
+        "analysis.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
-    "DEFAULT_THROTTLE_RATES": {
-        "anon": "5/min",
-    },
 }
+
+# Cotas por plano, em janela deslizante no Redis (formato do DRF, ex.: "5/min").
+# "anon" vale por IP; os demais, por chave de API (header X-API-Key)
+API_QUOTA_TIERS = {
+    "anon": config("ANON_THROTTLE_RATE", default="5/min"),
+    "free": config("QUOTA_FREE_RATE", default="60/min"),
+    "partner": config("QUOTA_PARTNER_RATE", default="5000/min"),
+    "enterprise": config("QUOTA_ENTERPRISE_RATE", default="50000/min"),
+}
+# Por quanto tempo cada processo reaproveita a validação de uma chave (uma
+# chave revogada pode seguir valendo por até esse intervalo)
+API_KEY_CACHE_SECONDS = config("API_KEY_CACHE_SECONDS", default=60, cast=int)
+# Chaves inválidas ficam num cache separado e menor, só para absorver repetições
+API_KEY_NEGATIVE_CACHE_SECONDS = config("API_KEY_NEGATIVE_CACHE_SECONDS", default=5, cast=int)
+
+# Máximo de URLs por requisição no endpoint de lote (fila "bulk")
+BATCH_MAX_URLS = config("BATCH_MAX_URLS", default=100, cast=int)
+
+# Views assíncronas de disparo/status (ligado automaticamente pelo core/asgi.py)
+ASYNC_API = config("ASYNC_API", default=False, cast=bool)
+# Tempo máximo (s) do long-poll em GET /analysis/status/<id>?wait=N (só no ASGI)
+STATUS_LONG_POLL_MAX = config("STATUS_LONG_POLL_MAX", default=20, cast=float)
+
+# Webhooks de conclusão (callback_url): corpo assinado com HMAC-SHA256 usando o
+# segredo da chave de API (ApiKey.webhook_secret); entregas com falha temporária
+# (rede, 429, 5xx) são repetidas com backoff exponencial até WEBHOOK_MAX_RETRIES vezes
+WEBHOOK_ALLOW_HTTP = config("WEBHOOK_ALLOW_HTTP", default=False, cast=bool)
+WEBHOOK_TIMEOUT = config("WEBHOOK_TIMEOUT", default=5, cast=float)
+WEBHOOK_MAX_RETRIES = config("WEBHOOK_MAX_RETRIES", default=8, cast=int)
+WEBHOOK_RETRY_BACKOFF = config("WEBHOOK_RETRY_BACKOFF", default=10, cast=int)
+WEBHOOK_RETRY_BACKOFF_MAX = config("WEBHOOK_RETRY_BACKOFF_MAX", default=60 * 30, cast=int)
+WEBHOOK_POOL_SIZE = config("WEBHOOK_POOL_SIZE", default=20, cast=int)
@@ -14,4 +14,18 @@ echo "Redis está no ar 🚀"
 
 python manage.py makemigrations --noinput
 python manage.py migrate --noinput
-python manage.py runserver_plus 0.0.0.0:8000
\ No newline at end of file
+
+# WEB_SERVER: asgi (uvicorn, views assíncronas), wsgi (gunicorn) ou dev
+case "${WEB_SERVER:-dev}" in
+  asgi)
+    exec uvicorn core.asgi:application --host 0.0.0.0 --port 8000 \
+      --workers "${WEB_CONCURRENCY:-4}" --no-access-log
+    ;;
+  wsgi)
+    exec gunicorn core.wsgi:application --bind 0.0.0.0:8000 \
+      --workers "${WEB_CONCURRENCY:-4}" --threads 8
+    ;;
+  *)
+    exec python manage.py runserver_plus 0.0.0.0:8000
+    ;;
+esac